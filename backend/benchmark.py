@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Engine micro-benchmarks with regression tracking.
+
+Runs offline against the modules directly (no server, no database).
+
+    python benchmark.py run --output benchmarks/baseline.json
+    python benchmark.py compare benchmarks/baseline.json                # runs now, compares
+    python benchmark.py compare benchmarks/baseline.json current.json   # compares two result files
+
+`compare` exits with status 1 when a benchmark is more than --threshold
+(default 10%) slower than the baseline. Timings depend on the machine: the
+committed benchmarks/baseline.json is only comparable on similar hardware,
+rerun `run` on the machine that compares (e.g. the CI runner) when it changes.
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import timeit
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from poker_models import PokerGame, GamePhase, Variant
+from poker_engine import PokerEngine
+from poker_api import _create_game_state_response
+from simulate import create_table, play_hand, calling_station
+from variants import strength
+
+DEFAULT_BASELINE = Path(__file__).parent / "benchmarks" / "baseline.json"
+SEED = 1234
+
+
+def _random_hands(count: int, size: int) -> List[List[int]]:
+    """Card indexes, as the engine scores them"""
+    rng = random.Random(SEED)
+    return [rng.sample(range(52), size) for _ in range(count)]
+
+
+def _cycle(items: list) -> Callable[[], object]:
+    """Return a function yielding the items round-robin"""
+    state = {"i": 0}
+
+    def next_item():
+        item = items[state["i"] % len(items)]
+        state["i"] += 1
+        return item
+    return next_item
+
+
+def _bench_strength(variant: Variant, hole: int) -> Callable[[], object]:
+    hands = _cycle(_random_hands(500, hole + 5))
+
+    def run():
+        cards = hands()
+        return strength(variant, cards[:hole], cards[hole:])
+    return run
+
+
+def bench_holdem_strength() -> Callable[[], object]:
+    return _bench_strength(Variant.HOLDEM, 2)
+
+
+def bench_omaha_strength() -> Callable[[], object]:
+    return _bench_strength(Variant.OMAHA, 4)
+
+
+def bench_shuffle_deck() -> Callable[[], object]:
+    game = PokerGame(seed=SEED)
+    return game.shuffle_deck
+
+
+def bench_start_new_hand() -> Callable[[], object]:
+    game = create_table(6, seed=SEED)
+    return lambda: PokerEngine.start_new_hand(game)
+
+
+def bench_full_hand() -> Callable[[], object]:
+    rng = random.Random(SEED)
+    game = create_table(6, seed=SEED)
+    strategies = [calling_station]
+
+    def run():
+        play_hand(game, strategies, rng)
+        for player in game.players:
+            player.chips = 1000
+    return run
+
+
+def bench_game_state_response() -> Callable[[], object]:
+    game = create_table(6, seed=SEED)
+    PokerEngine.start_new_hand(game)
+    game.phase = GamePhase.FLOP
+    game.deal_community_cards(3)
+    return lambda: _create_game_state_response(game)
+
+
+BENCHMARKS: Dict[str, Callable[[], Callable[[], object]]] = {
+    "holdem_strength": bench_holdem_strength,
+    "omaha_strength": bench_omaha_strength,
+    "shuffle_deck": bench_shuffle_deck,
+    "start_new_hand": bench_start_new_hand,
+    "full_hand": bench_full_hand,
+    "game_state_response": bench_game_state_response,
+}
+
+
+def run_benchmarks(names: List[str], repeat: int = 7) -> Dict[str, dict]:
+    """Time each benchmark; returns seconds per call (min and median over `repeat` runs)"""
+    results = {}
+    for name in names:
+        func = BENCHMARKS[name]()
+        timer = timeit.Timer(func)
+        number, _ = timer.autorange()
+        timings = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+        results[name] = {
+            "min": min(timings),
+            "median": statistics.median(timings),
+            "number": number,
+            "repeat": repeat,
+        }
+        print(f"{name:<22} {results[name]['min'] * 1e6:>12.2f} us/call  (median {results[name]['median'] * 1e6:.2f})")
+    return results
+
+
+def _result_document(benchmarks: Dict[str, dict]) -> dict:
+    return {
+        "created_at": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "benchmarks": benchmarks,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> bool:
+    """Print the comparison table; returns False when a benchmark regressed beyond `threshold`"""
+    ok = True
+    print(f"{'benchmark':<22} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, base in baseline["benchmarks"].items():
+        if name not in current["benchmarks"]:
+            continue
+        before = base["min"]
+        after = current["benchmarks"][name]["min"]
+        change = (after - before) / before
+        regressed = change > threshold
+        ok = ok and not regressed
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{name:<22} {before * 1e6:>10.2f}us {after * 1e6:>10.2f}us {change:>+8.1%}{flag}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Poker engine micro-benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run benchmarks and store the results as JSON")
+    run_parser.add_argument("--output", type=Path, default=DEFAULT_BASELINE)
+    run_parser.add_argument("--only", nargs="*", choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    run_parser.add_argument("--repeat", type=int, default=7)
+
+    compare_parser = subparsers.add_parser("compare", help="Compare results against a baseline")
+    compare_parser.add_argument("baseline", type=Path, nargs="?", default=DEFAULT_BASELINE)
+    compare_parser.add_argument("current", type=Path, nargs="?",
+                                help="Result file to compare; runs the benchmarks when omitted")
+    compare_parser.add_argument("--threshold", type=float, default=0.10)
+    compare_parser.add_argument("--repeat", type=int, default=7)
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        document = _result_document(run_benchmarks(args.only, args.repeat))
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(document, indent=2))
+        print(f"Results written to {args.output}")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    if args.current:
+        current = json.loads(args.current.read_text())
+    else:
+        current = _result_document(run_benchmarks(list(baseline["benchmarks"]), args.repeat))
+        print()
+    return 0 if compare(baseline, current, args.threshold) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
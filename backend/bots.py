@@ -0,0 +1,135 @@
+"""
+Server-side bot players.
+
+A bot is a seated PokerPlayer with `is_bot` set; it acts through the same
+action endpoint as humans. Decisions are computed in a process pool so
+bot thinking never runs on the event loop and bot tables spread over all
+cores. Each decision has a time budget: the worker estimates its equity
+by Monte Carlo until the budget is used up (pooled with earlier estimates
+of the same spot up to suits, see hand_eval.EquityCache) and picks an
+action from the strategy table. If the pool does not answer within the
+budget (plus some slack for the round trip), the bot checks or folds.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, NamedTuple, Optional, Tuple
+
+from hand_eval import equity_cache
+from poker_models import GamePhase, PlayerAction, PokerGame, PokerPlayer
+
+logger = logging.getLogger(__name__)
+
+BOT_TIME_BUDGET = float(os.environ.get("POKER_BOT_TIME_BUDGET", "0.25"))  # Seconds per decision
+BOT_WORKERS = int(os.environ.get("POKER_BOT_WORKERS", "0")) or os.cpu_count() or 1
+BOT_DELAY = 1.0  # Seconds before a bot starts thinking, so humans can follow the table
+POOL_SLACK = 0.5  # Seconds on top of the budget for pickling and queueing
+
+BOT_NAMES = ["Bot Anna", "Bot Bert", "Bot Cleo", "Bot Dora", "Bot Emil", "Bot Fritz", "Bot Greta", "Bot Hans"]
+
+
+class Street(NamedTuple):
+    raise_equity: float  # Equity relative to a fair share (1 / players) needed to bet or raise
+    bet_fraction: float  # Bet or raise by this part of the pot
+    call_margin: float  # Equity needed on top of the pot odds to call
+
+
+# Strategy table: tighter and bigger bets as the board gets dealt
+STRATEGY = {
+    GamePhase.PRE_FLOP: Street(raise_equity=1.5, bet_fraction=1.0, call_margin=0.0),
+    GamePhase.FLOP: Street(raise_equity=1.6, bet_fraction=0.6, call_margin=0.02),
+    GamePhase.TURN: Street(raise_equity=1.7, bet_fraction=0.7, call_margin=0.04),
+    GamePhase.RIVER: Street(raise_equity=1.8, bet_fraction=0.8, call_margin=0.05),
+}
+
+
+class BotView(NamedTuple):
+    """Everything a bot decision needs, small enough to send to a worker process"""
+    hole: Tuple[int, ...]
+    board: Tuple[int, ...]
+    opponents: int
+    phase: GamePhase
+    pot: int
+    to_call: int
+    chips: int
+    current_bet: int
+    player_bet: int
+    big_blind: int
+    seed: int
+
+
+def bot_view(game: PokerGame, player: PokerPlayer, seed: Optional[int] = None) -> BotView:
+    return BotView(
+        hole=tuple(card.index for card in player.cards),
+        board=tuple(card.index for card in game.community_cards),
+        opponents=sum(1 for p in game.players if p is not player and p.is_active and not p.is_folded),
+        phase=game.phase,
+        pot=game.pot,
+        to_call=max(0, game.current_bet - player.current_bet),
+        chips=player.chips,
+        current_bet=game.current_bet,
+        player_bet=player.current_bet,
+        big_blind=game.big_blind,
+        seed=seed if seed is not None else random.getrandbits(64),
+    )
+
+
+def decide(view: BotView, budget: float = BOT_TIME_BUDGET) -> Tuple[PlayerAction, int, float]:
+    """(action, raise-to amount, estimated equity); runs in a worker process"""
+    deadline = time.perf_counter() + budget
+    rng = random.Random(view.seed)
+    equity, _ = equity_cache.estimate(view.hole, view.board, max(1, view.opponents), rng,
+                                      samples=100_000, deadline=deadline)
+    street = STRATEGY.get(view.phase, STRATEGY[GamePhase.RIVER])
+    fair_share = 1 / (max(1, view.opponents) + 1)
+
+    can_raise = view.chips > view.to_call
+    if equity >= fair_share * street.raise_equity and can_raise:
+        bet = max(int((view.pot + view.to_call) * street.bet_fraction), view.big_blind, view.current_bet)
+        raise_to = min(view.current_bet + bet, view.chips + view.player_bet)
+        return PlayerAction.RAISE, raise_to, equity
+    if view.to_call == 0:
+        return PlayerAction.CHECK, 0, equity
+    pot_odds = view.to_call / (view.pot + view.to_call)
+    if equity >= pot_odds + street.call_margin:
+        return PlayerAction.CALL, 0, equity
+    return PlayerAction.FOLD, 0, equity
+
+
+class BotPool:
+    def __init__(self, workers: int = BOT_WORKERS, budget: float = BOT_TIME_BUDGET):
+        self.workers = workers
+        self.budget = budget
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    async def run(self, function: Callable, *args):
+        """Other CPU-heavy work (like the push/fold solver) shares the bots' workers"""
+        return await asyncio.get_running_loop().run_in_executor(self._pool(), function, *args)
+
+    async def decide(self, view: BotView) -> Tuple[PlayerAction, int]:
+        """Decision from the pool, or check/fold if it misses the time budget"""
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._pool(), decide, view, self.budget)
+        try:
+            action, amount, _ = await asyncio.wait_for(future, timeout=self.budget + POOL_SLACK)
+            return action, amount
+        except Exception as e:
+            logger.warning("Bot decision failed (%s), falling back to check/fold", type(e).__name__)
+            return (PlayerAction.CHECK if view.to_call == 0 else PlayerAction.FOLD), 0
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+bot_pool = BotPool()
@@ -1,16 +1,37 @@
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument, UpdateOne
 import os
-from typing import List
-from models import Person, PersonCreate, PersonUpdate
+import uuid
+from typing import Dict, List, Optional
+from models import (
+    Person, PersonCreate, PersonUpdate, PersonStats, PersonRollup,
+    Transaction, TransactionPage
+)
 from datetime import datetime
+from rating import Rating, rate
 
 
 class PersonDatabase:
     def __init__(self, db):
         self.collection = db.persons
+        self.transactions = db.transactions  # Append-only ledger of session results
+        self.stats = db.person_stats  # One aggregate document per person
+        self.rollups = db.person_rollups  # One document per person per month and per year
+    
+    async def ensure_indexes(self):
+        """Create indexes used by the ledger and leaderboard queries"""
+        await self.transactions.create_index([("person_id", 1), ("seq", -1)], unique=True)
+        await self.stats.create_index("person_id", unique=True)
+        await self.stats.create_index([("balance", -1)])
+        await self.stats.create_index([("rating", -1)])
+        await self.transactions.create_index([("created_at", 1), ("session_id", 1)])
+        await self.rollups.create_index([("person_id", 1), ("period", 1)], unique=True)
+        await self.rollups.create_index([("period", 1), ("amount", -1)])
     
     async def initialize_default_persons(self):
         """Initialize default persons if collection is empty"""
+        await self.ensure_indexes()
+        
         # Always reset to exactly 10 players - remove any extras
         await self.collection.delete_many({})  # Clear all existing
         
@@ -27,9 +48,14 @@ class PersonDatabase:
             {"id": "10", "name": "Richi", "amount": 0.0}
         ]
         
+        # Aggregates of persons that are no longer present are dropped,
+        # the ledger itself is kept
+        await self.stats.delete_many({"person_id": {"$nin": [p["id"] for p in default_persons]}})
+        
         for person_data in default_persons:
             person = Person(**person_data)
             await self.collection.insert_one(person.dict())
+            await self._init_stats(person)
     
     async def get_all_persons(self) -> List[Person]:
         """Get all persons sorted by amount (highest first)"""
@@ -48,37 +74,218 @@ class PersonDatabase:
         """Create new person"""
         person = Person(**person_create.dict())
         await self.collection.insert_one(person.dict())
+        await self._init_stats(person)
         return person
     
     async def update_person(self, person_id: str, person_update: PersonUpdate) -> Person:
-        """Update person's amount"""
+        """Update person's amount.
+        
+        The change is a session of its own: it goes into the ledger, but a
+        rating needs two players, so the person's rating stays as it is.
+        """
         update_data = person_update.dict()
         update_data["updated_at"] = datetime.utcnow()
         
-        result = await self.collection.update_one(
+        previous = await self.collection.find_one_and_update(
             {"id": person_id},
-            {"$set": update_data}
+            {"$set": update_data},
+            return_document=ReturnDocument.BEFORE
         )
         
-        if result.modified_count:
+        if previous:
+            await self._record_result(previous, update_data["amount"], str(uuid.uuid4()), update_data["updated_at"])
             return await self.get_person_by_id(person_id)
         return None
     
     async def bulk_update_persons(self, updates: List[dict]) -> List[Person]:
-        """Bulk update multiple persons"""
+        """Bulk update multiple persons as one session.
+        
+        Only persons whose amount changed take part: break-even players get
+        no ledger row and keep their rating, so the ratings can always be
+        rebuilt from the ledger alone (see rebuild_ratings). The session is
+        rated if at least two persons took part.
+        """
+        # All results saved together belong to the same session
+        session_id = str(uuid.uuid4())
+        now = datetime.utcnow()
+        results = {}
+        
         for update in updates:
-            await self.collection.update_one(
+            previous = await self.collection.find_one_and_update(
                 {"id": update["id"]},
-                {"$set": {"amount": update["amount"], "updated_at": datetime.utcnow()}}
+                {"$set": {"amount": update["amount"], "updated_at": now}},
+                return_document=ReturnDocument.BEFORE
             )
+            if previous:
+                delta = await self._record_result(previous, update["amount"], session_id, now)
+                if delta:
+                    results[previous["id"]] = delta
         
+        await self._update_ratings(results)
         return await self.get_all_persons()
     
     async def reset_all_amounts(self) -> List[Person]:
         """Reset all persons' amounts to 0"""
+        now = datetime.utcnow()
         await self.collection.update_many(
             {},
-            {"$set": {"amount": 0.0, "updated_at": datetime.utcnow()}}
+            {"$set": {"amount": 0.0, "updated_at": now}}
+        )
+        # A reset is not a session result: only the balances are cleared,
+        # the ledger and the career statistics stay untouched
+        await self.stats.update_many(
+            {},
+            {"$set": {"balance": 0.0, "updated_at": now}}
+        )
+        
+        return await self.get_all_persons()
+    
+    async def get_leaderboard(self, sort: str = "balance") -> List[PersonStats]:
+        """Get aggregate stats of all persons sorted by balance or rating (highest first)"""
+        cursor = self.stats.find({}).sort(sort, -1)
+        stats = await cursor.to_list(1000)
+        return [PersonStats(**s) for s in stats]
+    
+    async def get_period_leaderboard(self, period: str) -> List[PersonRollup]:
+        """Get the rollups of a period ("YYYY-MM" or "YYYY") sorted by amount (highest first)"""
+        cursor = self.rollups.find({"period": period}).sort("amount", -1)
+        rollups = await cursor.to_list(1000)
+        return [PersonRollup(**r) for r in rollups]
+    
+    async def get_person_stats(self, person_id: str) -> Optional[PersonStats]:
+        """Get aggregate stats of a single person"""
+        stats = await self.stats.find_one({"person_id": person_id})
+        if stats:
+            return PersonStats(**stats)
+        return None
+    
+    async def get_person_history(self, person_id: str, cursor: Optional[int] = None, limit: int = 20) -> TransactionPage:
+        """Get a page of a person's session results, newest first.
+        
+        `cursor` is the `seq` of the last row of the previous page; the query
+        walks the (person_id, seq) index instead of skipping rows.
+        """
+        query = {"person_id": person_id}
+        if cursor is not None:
+            query["seq"] = {"$lt": cursor}
+        
+        rows = await self.transactions.find(query).sort("seq", -1).limit(limit + 1).to_list(limit + 1)
+        items = [Transaction(**row) for row in rows[:limit]]
+        next_cursor = items[-1].seq if len(rows) > limit else None
+        return TransactionPage(items=items, next_cursor=next_cursor)
+    
+    async def _init_stats(self, person: Person):
+        """Create (or re-attach) the aggregate document for a person"""
+        await self.stats.update_one(
+            {"person_id": person.id},
+            {
+                "$set": {"name": person.name, "balance": person.amount, "updated_at": person.updated_at},
+                "$setOnInsert": {
+                    "total": 0.0, "sessions": 0,
+                    "mu": Rating().mu, "sigma": Rating().sigma, "rating": Rating().ordinal
+                }
+            },
+            upsert=True
+        )
+    
+    async def _record_result(self, previous: dict, new_amount: float, session_id: str, now: datetime) -> float:
+        """Append a ledger row for an amount change and fold it into the aggregate; returns the change"""
+        delta = new_amount - previous.get("amount", 0.0)
+        if delta == 0:
+            return 0.0
+        
+        stats = await self.stats.find_one_and_update(
+            {"person_id": previous["id"]},
+            {
+                "$inc": {"sessions": 1, "total": delta},
+                "$max": {"best": delta},
+                "$min": {"worst": delta},
+                "$set": {"name": previous["name"], "balance": new_amount, "updated_at": now}
+            },
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        
+        # Fold the result into the month and year rollups of the session date
+        for period in (now.strftime("%Y-%m"), now.strftime("%Y")):
+            await self.rollups.update_one(
+                {"person_id": previous["id"], "period": period},
+                {
+                    "$inc": {"sessions": 1, "amount": delta},
+                    "$max": {"best": delta},
+                    "$min": {"worst": delta},
+                    "$set": {"name": previous["name"], "updated_at": now}
+                },
+                upsert=True
+            )
+        
+        transaction = Transaction(
+            person_id=previous["id"],
+            session_id=session_id,
+            seq=stats["sessions"],
+            amount=delta,
+            balance=new_amount,
+            created_at=now
+        )
+        await self.transactions.insert_one(transaction.dict())
+        return delta
+    
+    async def _update_ratings(self, results: Dict[str, float]):
+        """Fold one session (person_id -> result) into the ratings of its participants"""
+        if len(results) < 2:
+            return
+        
+        docs = await self.stats.find({"person_id": {"$in": list(results)}}).to_list(len(results))
+        ratings = {doc["person_id"]: Rating(doc.get("mu", Rating().mu), doc.get("sigma", Rating().sigma)) for doc in docs}
+        person_ids = list(ratings)
+        new_ratings = rate([ratings[p] for p in person_ids], [results[p] for p in person_ids])
+        await self._write_ratings(dict(zip(person_ids, new_ratings)))
+    
+    async def rebuild_ratings(self) -> int:
+        """Recompute all ratings by replaying the ledger in one pass, session by session.
+        
+        Returns the number of sessions replayed.
+        """
+        ratings: Dict[str, Rating] = {}
+        sessions = 0
+        current_session = None
+        results: Dict[str, float] = {}
+        
+        def flush():
+            participants = list(results)
+            if len(participants) < 2:
+                return 0
+            new_ratings = rate(
+                [ratings.get(p, Rating()) for p in participants],
+                [results[p] for p in participants]
+            )
+            ratings.update(zip(participants, new_ratings))
+            return 1
+        
+        # The ledger is streamed in time order; rows of a session are adjacent
+        cursor = self.transactions.find({}, {"person_id": 1, "session_id": 1, "amount": 1}).sort(
+            [("created_at", 1), ("session_id", 1)]
         )
+        async for row in cursor:
+            if row["session_id"] != current_session:
+                sessions += flush()
+                current_session = row["session_id"]
+                results = {}
+            results[row["person_id"]] = results.get(row["person_id"], 0.0) + row["amount"]
+        sessions += flush()
         
-        return await self.get_all_persons()
\ No newline at end of file
+        # Persons without rated sessions fall back to the initial rating
+        person_ids = [doc["person_id"] async for doc in self.stats.find({}, {"person_id": 1})]
+        await self._write_ratings({p: ratings.get(p, Rating()) for p in person_ids})
+        return sessions
+    
+    async def _write_ratings(self, ratings: Dict[str, Rating]):
+        if not ratings:
+            return
+        await self.stats.bulk_write([
+            UpdateOne(
+                {"person_id": person_id},
+                {"$set": {"mu": rating.mu, "sigma": rating.sigma, "rating": rating.ordinal}}
+            )
+            for person_id, rating in ratings.items()
+        ], ordered=False)
@@ -0,0 +1,330 @@
+"""
+Fast hand evaluation and equity estimation on integer cards.
+
+Cards are Card.index values (suit * 13 + rank, rank 0 = deuce ... 12 = ace).
+A hand of 5 to 7 cards is folded into one 13-bit rank mask per suit plus
+masks of the ranks seen at least once, twice, three and four times;
+flushes, straights and kickers are then looked up in tables over all 8192
+rank masks, built once at import. No combinations are enumerated. The
+masks can also be kept as a State and extended one card at a time
+(add_card), so candidate cards on top of a known hand cost one update and
+one lookup each.
+
+The result is a single int that orders hands exactly, kickers included:
+
+    category << 20 | up to five ranks of 4 bits, most significant first
+
+where the category is the index into HandRanking (HIGH_CARD = 0 ... ROYAL_FLUSH = 9).
+"""
+
+import random
+import time
+from collections import OrderedDict
+from itertools import combinations_with_replacement
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from canonical import Key, canonical_key
+from poker_models import RANKS, Card, HandRanking
+
+CATEGORIES = list(HandRanking)  # Index = category code, weakest first
+(HIGH_CARD, PAIR, TWO_PAIR, THREE_OF_A_KIND, STRAIGHT, FLUSH,
+ FULL_HOUSE, FOUR_OF_A_KIND, STRAIGHT_FLUSH, ROYAL_FLUSH) = range(len(CATEGORIES))
+
+ACE = 12
+EQUITY_CACHE_SIZE = 4096
+EQUITY_ENOUGH = 20_000  # Deals after which a cached equity is not refined any more
+RANK_OF = tuple(card % 13 for card in range(52))
+SUIT_OF = tuple(card // 13 for card in range(52))
+BIT_OF = tuple(1 << (card % 13) for card in range(52))
+
+
+def _straight_high(mask: int) -> int:
+    """Rank of the highest straight's top card in a rank mask, -1 if none"""
+    for high in range(ACE, 3, -1):
+        window = 0b11111 << (high - 4)
+        if mask & window == window:
+            return high
+    wheel = 1 << ACE | 0b1111  # A-2-3-4-5
+    return 3 if mask & wheel == wheel else -1
+
+
+def _pack(ranks: Sequence[int]) -> int:
+    """Ranks as 4-bit fields, left aligned in 20 bits"""
+    value = 0
+    for rank in ranks[:5]:
+        value = value << 4 | rank
+    return value << 4 * (5 - min(len(ranks), 5))
+
+
+POPCOUNT = bytes(bin(mask).count("1") for mask in range(1 << 13))
+STRAIGHT_HIGH = tuple(_straight_high(mask) for mask in range(1 << 13))
+DESCENDING = tuple(tuple(rank for rank in range(ACE, -1, -1) if mask >> rank & 1) for mask in range(1 << 13))
+TOP5 = tuple(_pack(ranks) for ranks in DESCENDING)
+# Short deck has no 2-5 and the ace plays low as a five: A-6-7-8-9 is the lowest straight
+SHORT_STRAIGHT_HIGH = tuple(_straight_high(mask | (1 << 3 if mask >> ACE & 1 else 0)) for mask in range(1 << 13))
+
+
+State = Tuple[int, int, int, int, int, int, int, int]  # Rank mask per suit, ranks seen once, twice, three, four times
+EMPTY: State = (0, 0, 0, 0, 0, 0, 0, 0)
+
+
+def evaluate(cards: Iterable[int], straights: Sequence[int] = STRAIGHT_HIGH) -> int:
+    """Strength of the best five-card hand out of 5 to 7 cards, higher is better"""
+    suits = [0, 0, 0, 0]
+    one = two = three = four = 0  # Ranks seen at least once, twice, ...
+    for card in cards:
+        bit = BIT_OF[card]
+        suits[SUIT_OF[card]] |= bit
+        if three & bit:
+            four |= bit
+        elif two & bit:
+            three |= bit
+        elif one & bit:
+            two |= bit
+        else:
+            one |= bit
+    return _score(suits, one, two, three, four, straights)
+
+
+def add_card(state: State, card: int) -> State:
+    """State with one more card, for evaluating many candidate cards on top of the same cards"""
+    suits = list(state[:4])
+    one, two, three, four = state[4:]
+    bit = BIT_OF[card]
+    suits[SUIT_OF[card]] |= bit
+    if three & bit:
+        four |= bit
+    elif two & bit:
+        three |= bit
+    elif one & bit:
+        two |= bit
+    else:
+        one |= bit
+    return suits[0], suits[1], suits[2], suits[3], one, two, three, four
+
+
+def fold(cards: Iterable[int], state: State = EMPTY) -> State:
+    for card in cards:
+        state = add_card(state, card)
+    return state
+
+
+def score(state: State) -> int:
+    """Same as evaluate() for a state of 5 to 7 cards"""
+    return _score(state[:4], *state[4:])
+
+
+def rank_category(state: State) -> int:
+    """Category from the rank counts alone, for fewer than five cards (no straights or flushes)"""
+    one, two, three, four = state[4:]
+    if four:
+        return FOUR_OF_A_KIND
+    if three:
+        return FULL_HOUSE if two & ~three else THREE_OF_A_KIND
+    if two:
+        return TWO_PAIR if POPCOUNT[two] >= 2 else PAIR
+    return HIGH_CARD
+
+
+def _score(suits: Sequence[int], one: int, two: int, three: int, four: int,
+           straights: Sequence[int] = STRAIGHT_HIGH) -> int:
+    # With at most 7 cards a flush rules out quads and full houses
+    for mask in suits:
+        if POPCOUNT[mask] >= 5:
+            return flush_score(mask, straights)
+
+    if four:
+        quad = four.bit_length() - 1
+        return FOUR_OF_A_KIND << 20 | quad << 16 | ((one & ~(1 << quad)).bit_length() - 1) << 12
+    if three:
+        trips = three.bit_length() - 1
+        pair = two & ~(1 << trips)  # A second set of trips counts as the pair
+        if pair:
+            return FULL_HOUSE << 20 | trips << 16 | (pair.bit_length() - 1) << 12
+
+    high = straights[one]
+    if high >= 0:
+        return STRAIGHT << 20 | high << 16
+
+    if three:
+        kickers = DESCENDING[one & ~(1 << trips)]
+        return THREE_OF_A_KIND << 20 | trips << 16 | kickers[0] << 12 | kickers[1] << 8
+    if two:
+        pairs = DESCENDING[two]
+        if len(pairs) >= 2:
+            high_pair, low_pair = pairs[0], pairs[1]
+            kicker = (one & ~(1 << high_pair | 1 << low_pair)).bit_length() - 1
+            return TWO_PAIR << 20 | high_pair << 16 | low_pair << 12 | kicker << 8
+        kickers = DESCENDING[one & ~(1 << pairs[0])]
+        return PAIR << 20 | pairs[0] << 16 | kickers[0] << 12 | kickers[1] << 8 | kickers[2] << 4
+    return HIGH_CARD << 20 | TOP5[one]
+
+
+def flush_score(mask: int, straights: Sequence[int] = STRAIGHT_HIGH) -> int:
+    """Score of a flush (or straight flush) in the ranks of `mask`"""
+    high = straights[mask]
+    if high >= 0:
+        return (ROYAL_FLUSH if high == ACE else STRAIGHT_FLUSH) << 20 | high << 16
+    return FLUSH << 20 | TOP5[mask]
+
+
+# Exactly five cards (Omaha tries 60 of them per player): without a flush the
+# score only depends on the ranks, looked up by the product of one prime per rank
+PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+FIVE_CARD_SCORES = {
+    PRIMES[a] * PRIMES[b] * PRIMES[c] * PRIMES[d] * PRIMES[e]:
+        evaluate([rank + 13 * (i % 4) for i, rank in enumerate((a, b, c, d, e))])  # Suits 0-3, 0: no flush
+    for a, b, c, d, e in combinations_with_replacement(range(13), 5)
+    if a != e  # Five of a kind doesn't exist
+}
+
+
+def category(score: int) -> HandRanking:
+    return CATEGORIES[score >> 20]
+
+
+def describe(score: int) -> str:
+    """Readable hand, e.g. Full House, Ks over 7s"""
+    kind = score >> 20
+    first, second = RANKS[score >> 16 & 15].value, RANKS[score >> 12 & 15].value
+    if kind == ROYAL_FLUSH:
+        return "Royal Flush"
+    if kind == STRAIGHT_FLUSH:
+        return f"Straight Flush, {first} high"
+    if kind == FOUR_OF_A_KIND:
+        return f"Four of a Kind, {first}s"
+    if kind == FULL_HOUSE:
+        return f"Full House, {first}s over {second}s"
+    if kind == FLUSH:
+        return f"Flush, {first} high"
+    if kind == STRAIGHT:
+        return f"Straight, {first} high"
+    if kind == THREE_OF_A_KIND:
+        return f"Three of a Kind, {first}s"
+    if kind == TWO_PAIR:
+        return f"Two Pair, {first}s and {second}s"
+    if kind == PAIR:
+        return f"Pair of {first}s"
+    return f"High Card, {first}"
+
+
+def card_indexes(cards: Iterable[Card]) -> List[int]:
+    return [card.index for card in cards]
+
+
+def estimate_equity(hole: Sequence[int], board: Sequence[int], opponents: int,
+                    rng: Optional[random.Random] = None, samples: int = 10_000,
+                    deadline: Optional[float] = None) -> Tuple[float, int]:
+    """Monte Carlo share of the pot against `opponents` random hands.
+
+    Runs `samples` deals or until time.perf_counter() passes `deadline`,
+    whichever comes first. Returns (equity, deals played); ties count as
+    a split pot.
+    """
+    rng = rng or random.Random()
+    board = list(board)
+    known = set(hole) | set(board)
+    deck = [card for card in range(52) if card not in known]
+    missing = 5 - len(board)
+    draw = missing + 2 * opponents
+    hero = list(hole) + board
+
+    won = 0.0
+    played = 0
+    while played < samples:
+        if deadline is not None and played % 64 == 0 and time.perf_counter() >= deadline and played:
+            break
+        dealt = rng.sample(deck, draw)
+        runout = dealt[:missing]
+        mine = evaluate(hero + runout)
+        best = True
+        ties = 0
+        for i in range(missing, draw, 2):
+            theirs = evaluate(board + runout + dealt[i:i + 2])
+            if theirs > mine:
+                best = False
+                break
+            if theirs == mine:
+                ties += 1
+        if best:
+            won += 1 / (ties + 1)
+        played += 1
+    return (won / played if played else 0.0), played
+
+
+def draw_outs(hole: Sequence[int], board: Sequence[int]) -> Tuple[int, List[List[int]], List[float]]:
+    """(current category, outs per category, chance to end in each category by the river).
+
+    For a flop or turn. An out is an unseen card that lifts the hand to a
+    higher category than it has now and than the board has with that card
+    (a pair on the board improves everybody). By-river chances are exact
+    over all remaining runouts.
+    """
+    state = fold(hole, fold(board))
+    board_state = fold(board)
+    current = score(state) >> 20
+    known = set(hole) | set(board)
+    unseen = [card for card in range(52) if card not in known]
+
+    outs: List[List[int]] = [[] for _ in CATEGORIES]
+    turned = []
+    for card in unseen:
+        after = add_card(state, card)
+        made = score(after) >> 20
+        on_board = add_card(board_state, card)
+        board_made = score(on_board) >> 20 if len(board) >= 4 else rank_category(on_board)
+        if made > current and made > board_made:
+            outs[made].append(card)
+        turned.append(after)
+
+    finals = [0] * len(CATEGORIES)
+    if len(board) == 3:
+        for i, after in enumerate(turned):
+            for card in unseen[i + 1:]:
+                finals[score(add_card(after, card)) >> 20] += 1
+    else:
+        for after in turned:
+            finals[score(after) >> 20] += 1
+    runouts = sum(finals)
+    return current, outs, [count / runouts for count in finals]
+
+
+class EquityCache:
+    """Monte Carlo equities per canonical (hole, board, opponents).
+
+    All suit relabelings of a spot share one entry and pool their deals,
+    so an equity gets more precise every time the spot comes up and costs
+    nothing once EQUITY_ENOUGH deals are in.
+    """
+
+    def __init__(self, size: int = EQUITY_CACHE_SIZE, enough: int = EQUITY_ENOUGH):
+        self.size = size
+        self.enough = enough
+        self._entries: "OrderedDict[Tuple[Key, int], List[float]]" = OrderedDict()  # [won, played]
+
+    def estimate(self, hole: Sequence[int], board: Sequence[int], opponents: int,
+                 rng: Optional[random.Random] = None, samples: int = 10_000,
+                 deadline: Optional[float] = None) -> Tuple[float, int]:
+        """Like estimate_equity, but (equity, deals) include the deals of earlier calls"""
+        key = (canonical_key(hole, board), opponents)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = [0.0, 0]
+            if len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(key)
+
+        missing = min(samples, self.enough - entry[1])
+        if missing > 0:
+            equity, played = estimate_equity(*key[0], opponents, rng, samples=missing, deadline=deadline)
+            entry[0] += equity * played
+            entry[1] += played
+        return (entry[0] / entry[1] if entry[1] else 0.0), entry[1]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Per process; bot workers each keep their own
+equity_cache = EquityCache()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Columnar analytics export of recorded hands.
+
+Streams the binary hand histories (see hand_history.py) into batches with
+one row per player and hand, and writes them to Parquet or Feather (Arrow
+IPC) one batch at a time, so memory stays bounded by the batch size no
+matter how many hands are exported. The hand strength category of every
+row comes from the engine's evaluator, by the rules of the hand's
+variant (see variants.py).
+
+    python hand_export.py --format parquet --output hands.parquet hand_histories/*.phh
+    python hand_export.py --format feather --output hands.feather --dir hand_histories
+
+Parquet and Feather need pyarrow; csv works with pandas alone.
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+
+import numpy as np
+import pandas as pd
+
+import variants
+from hand_eval import PAIR, fold, rank_category
+from hand_history import HistoryAction, history_files, read_hands
+from poker_models import HOLE_CARDS, HandRanking, Variant
+
+BATCH_ROWS = 100_000
+CATEGORIES = list(HandRanking)  # Index = category code, weakest first
+NO_CARD = -1
+MAX_HOLE_CARDS = max(HOLE_CARDS.values())
+HOLE_COLUMNS = [f"hole{i + 1}" for i in range(MAX_HOLE_CARDS)]
+BOARD_COLUMNS = [f"board{i + 1}" for i in range(5)]
+
+_POSITION_NAMES = {
+    2: ["BB", "SB"],  # The engine posts the small blind left of the button heads-up too
+    3: ["BTN", "SB", "BB"],
+}
+
+
+def position_name(offset: int, players: int) -> str:
+    """Position label from the seat offset to the button (0 = button)"""
+    if players in _POSITION_NAMES:
+        return _POSITION_NAMES[players][offset]
+    if offset < 3:
+        return ("BTN", "SB", "BB")[offset]
+    late = ["CO", "HJ", "LJ"]
+    from_button = players - offset  # 1 = cutoff
+    if from_button <= len(late) and offset > 3:
+        return late[from_button - 1]
+    return "UTG" if offset == 3 else f"UTG+{offset - 3}"
+
+
+# --- hand categories ------------------------------------------------------------
+
+def hand_categories(hole: np.ndarray, board: np.ndarray, variant: np.ndarray) -> np.ndarray:
+    """Best hand category (index into CATEGORIES) of every row, by the rules of its variant.
+
+    `hole` and `board` are int arrays of Card.index values, NO_CARD for
+    missing cards (e.g. folded before the flop). Rows with a board are
+    scored by variants.strength; without one only the ranks count.
+    """
+    codes = np.empty(len(hole), dtype=np.int8)
+    for row, (cards, community, name) in enumerate(zip(hole.tolist(), board.tolist(), variant.tolist())):
+        game = Variant(name)
+        cards = [card for card in cards if card != NO_CARD]
+        community = [card for card in community if card != NO_CARD]
+        if len(cards) == HOLE_CARDS[game] and len(community) >= 3:
+            ranking = variants.ranking(game, variants.strength(game, cards, community))
+            codes[row] = CATEGORIES.index(ranking)
+        else:
+            # Fewer than five cards make no straight or flush; in Omaha only two hole cards play
+            category = rank_category(fold(cards + community))
+            codes[row] = min(category, PAIR) if game == Variant.OMAHA else category
+    return codes
+
+
+# --- batching -------------------------------------------------------------------
+
+def iter_batches(paths: Iterable[Path], batch_rows: int = BATCH_ROWS) -> Iterator[pd.DataFrame]:
+    """One DataFrame per `batch_rows` player-hands, in file order"""
+    columns = _empty_columns()
+    for path in paths:
+        for hand in read_hands(path):
+            invested = [0] * len(hand.players)
+            voluntary = [False] * len(hand.players)
+            for action in hand.actions:
+                invested[action.player] += action.amount
+                if action.action in (HistoryAction.CALL, HistoryAction.RAISE) and action.amount:
+                    voluntary[action.player] = True
+            board = list(hand.board[:5]) + [NO_CARD] * (5 - len(hand.board[:5]))
+            folded = {action.player for action in hand.actions if action.action == HistoryAction.FOLD}
+            count = len(hand.players)
+
+            for i, player in enumerate(hand.players):
+                offset = (player.seat - hand.button) % count
+                hole = list(player.cards[:MAX_HOLE_CARDS]) + [NO_CARD] * (MAX_HOLE_CARDS - len(player.cards))
+                columns["hand_no"].append(hand.hand_no)
+                columns["timestamp"].append(hand.timestamp)
+                columns["table"].append(hand.table)
+                columns["variant"].append(hand.variant.value)
+                columns["player"].append(player.name)
+                columns["players"].append(count)
+                columns["position"].append(offset)
+                columns["position_name"].append(position_name(offset, count))
+                columns["stack"].append(player.stack)
+                columns["big_blind"].append(hand.big_blind)
+                for number, card in enumerate(hole):
+                    columns[f"hole{number + 1}"].append(card)
+                for street, card in enumerate(board):
+                    columns[f"board{street + 1}"].append(card)
+                columns["vpip"].append(voluntary[i])
+                columns["folded"].append(i in folded)
+                columns["showdown"].append(hand.showdown and i not in folded)
+                columns["invested"].append(invested[i])
+                columns["won"].append(player.won)
+                columns["net"].append(player.won - invested[i])
+
+            if len(columns["hand_no"]) >= batch_rows:
+                yield _to_frame(columns)
+                columns = _empty_columns()
+
+    if columns["hand_no"]:
+        yield _to_frame(columns)
+
+
+def _empty_columns() -> Dict[str, List]:
+    names = ["hand_no", "timestamp", "table", "variant", "player", "players", "position", "position_name",
+             "stack", "big_blind", *HOLE_COLUMNS, *BOARD_COLUMNS,
+             "vpip", "folded", "showdown", "invested", "won", "net"]
+    return {name: [] for name in names}
+
+
+def _to_frame(columns: Dict[str, List]) -> pd.DataFrame:
+    frame = pd.DataFrame({
+        "hand_no": np.array(columns["hand_no"], dtype=np.int64),
+        "timestamp": pd.to_datetime(np.array(columns["timestamp"], dtype=np.int64), unit="s", utc=True),
+        "table": columns["table"],
+        "variant": columns["variant"],
+        "player": columns["player"],
+        "players": np.array(columns["players"], dtype=np.int8),
+        "position": np.array(columns["position"], dtype=np.int8),
+        "position_name": columns["position_name"],
+        "stack": np.array(columns["stack"], dtype=np.int64),
+        "big_blind": np.array(columns["big_blind"], dtype=np.int64),
+        **{name: np.array(columns[name], dtype=np.int8) for name in HOLE_COLUMNS + BOARD_COLUMNS},
+        "vpip": np.array(columns["vpip"], dtype=bool),
+        "folded": np.array(columns["folded"], dtype=bool),
+        "showdown": np.array(columns["showdown"], dtype=bool),
+        "invested": np.array(columns["invested"], dtype=np.int64),
+        "won": np.array(columns["won"], dtype=np.int64),
+        "net": np.array(columns["net"], dtype=np.int64),
+    })
+    codes = hand_categories(frame[HOLE_COLUMNS].to_numpy(), frame[BOARD_COLUMNS].to_numpy(),
+                            frame["variant"].to_numpy())
+    frame["category"] = np.array([ranking.value for ranking in CATEGORIES])[codes]
+    frame["category_code"] = codes
+    return frame
+
+
+# --- writers ----------------------------------------------------------------------
+
+def export(paths: Iterable[Path], output: Path, file_format: str = "parquet",
+           batch_rows: int = BATCH_ROWS) -> int:
+    """Write all player-hands of `paths` to `output`; returns the number of rows"""
+    rows = 0
+    writer = None
+    try:
+        for frame in iter_batches(paths, batch_rows):
+            if file_format == "csv":
+                frame.to_csv(output, mode="w" if rows == 0 else "a", header=rows == 0, index=False)
+            else:
+                import pyarrow as pa
+
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                if writer is None:
+                    writer = _arrow_writer(output, file_format, table.schema)
+                writer.write_table(table)
+            rows += len(frame)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def _arrow_writer(output: Path, file_format: str, schema):
+    if file_format == "parquet":
+        import pyarrow.parquet as pq
+
+        return pq.ParquetWriter(output, schema, compression="zstd")
+    import pyarrow.ipc as ipc
+
+    # Feather v2 is the Arrow IPC file format
+    return ipc.new_file(str(output), schema, options=ipc.IpcWriteOptions(compression="zstd"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export hand histories as one row per player and hand")
+    parser.add_argument("files", nargs="*", type=Path, help="Hand history files (.phh)")
+    parser.add_argument("--dir", type=Path, help="Export all .phh files of a directory")
+    parser.add_argument("--format", choices=["parquet", "feather", "csv"], default="parquet")
+    parser.add_argument("--output", type=Path, required=True)
+    parser.add_argument("--batch-rows", type=int, default=BATCH_ROWS)
+    args = parser.parse_args()
+
+    paths = list(args.files) + (history_files(args.dir) if args.dir else [])
+    if not paths:
+        parser.error("No input files")
+
+    start = time.perf_counter()
+    rows = export(paths, args.output, args.format, args.batch_rows)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {rows} rows to {args.output} in {elapsed:.1f}s ({rows / max(elapsed, 1e-9):,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
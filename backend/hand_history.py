@@ -0,0 +1,616 @@
+#!/usr/bin/env python3
+"""
+Compact binary hand histories.
+
+Finished hands are recorded from the engine's hand events (see
+EngineListener) and appended to one file per day. A file is a header
+followed by independently compressed chunks, so it can be appended to and
+read back as a stream:
+
+    file    = b"PKHH" version codec chunk*
+    chunk   = varint(compressed size) varint(hands) compressed(record*)
+    record  = varint(size) hand
+
+Inside a hand, cards are single bytes (Card.index, 0-51), actions are one
+byte (street << 4 | action code) plus the player's index in the hand, and
+chip amounts are varints. A hand ends with its deck seed (varint, 0 for
+unseeded games) and the game variant (one byte, an index into VARIANTS).
+Chunks are compressed with zstd if the `zstandard` package is installed,
+gzip otherwise.
+
+    python hand_history.py stats hand_histories/2024-05-01.phh
+    python hand_history.py export hand_histories/2024-05-01.phh > hands.txt
+"""
+
+import argparse
+import gzip
+import logging
+import sys
+import time
+from datetime import datetime, timezone
+from enum import IntEnum
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from poker_engine import EngineListener
+from poker_models import GamePhase, PlayerAction, PokerGame, PokerPlayer, SUITS, Variant
+from timer_wheel import TimerWheel
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"PKHH"
+VERSION = 1
+CODEC_GZIP = 1
+CODEC_ZSTD = 2
+CHUNK_HANDS = 256  # Hands per compressed chunk
+FLUSH_INTERVAL = 30.0  # Seconds until a partial chunk is written anyway
+
+
+class HistoryAction(IntEnum):
+    FOLD = 0
+    CHECK = 1
+    CALL = 2
+    RAISE = 3
+    POST_ANTE = 4
+    POST_SMALL_BLIND = 5
+    POST_BIG_BLIND = 6
+
+
+STREETS = (GamePhase.PRE_FLOP, GamePhase.FLOP, GamePhase.TURN, GamePhase.RIVER)
+STREET_CODES = {phase: code for code, phase in enumerate(STREETS)}
+ACTION_CODES = {
+    PlayerAction.FOLD: HistoryAction.FOLD,
+    PlayerAction.CHECK: HistoryAction.CHECK,
+    PlayerAction.CALL: HistoryAction.CALL,
+    PlayerAction.RAISE: HistoryAction.RAISE,
+    PlayerAction.ALL_IN: HistoryAction.RAISE,
+}
+VARIANTS = tuple(Variant)  # Variant code = index
+VARIANT_CODES = {variant: code for code, variant in enumerate(VARIANTS)}
+
+
+class PlayerRecord(NamedTuple):
+    name: str
+    seat: int  # 0-based position at the table
+    stack: int  # Chips before antes and blinds
+    cards: Tuple[int, ...]  # Card indices
+    won: int  # Chips collected from the pot
+
+
+class ActionRecord(NamedTuple):
+    street: int  # Index into STREETS
+    player: int  # Index into HandRecord.players
+    action: HistoryAction
+    amount: int  # Chips put in by this action
+
+
+class HandRecord(NamedTuple):
+    hand_no: int
+    timestamp: int  # Unix seconds
+    table: str  # Game id
+    small_blind: int
+    big_blind: int
+    ante: int
+    button: int  # Seat of the dealer
+    players: List[PlayerRecord]
+    board: Tuple[int, ...]
+    actions: List[ActionRecord]
+    showdown: bool
+    seed: Optional[int] = None  # Hand seed of seeded games, replays the deck (Deck.for_hand)
+    variant: Variant = Variant.HOLDEM
+
+    def net(self, player: int) -> int:
+        """Chips won or lost by a player in this hand"""
+        invested = sum(action.amount for action in self.actions if action.player == player)
+        return self.players[player].won - invested
+
+
+# --- encoding ---------------------------------------------------------------
+
+def _put_varint(buffer: bytearray, value: int):
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _put_bytes(buffer: bytearray, data: bytes):
+    _put_varint(buffer, len(data))
+    buffer += data
+
+
+def encode_hand(hand: HandRecord) -> bytes:
+    buffer = bytearray()
+    _put_varint(buffer, hand.hand_no)
+    _put_varint(buffer, hand.timestamp)
+    _put_bytes(buffer, hand.table.encode())
+    _put_varint(buffer, hand.small_blind)
+    _put_varint(buffer, hand.big_blind)
+    _put_varint(buffer, hand.ante)
+    buffer.append(hand.button)
+    buffer.append(len(hand.players))
+    for player in hand.players:
+        _put_bytes(buffer, player.name.encode())
+        buffer.append(player.seat)
+        _put_varint(buffer, player.stack)
+        buffer.append(len(player.cards))
+        buffer += bytes(player.cards)
+    buffer.append(len(hand.board))
+    buffer += bytes(hand.board)
+    _put_varint(buffer, len(hand.actions))
+    for action in hand.actions:
+        buffer.append(action.street << 4 | action.action)
+        buffer.append(action.player)
+        _put_varint(buffer, action.amount)
+    for player in hand.players:
+        _put_varint(buffer, player.won)
+    buffer.append(1 if hand.showdown else 0)
+    _put_varint(buffer, 0 if hand.seed is None else hand.seed + 1)
+    buffer.append(VARIANT_CODES[hand.variant])
+    return bytes(buffer)
+
+
+_ACTIONS = tuple(HistoryAction)
+_strings: Dict[bytes, str] = {}  # Names and table ids repeat across hands
+
+
+def decode_hand(data: bytes) -> HandRecord:
+    pos = 0
+
+    def varint() -> int:
+        nonlocal pos
+        result = shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+    def string() -> str:
+        nonlocal pos
+        size = data[pos]  # Names are short: a one byte varint
+        if size >= 0x80:
+            size = varint()
+        else:
+            pos += 1
+        raw = data[pos:pos + size]
+        pos += size
+        value = _strings.get(raw)
+        if value is None:
+            if len(_strings) > 100_000:
+                _strings.clear()
+            value = _strings[raw] = raw.decode()
+        return value
+
+    hand_no = varint()
+    timestamp = varint()
+    table = string()
+    small_blind = varint()
+    big_blind = varint()
+    ante = varint()
+    button, count = data[pos], data[pos + 1]
+    pos += 2
+
+    seats = []
+    for _ in range(count):
+        name = string()
+        seat = data[pos]
+        pos += 1
+        stack = varint()
+        size = data[pos]
+        cards = tuple(data[pos + 1:pos + 1 + size])
+        pos += 1 + size
+        seats.append((name, seat, stack, cards))
+
+    size = data[pos]
+    board = tuple(data[pos + 1:pos + 1 + size])
+    pos += 1 + size
+
+    actions = []
+    for _ in range(varint()):
+        code, player, amount = data[pos], data[pos + 1], data[pos + 2]
+        if amount < 0x80:
+            pos += 3
+        else:
+            pos += 2
+            amount = varint()
+        actions.append(ActionRecord(code >> 4, player, _ACTIONS[code & 0x0F], amount))
+
+    players = [PlayerRecord(name, seat, stack, cards, varint()) for name, seat, stack, cards in seats]
+    showdown = bool(data[pos])
+    pos += 1
+    seed = varint()
+    variant = VARIANTS[data[pos]]
+    return HandRecord(hand_no, timestamp, table, small_blind, big_blind, ante, button,
+                      players, board, actions, showdown, seed - 1 if seed else None, variant)
+
+
+def _compress(codec: int, data: bytes) -> bytes:
+    if codec == CODEC_ZSTD:
+        return zstandard.ZstdCompressor(level=9).compress(data)
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def _decompress(codec: int, data: bytes) -> bytes:
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("File is zstd compressed, install the zstandard package to read it")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+# --- files ------------------------------------------------------------------
+
+class HandHistoryWriter:
+    """Appends hands to a file in compressed chunks of CHUNK_HANDS hands"""
+
+    def __init__(self, path: Path, codec: Optional[int] = None):
+        self.path = Path(path)
+        self.codec = codec or (CODEC_ZSTD if zstandard else CODEC_GZIP)
+        self._records: List[bytes] = []
+        if self.path.exists() and self.path.stat().st_size:
+            # Keep appending in the codec the file was started with
+            with open(self.path, "rb") as file:
+                self.codec = _read_header(file)
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "wb") as file:
+                file.write(MAGIC + bytes((VERSION, self.codec)))
+
+    def write(self, hand: HandRecord):
+        self._records.append(encode_hand(hand))
+        if len(self._records) >= CHUNK_HANDS:
+            self.flush()
+
+    def flush(self):
+        if not self._records:
+            return
+        payload = bytearray()
+        for record in self._records:
+            _put_bytes(payload, record)
+        compressed = _compress(self.codec, bytes(payload))
+
+        chunk = bytearray()
+        _put_varint(chunk, len(compressed))
+        _put_varint(chunk, len(self._records))
+        chunk += compressed
+        with open(self.path, "ab") as file:
+            file.write(chunk)
+        self._records = []
+
+
+def _read_header(file: BinaryIO) -> int:
+    header = file.read(6)
+    if len(header) < 6 or header[:4] != MAGIC:
+        raise ValueError(f"{getattr(file, 'name', 'file')} is not a hand history file")
+    if header[4] != VERSION:
+        raise ValueError(f"Unsupported hand history version {header[4]}")
+    return header[5]
+
+
+def _read_varint(file: BinaryIO) -> Optional[int]:
+    result = shift = 0
+    while True:
+        byte = file.read(1)
+        if not byte:
+            return None
+        result |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            return result
+        shift += 7
+
+
+def read_records(path: Path) -> Iterator[bytes]:
+    """Raw encoded hands, one decompressed chunk in memory at a time"""
+    with open(path, "rb") as file:
+        codec = _read_header(file)
+        while True:
+            size = _read_varint(file)
+            if size is None:
+                return
+            _read_varint(file)  # Hand count of the chunk
+            compressed = file.read(size)
+            if len(compressed) < size:
+                logger.warning("Truncated chunk at the end of %s", path)
+                return
+            payload = _decompress(codec, compressed)
+            pos = 0
+            while pos < len(payload):
+                size = shift = 0
+                while True:
+                    byte = payload[pos]
+                    pos += 1
+                    size |= (byte & 0x7F) << shift
+                    if byte < 0x80:
+                        break
+                    shift += 7
+                yield payload[pos:pos + size]
+                pos += size
+
+
+def read_hands(path: Path) -> Iterator[HandRecord]:
+    """Stream the hands of a file in order"""
+    for record in read_records(path):
+        yield decode_hand(record)
+
+
+def history_files(directory: Path) -> List[Path]:
+    return sorted(Path(directory).glob("*.phh"))
+
+
+# --- recording --------------------------------------------------------------
+
+class _OpenHand:
+    __slots__ = ("hand_no", "timestamp", "seed", "variant", "ids", "players", "stacks", "cards", "actions", "index")
+
+    def __init__(self, game: PokerGame):
+        self.hand_no = time.time_ns() // 1000
+        self.timestamp = int(time.time())
+        self.seed = game.hand_seed
+        self.variant = game.variant
+        self.ids: List[str] = []
+        self.players: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.stacks: List[int] = []
+        self.cards: List[Tuple[int, ...]] = []
+        self.actions: List[ActionRecord] = []
+        for player in game.players:
+            self.add(player)
+
+        # Antes and blinds were posted before the hand start event
+        for i, player in enumerate(game.players):
+            ante = player.total_bet - player.current_bet
+            if ante:
+                self.actions.append(ActionRecord(0, i, HistoryAction.POST_ANTE, ante))
+        for offset, action in ((1, HistoryAction.POST_SMALL_BLIND), (2, HistoryAction.POST_BIG_BLIND)):
+            i = (game.dealer_position + offset) % len(game.players)
+            if game.players[i].current_bet:
+                self.actions.append(ActionRecord(0, i, action, game.players[i].current_bet))
+
+    def add(self, player: PokerPlayer) -> int:
+        """Add a player to the hand (also players that joined the table mid-hand)"""
+        self.index[player.id] = len(self.ids)
+        self.ids.append(player.id)
+        self.players.append(player.name)
+        self.stacks.append(player.chips + player.total_bet)
+        self.cards.append(tuple(card.index for card in player.cards))
+        return self.index[player.id]
+
+
+class HandRecorder(EngineListener):
+    """Records every finished hand into a file per day under `directory`"""
+
+    def __init__(self):
+        self.directory: Optional[Path] = None
+        self._hands: Dict[str, _OpenHand] = {}  # Game id -> hand in progress
+        self._writer: Optional[HandHistoryWriter] = None
+        self._wheel: Optional[TimerWheel] = None
+
+    def start(self, directory: Path, wheel: TimerWheel):
+        self.directory = Path(directory)
+        self._wheel = wheel
+        wheel.schedule(FLUSH_INTERVAL, self._scheduled_flush)
+
+    def on_hand_start(self, game: PokerGame):
+        if self.directory is not None:
+            self._hands[game.id] = _OpenHand(game)
+
+    def on_action(self, game: PokerGame, player: PokerPlayer, action: PlayerAction, amount: int):
+        hand = self._hands.get(game.id)
+        if hand is None:
+            return
+        index = hand.index.get(player.id)
+        if index is None:
+            # Joined the table after the hand started
+            index = hand.add(player)
+        hand.actions.append(ActionRecord(
+            STREET_CODES.get(game.phase, 0), index, ACTION_CODES[action], amount
+        ))
+
+    def on_hand_end(self, game: PokerGame, winners: List[PokerPlayer], showdown: bool):
+        hand = self._hands.pop(game.id, None)
+        if hand is None:
+            return
+        seated = {player.id: player for player in game.players}
+        players = []
+        for i, player_id in enumerate(hand.ids):
+            player = seated.get(player_id)
+            # A player who left during the hand won nothing
+            won = player.chips - hand.stacks[i] + player.total_bet if player else 0
+            seat = player.position if player else i
+            players.append(PlayerRecord(hand.players[i], seat, hand.stacks[i], hand.cards[i], max(0, won)))
+
+        record = HandRecord(
+            hand_no=hand.hand_no,
+            timestamp=hand.timestamp,
+            table=game.id,
+            small_blind=game.small_blind,
+            big_blind=game.big_blind,
+            ante=game.ante,
+            button=game.dealer_position,
+            players=players,
+            board=tuple(card.index for card in game.community_cards),
+            actions=hand.actions,
+            showdown=showdown,
+            seed=hand.seed,
+            variant=hand.variant,
+        )
+        try:
+            self._writer_for(hand.timestamp).write(record)
+        except OSError:
+            logger.exception("Writing hand history failed")
+
+    def flush(self):
+        if self._writer is not None:
+            try:
+                self._writer.flush()
+            except OSError:
+                logger.exception("Writing hand history failed")
+
+    def _writer_for(self, timestamp: int) -> HandHistoryWriter:
+        path = self.directory / (datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%d") + ".phh")
+        if self._writer is None or self._writer.path != path:
+            self.flush()
+            self._writer = HandHistoryWriter(path)
+        return self._writer
+
+    def _scheduled_flush(self):
+        try:
+            self.flush()
+        finally:
+            self._wheel.schedule(FLUSH_INTERVAL, self._scheduled_flush)
+
+
+hand_recorder = HandRecorder()
+
+
+# --- PokerStars export --------------------------------------------------------
+
+_STARS_RANKS = "23456789TJQKA"
+_STARS_SUITS = {"hearts": "h", "diamonds": "d", "clubs": "c", "spades": "s"}
+_STARS_CARDS = [_STARS_RANKS[i % 13] + _STARS_SUITS[SUITS[i // 13].value] for i in range(52)]
+_STREET_BOARDS = ((3, "FLOP"), (4, "TURN"), (5, "RIVER"))
+_STARS_GAMES = {
+    Variant.HOLDEM: "Hold'em No Limit",
+    Variant.OMAHA: "Omaha Pot Limit",
+    Variant.SHORT_DECK: "6+ Hold'em No Limit",
+}
+
+
+def _cards(cards: Iterable[int]) -> str:
+    return " ".join(_STARS_CARDS[card] for card in cards)
+
+
+def to_pokerstars(hand: HandRecord) -> str:
+    """One hand in the PokerStars text format understood by tracking tools"""
+    players = hand.players
+    started = datetime.fromtimestamp(hand.timestamp, timezone.utc).strftime("%Y/%m/%d %H:%M:%S")
+    lines = [
+        f"PokerStars Hand #{hand.hand_no}: {_STARS_GAMES[hand.variant]} ({hand.small_blind}/{hand.big_blind}) - {started} UTC",
+        f"Table '{hand.table}' 8-max Seat #{hand.button + 1} is the button",
+    ]
+    lines += [f"Seat {p.seat + 1}: {p.name} ({p.stack} in chips)" for p in players]
+
+    posts = {HistoryAction.POST_ANTE: "the ante", HistoryAction.POST_SMALL_BLIND: "small blind",
+             HistoryAction.POST_BIG_BLIND: "big blind"}
+    folded = set()
+    street = -1  # Hole cards are dealt after the posts
+    street_bets = [0] * len(players)
+    current_bet = 0
+    for action in hand.actions:
+        name = players[action.player].name
+        if action.action in posts:
+            lines.append(f"{name}: posts {posts[action.action]} {action.amount}")
+            if action.action != HistoryAction.POST_ANTE:
+                street_bets[action.player] += action.amount
+                current_bet = max(current_bet, street_bets[action.player])
+            continue
+
+        while street < action.street:
+            street += 1
+            lines += _street_header(hand, street)
+            if street:
+                street_bets = [0] * len(players)
+                current_bet = 0
+
+        if action.action == HistoryAction.FOLD:
+            folded.add(action.player)
+            lines.append(f"{name}: folds")
+        elif action.action == HistoryAction.CHECK or action.amount == 0:
+            lines.append(f"{name}: checks")
+        elif action.action == HistoryAction.CALL:
+            street_bets[action.player] += action.amount
+            lines.append(f"{name}: calls {action.amount}")
+        else:
+            street_bets[action.player] += action.amount
+            raise_to = street_bets[action.player]
+            if current_bet:
+                lines.append(f"{name}: raises {raise_to - current_bet} to {raise_to}")
+            else:
+                lines.append(f"{name}: bets {raise_to}")
+            current_bet = max(current_bet, raise_to)
+
+    if street < 0:
+        street = 0
+        lines += _street_header(hand, street)
+    if hand.showdown:
+        # Streets dealt without any action (everyone all-in)
+        while street < len(_STREET_BOARDS) and len(hand.board) >= _STREET_BOARDS[street][0]:
+            street += 1
+            lines += _street_header(hand, street)
+    board = hand.board[:_STREET_BOARDS[street - 1][0]] if street else ()
+
+    if hand.showdown:
+        lines.append("*** SHOW DOWN ***")
+        lines += [f"{p.name}: shows [{_cards(p.cards)}]" for i, p in enumerate(players) if i not in folded]
+    lines += [f"{p.name} collected {p.won} from pot" for p in players if p.won]
+
+    total = sum(action.amount for action in hand.actions)
+    lines += ["*** SUMMARY ***", f"Total pot {total} | Rake 0"]
+    if board:
+        lines.append(f"Board [{_cards(board)}]")
+    for i, p in enumerate(players):
+        if i in folded:
+            result = "folded"
+        elif hand.showdown:
+            result = f"showed [{_cards(p.cards)}] and " + (f"won ({p.won})" if p.won else "lost")
+        else:
+            result = f"collected ({p.won})" if p.won else "mucked"
+        lines.append(f"Seat {p.seat + 1}: {p.name} {result}")
+    return "\n".join(lines) + "\n"
+
+
+def _street_header(hand: HandRecord, street: int) -> List[str]:
+    if street == 0:
+        return ["*** HOLE CARDS ***"] + [f"Dealt to {p.name} [{_cards(p.cards)}]" for p in hand.players if p.cards]
+    size, name = _STREET_BOARDS[street - 1]
+    if street == 1:
+        return [f"*** {name} *** [{_cards(hand.board[:size])}]"]
+    return [f"*** {name} *** [{_cards(hand.board[:size - 1])}] [{_cards(hand.board[size - 1:size])}]"]
+
+
+def export_pokerstars(path: Path, out) -> int:
+    """Write all hands of a file as PokerStars text; returns the number of hands"""
+    count = 0
+    for hand in read_hands(path):
+        out.write(to_pokerstars(hand))
+        out.write("\n\n")
+        count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read binary hand history files")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    export = subcommands.add_parser("export", help="Convert to PokerStars text on stdout")
+    export.add_argument("files", nargs="+", type=Path)
+    stats = subcommands.add_parser("stats", help="Scan files and report size and read speed")
+    stats.add_argument("files", nargs="+", type=Path)
+    args = parser.parse_args()
+
+    if args.command == "export":
+        for path in args.files:
+            export_pokerstars(path, sys.stdout)
+        return
+
+    for path in args.files:
+        start = time.perf_counter()
+        hands = actions = 0
+        for hand in read_hands(path):
+            hands += 1
+            actions += len(hand.actions)
+        elapsed = time.perf_counter() - start
+        size = path.stat().st_size
+        print(f"{path}: {hands} hands, {actions} actions, {size / max(hands, 1):.1f} bytes/hand, "
+              f"{hands / max(elapsed, 1e-9):,.0f} hands/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Independent Chip Model (ICM) for tournament deals and bubble decisions.
+
+Finishing orders follow the Malmuth-Harville model: the next place goes
+to each remaining player with probability proportional to their stack.
+Exact equities are computed by a recursion over the set of remaining
+players (a bitmask), memoized so every subset is evaluated once:
+O(2^n * n) states instead of n! finishing orders. Past EXACT_MAX_PLAYERS
+the equities are estimated by Monte Carlo sampling of finishing orders.
+"""
+
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+EXACT_MAX_PLAYERS = 12
+MONTE_CARLO_TRIALS = 200_000
+MONTE_CARLO_SEED = 2308  # Fixed, so the same table always shows the same numbers
+
+
+def icm_equities(stacks: Sequence[int], payouts: Sequence[float]) -> Tuple[List[float], str]:
+    """Equity of every stack in units of `payouts`, and the method used ("exact" or "monte_carlo").
+
+    `payouts[0]` is paid for first place. Players with an empty stack get
+    nothing; places beyond the number of live players are not paid out.
+    """
+    return _cached_equities(tuple(stacks), tuple(payouts))
+
+
+@lru_cache(maxsize=1024)
+def _cached_equities(stacks: Tuple[int, ...], payouts: Tuple[float, ...]) -> Tuple[List[float], str]:
+    live = [index for index, stack in enumerate(stacks) if stack > 0]
+    equities = [0.0] * len(stacks)
+    payouts = payouts[:len(live)]
+    if not live or not payouts:
+        return equities, "exact"
+
+    live_stacks = [stacks[index] for index in live]
+    if len(live) <= EXACT_MAX_PLAYERS:
+        result, method = _exact(live_stacks, payouts), "exact"
+    else:
+        result, method = _monte_carlo(live_stacks, payouts), "monte_carlo"
+
+    for index, equity in zip(live, result):
+        equities[index] = equity
+    return equities, method
+
+
+def _exact(stacks: List[int], payouts: Sequence[float]) -> List[float]:
+    n = len(stacks)
+    full = (1 << n) - 1
+    paid = len(payouts)
+    memo: Dict[int, List[float]] = {}
+
+    def remaining_equity(mask: int) -> List[float]:
+        """Expected payouts of the players in `mask` for the places they still play for"""
+        place = n - bin(mask).count("1")
+        if place >= paid:
+            return [0.0] * n
+        cached = memo.get(mask)
+        if cached is not None:
+            return cached
+
+        total = sum(stacks[i] for i in range(n) if mask >> i & 1)
+        result = [0.0] * n
+        for i in range(n):
+            if not mask >> i & 1:
+                continue
+            probability = stacks[i] / total
+            rest = remaining_equity(mask & ~(1 << i))
+            result[i] += probability * payouts[place]
+            for j in range(n):
+                result[j] += probability * rest[j]
+        memo[mask] = result
+        return result
+
+    return remaining_equity(full)
+
+
+def _monte_carlo(stacks: List[int], payouts: Sequence[float],
+                 trials: int = MONTE_CARLO_TRIALS, seed: int = MONTE_CARLO_SEED) -> List[float]:
+    """Sample finishing orders: sorting Exp(1) / stack ascending draws each
+    place with probability proportional to the remaining stacks"""
+    rng = np.random.default_rng(seed)
+    weights = np.asarray(stacks, dtype=np.float64)
+    prizes = np.asarray(payouts, dtype=np.float64)
+    paid = len(prizes)
+
+    totals = np.zeros(len(stacks))
+    batch = 20_000
+    for start in range(0, trials, batch):
+        size = min(batch, trials - start)
+        keys = rng.standard_exponential((size, len(stacks))) / weights
+        # Only the paid places matter, no need to sort the whole order
+        if paid < len(stacks):
+            top = np.argpartition(keys, paid - 1, axis=1)[:, :paid]
+            order = np.take_along_axis(top, np.argsort(np.take_along_axis(keys, top, axis=1), axis=1), axis=1)
+        else:
+            order = np.argsort(keys, axis=1)
+        totals += np.bincount(order.ravel(), weights=np.broadcast_to(prizes, order.shape).ravel(),
+                              minlength=len(stacks))
+    return (totals / trials).tolist()
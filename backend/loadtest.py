@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+In-process load test for the poker API.
+
+Mounts the FastAPI app through httpx's ASGI transport (no server, no
+network) and simulates many concurrent tables: every seated player polls
+/view, the player to act posts /action, and finished hands are restarted
+through /next-hand. The person database is swapped for mongomock-motor
+when it is installed, so no MongoDB is needed.
+
+    python loadtest.py --tables 200 --players 4 --duration 20
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+import httpx
+
+import server
+from database import PersonDatabase
+from poker_api import KNOWN_PLAYERS
+
+try:
+    from mongomock_motor import AsyncMongoMockClient
+except ImportError:  # pragma: no cover - optional dependency
+    AsyncMongoMockClient = None
+
+
+class LatencyRecorder:
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def request(self, client: httpx.AsyncClient, method: str, endpoint: str, url: str, **kwargs):
+        """Send a request and record its latency under the endpoint name"""
+        start = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        self.samples[endpoint].append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            self.errors[endpoint] += 1
+        return response
+
+    def report(self, elapsed: float):
+        print(f"{'endpoint':<16} {'requests':>9} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        for endpoint, samples in sorted(self.samples.items()):
+            samples.sort()
+            p50, p95, p99 = (samples[min(len(samples) - 1, int(len(samples) * q))] * 1000 for q in (0.50, 0.95, 0.99))
+            print(f"{endpoint:<16} {len(samples):>9} {len(samples) / elapsed:>9.0f} "
+                  f"{p50:>8.2f} {p95:>8.2f} {p99:>8.2f} {self.errors[endpoint]:>7}")
+        total = sum(len(s) for s in self.samples.values())
+        print(f"\nTotal: {total} requests in {elapsed:.1f}s ({total / elapsed:.0f} req/s)")
+
+
+async def _poll_player(client, recorder, game_id: str, player: dict, deadline: float, poll_interval: float):
+    """Poll the table like the frontend does and act when it is this player's turn"""
+    rng = random.Random(player["id"])
+    await asyncio.sleep(rng.random() * poll_interval)
+
+    while time.perf_counter() < deadline:
+        response = await recorder.request(client, "GET", "view", f"/api/poker/game/{game_id}/view/{player['id']}")
+        view = response.json()
+        state = view["state"]
+
+        if state["phase"] == "waiting":
+            # Every poller races for /next-hand, just like the clients do today
+            await recorder.request(client, "POST", "next-hand", f"/api/poker/game/{game_id}/next-hand")
+        elif view["actions"]["can_act"]:
+            if "check" in view["actions"]["actions"]:
+                action = {"player_id": player["id"], "action": "check"}
+            elif rng.random() < 0.1:
+                action = {"player_id": player["id"], "action": "fold"}
+            else:
+                action = {"player_id": player["id"], "action": "call"}
+            await recorder.request(client, "POST", "action", f"/api/poker/game/{game_id}/action", json=action)
+            continue
+
+        await asyncio.sleep(poll_interval)
+
+
+async def _run_table(client, recorder, players: int, deadline: float, poll_interval: float):
+    response = await recorder.request(client, "POST", "create", "/api/poker/game/create")
+    game_id = response.json()["game_id"]
+
+    seated = []
+    for name in KNOWN_PLAYERS[:players]:
+        response = await recorder.request(client, "POST", "join", f"/api/poker/game/{game_id}/join",
+                                          params={"player_name": name})
+        state = response.json()
+        seated.append(next(p for p in state["players_info"] if p["name"] == name))
+
+    await asyncio.gather(*(
+        _poll_player(client, recorder, game_id, player, deadline, poll_interval) for player in seated
+    ))
+
+
+async def run_load_test(tables: int, players: int, duration: float, poll_interval: float) -> LatencyRecorder:
+    if AsyncMongoMockClient is not None:
+        server.person_db = PersonDatabase(AsyncMongoMockClient()["loadtest"])
+
+    recorder = LatencyRecorder()
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(
+            _run_table(client, recorder, players, deadline, poll_interval) for _ in range(tables)
+        ))
+        recorder.report(time.perf_counter() - start)
+    return recorder
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-process load test for the poker API")
+    parser.add_argument("--tables", type=int, default=100)
+    parser.add_argument("--players", type=int, default=4, choices=range(2, 9), metavar="2-8")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds")
+    parser.add_argument("--poll-interval", type=float, default=2.0,
+                        help="Seconds between /view polls (the frontend uses 2s)")
+    parser.add_argument("--log-level", default="WARNING",
+                        help="Log level of the app while under load (INFO measures the per-request logging too)")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(args.log_level)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    asyncio.run(run_load_test(args.tables, args.players, args.duration, args.poll_interval))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime
 import uuid
+from rating import MU, SIGMA
 
 
 class Person(BaseModel):
@@ -32,4 +33,62 @@ class PersonBulkUpdate(BaseModel):
 
 
 class PersonBulkUpdateRequest(BaseModel):
-    persons: List[PersonBulkUpdate]
\ No newline at end of file
+    persons: List[PersonBulkUpdate]
+
+
+class Transaction(BaseModel):
+    """Append-only ledger row: one session result for one person"""
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    person_id: str
+    session_id: str
+    seq: int  # Per-person sequence number, used as pagination cursor
+    amount: float  # Result of this session (change in amount)
+    balance: float  # Person's amount after this session
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Config:
+        json_encoders = {
+            datetime: lambda v: v.isoformat()
+        }
+
+
+class PersonStats(BaseModel):
+    """Incrementally maintained aggregate over a person's ledger"""
+    person_id: str
+    name: str
+    balance: float = 0.0
+    total: float = 0.0
+    sessions: int = 0
+    best: Optional[float] = None
+    worst: Optional[float] = None
+    mu: float = MU  # Skill estimate (see rating.py)
+    sigma: float = SIGMA  # Uncertainty of the skill estimate
+    rating: float = 0.0  # Conservative skill: mu - 3 * sigma
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Config:
+        json_encoders = {
+            datetime: lambda v: v.isoformat()
+        }
+
+
+class TransactionPage(BaseModel):
+    items: List[Transaction]
+    next_cursor: Optional[int] = None
+
+
+class PersonRollup(BaseModel):
+    """Pre-aggregated results of a person within one period (month or year)"""
+    person_id: str
+    name: str
+    period: str  # "YYYY-MM" or "YYYY"
+    amount: float = 0.0  # Net result within the period
+    sessions: int = 0
+    best: Optional[float] = None
+    worst: Optional[float] = None
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Config:
+        json_encoders = {
+            datetime: lambda v: v.isoformat()
+        }
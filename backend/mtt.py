@@ -0,0 +1,175 @@
+"""
+Multi-table tournament seat balancing.
+
+TableBalancer tracks the player count of every table of a tournament in a
+pair of heaps (smallest / largest table first) with lazy invalidation, so
+a bust-out costs O(log n) instead of a scan over all tables.
+
+Balancing decisions are made immediately, but players only move between
+hands: a decision adds a route (source table -> destination table) and
+the routes are executed when the source table reaches its next hand
+boundary; the moved player is seated at the destination's next hand
+boundary. Counts always include players in transit, so decisions stay
+consistent while moves are pending.
+"""
+
+import heapq
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from poker_models import PokerGame, PokerPlayer
+
+MAX_SEATS = 8  # Same limit as join_game
+
+
+class TableBalancer:
+    def __init__(self, seats: int = MAX_SEATS):
+        self.seats = seats
+        self.counts: Dict[str, int] = {}  # Table -> players after pending moves
+        self._total = 0  # Sum of counts, kept by _set_count and remove_table
+        self._smallest: List[Tuple[int, str]] = []
+        self._largest: List[Tuple[int, str]] = []
+        self._routes: Dict[str, List[str]] = defaultdict(list)  # Source -> destinations
+        self._arrivals: Dict[str, List[PokerPlayer]] = defaultdict(list)  # Destination -> players
+        self._inbound: Dict[str, int] = defaultdict(int)  # Destination -> routed, not yet moved
+        self._breaking: set = set()
+
+    # --- table registry -------------------------------------------------
+
+    def add_table(self, table_id: str, players: int):
+        self._set_count(table_id, players)
+        self._rebalance()
+
+    def remove_table(self, table_id: str):
+        self._total -= self.counts.pop(table_id, 0)
+        self._breaking.discard(table_id)
+        self._routes.pop(table_id, None)
+
+    @property
+    def total_players(self) -> int:
+        return self._total
+
+    def waiting_for_players(self, table_id: str) -> bool:
+        """Players can still be moved to the table: other tables are left, or players are on their way"""
+        if table_id not in self.counts:
+            return False
+        return len(self.counts) > 1 or bool(self._inbound.get(table_id) or self._arrivals.get(table_id))
+
+    # --- hand boundary --------------------------------------------------
+
+    def before_hand(self, game: PokerGame) -> List[PokerPlayer]:
+        """Apply pending moves to a table that is between hands.
+
+        Busted players must already be removed from `game.players`.
+        Returns the players that left this table.
+        """
+        table_id = game.id
+        if table_id not in self.counts:
+            return []
+
+        # Sync the count with reality (eliminations, late joins)
+        if table_id not in self._breaking:
+            expected = (len(game.players) + len(self._arrivals[table_id])
+                        + self._inbound[table_id] - len(self._routes[table_id]))
+            if expected != self.counts[table_id]:
+                self._set_count(table_id, expected)
+                self._rebalance()
+
+        # Seat the players that were moved here (a broken table forwards them)
+        arrivals = self._arrivals.pop(table_id, [])
+        free_seats = len(arrivals) if table_id in self._breaking else self.seats - len(game.players)
+        game.players.extend(arrivals[:free_seats])
+        if arrivals[free_seats:]:
+            self._arrivals[table_id] = arrivals[free_seats:]
+
+        moved = []
+        for destination in self._routes.pop(table_id, []):
+            self._inbound[destination] -= 1
+            if not game.players:
+                # Busted before the move happened: the destination gets one less
+                if destination in self.counts:
+                    self._set_count(destination, self.counts[destination] - 1)
+                continue
+            player = self._pick_player(game)
+            game.players.remove(player)
+            self._arrivals[destination].append(player)
+            moved.append(player)
+
+        if table_id in self._breaking:
+            self.remove_table(table_id)
+        elif moved:
+            # Deliveries may unblock breaking a table that was waiting for them
+            self._rebalance()
+
+        for position, player in enumerate(game.players):
+            player.position = position
+        if game.players:
+            game.dealer_position %= len(game.players)
+        return moved
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "tables": dict(sorted(self.counts.items(), key=lambda item: -item[1])),
+            "total_players": self.total_players,
+            "pending_moves": {table: len(routes) for table, routes in self._routes.items() if routes},
+            "breaking": sorted(self._breaking),
+        }
+
+    # --- balancing --------------------------------------------------------
+
+    def _set_count(self, table_id: str, count: int):
+        self._total += count - self.counts.get(table_id, 0)
+        self.counts[table_id] = count
+        heapq.heappush(self._smallest, (count, table_id))
+        heapq.heappush(self._largest, (-count, table_id))
+        if len(self._smallest) > 4 * len(self.counts) + 16:
+            self._compact()
+
+    def _compact(self):
+        self._smallest = [(count, table) for table, count in self.counts.items()]
+        self._largest = [(-count, table) for table, count in self.counts.items()]
+        heapq.heapify(self._smallest)
+        heapq.heapify(self._largest)
+
+    def _peek(self, heap: List[Tuple[int, str]], sign: int) -> Optional[Tuple[int, str]]:
+        """Top valid (count, table) of a heap, dropping stale entries"""
+        while heap:
+            key, table_id = heap[0]
+            if self.counts.get(table_id) == key * sign and table_id not in self._breaking:
+                return key * sign, table_id
+            heapq.heappop(heap)
+        return None
+
+    def _route(self, source: str, destination: str):
+        self._routes[source].append(destination)
+        self._inbound[destination] += 1
+        self._set_count(destination, self.counts[destination] + 1)
+
+    def _rebalance(self):
+        # Break the smallest table while the others can absorb its players
+        tables = len(self.counts) - len(self._breaking)
+        while tables > 1 and self.total_players <= (tables - 1) * self.seats:
+            count, broken = self._peek(self._smallest, 1)
+            if self._inbound[broken]:
+                # Players are still on their way here; retried once they arrived
+                break
+            self._breaking.add(broken)
+            self._set_count(broken, 0)
+            for _ in range(count):
+                _, destination = self._peek(self._smallest, 1)
+                self._route(broken, destination)
+            tables -= 1
+
+        # Move single players from the largest to the smallest table
+        while True:
+            largest = self._peek(self._largest, -1)
+            smallest = self._peek(self._smallest, 1)
+            if not largest or not smallest or largest[0] - smallest[0] <= 1:
+                break
+            self._set_count(largest[1], largest[0] - 1)
+            self._route(largest[1], smallest[1])
+
+    @staticmethod
+    def _pick_player(game: PokerGame) -> PokerPlayer:
+        """The player due for the big blind moves, so nobody skips or repeats blinds"""
+        return game.players[(game.dealer_position + 2) % len(game.players)]
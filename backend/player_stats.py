@@ -0,0 +1,173 @@
+"""
+Per-player poker statistics from the engine's action stream.
+
+The tracker listens to the engine (see EngineListener): every hand keeps
+a small per-table state (raises so far, who already counted for VPIP,
+PFR, ...) and every event turns into counter increments for the player.
+Increments are buffered in memory and written to Mongo in batches with
+`$inc`, so a stats query is a single document read plus the unflushed
+buffer; hand histories are never re-scanned. Until start() gives it a
+collection, the tracker ignores the engine (e.g. in scripts that import
+the API without running the server).
+
+Players are keyed by name, the same names the ranking uses for persons.
+"""
+
+import logging
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Set
+
+from pymongo import UpdateOne
+
+from poker_engine import EngineListener
+from poker_models import GamePhase, PlayerAction, PokerGame, PokerPlayer, PokerPlayerStats
+from timer_wheel import TimerWheel
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 5.0  # Seconds
+FLUSH_BATCH = 500  # Pending increments that trigger an early flush
+
+COUNTERS = (
+    "hands", "vpip", "pfr", "three_bet", "three_bet_opportunities",
+    "postflop_aggressive", "postflop_calls", "showdowns", "showdowns_won",
+)
+
+
+class _HandState:
+    __slots__ = ("preflop_raises", "vpip", "pfr", "three_bet_seen")
+
+    def __init__(self):
+        self.preflop_raises = 0
+        self.vpip: Set[str] = set()
+        self.pfr: Set[str] = set()
+        self.three_bet_seen: Set[str] = set()  # Players that had their 3-bet opportunity
+
+
+class PlayerStatsTracker(EngineListener):
+    def __init__(self):
+        self.collection = None
+        self._hands: Dict[str, _HandState] = {}  # Game id -> state of the running hand
+        self._pending: Dict[str, Counter] = defaultdict(Counter)
+        self._pending_count = 0
+        self._in_flight: Dict[str, Counter] = {}  # Increments being written right now
+        self._wheel: Optional[TimerWheel] = None
+
+    def start(self, collection, wheel: TimerWheel):
+        """Persist to `collection`, flushing every FLUSH_INTERVAL on the timer wheel"""
+        self.collection = collection
+        self._wheel = wheel
+        wheel.schedule(FLUSH_INTERVAL, self._scheduled_flush)
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("name", unique=True)
+
+    # --- engine hooks -----------------------------------------------------
+
+    def on_hand_start(self, game: PokerGame):
+        if self.collection is None:
+            return  # Not started: nothing would ever flush the counters
+        self._hands[game.id] = _HandState()
+        for player in game.players:
+            self._count(player.name, "hands")
+
+    def on_action(self, game: PokerGame, player: PokerPlayer, action: PlayerAction, amount: int):
+        hand = self._hands.get(game.id)
+        if hand is None:
+            return
+
+        name = player.name
+        if game.phase == GamePhase.PRE_FLOP:
+            # A single raise in front (the open) is the chance to 3-bet
+            if hand.preflop_raises == 1 and name not in hand.pfr and name not in hand.three_bet_seen:
+                hand.three_bet_seen.add(name)
+                self._count(name, "three_bet_opportunities")
+                if action == PlayerAction.RAISE:
+                    self._count(name, "three_bet")
+
+            if action in (PlayerAction.CALL, PlayerAction.RAISE) and amount > 0 and name not in hand.vpip:
+                hand.vpip.add(name)
+                self._count(name, "vpip")
+            if action == PlayerAction.RAISE:
+                hand.preflop_raises += 1
+                if name not in hand.pfr:
+                    hand.pfr.add(name)
+                    self._count(name, "pfr")
+        else:
+            if action == PlayerAction.RAISE:
+                self._count(name, "postflop_aggressive")
+            elif action == PlayerAction.CALL and amount > 0:
+                self._count(name, "postflop_calls")
+
+    def on_hand_end(self, game: PokerGame, winners: List[PokerPlayer], showdown: bool):
+        if self._hands.pop(game.id, None) is None or not showdown:
+            return
+        winner_ids = {winner.id for winner in winners}
+        for player in game.players:
+            if player.is_active and not player.is_folded:
+                self._count(player.name, "showdowns")
+                if player.id in winner_ids:
+                    self._count(player.name, "showdowns_won")
+
+    # --- queries ------------------------------------------------------------
+
+    async def get(self, name: str) -> Optional[PokerPlayerStats]:
+        """Stored counters plus the unflushed increments of one player"""
+        counters = Counter(dict.fromkeys(COUNTERS, 0))
+        if self.collection is not None:
+            doc = await self.collection.find_one({"name": name})
+            if doc:
+                counters.update({key: doc.get(key, 0) for key in COUNTERS})
+        counters.update(self._in_flight.get(name, {}))
+        counters.update(self._pending.get(name, {}))
+        if not counters["hands"]:
+            return None
+        return PokerPlayerStats.from_counters(name, counters)
+
+    async def get_all(self) -> List[PokerPlayerStats]:
+        counters: Dict[str, Counter] = defaultdict(lambda: Counter(dict.fromkeys(COUNTERS, 0)))
+        if self.collection is not None:
+            async for doc in self.collection.find({}):
+                counters[doc["name"]].update({key: doc.get(key, 0) for key in COUNTERS})
+        for buffer in (self._in_flight, self._pending):
+            for name, increments in buffer.items():
+                counters[name].update(increments)
+        stats = [PokerPlayerStats.from_counters(name, c) for name, c in counters.items() if c["hands"]]
+        return sorted(stats, key=lambda s: -s.hands)
+
+    # --- persistence ----------------------------------------------------------
+
+    async def flush(self):
+        """Write the buffered increments with one bulk write"""
+        if self.collection is None or not self._pending or self._in_flight:
+            return
+        pending, self._pending = self._pending, defaultdict(Counter)
+        self._pending_count = 0
+        self._in_flight = pending
+        try:
+            await self.collection.bulk_write([
+                UpdateOne({"name": name}, {"$inc": dict(increments)}, upsert=True)
+                for name, increments in pending.items()
+            ], ordered=False)
+        except Exception:
+            logger.exception("Flushing player stats failed, keeping %s players for the next flush", len(pending))
+            for name, increments in pending.items():
+                self._pending[name].update(increments)
+        finally:
+            self._in_flight = {}
+
+    def _count(self, name: str, counter: str):
+        self._pending[name][counter] += 1
+        self._pending_count += 1
+        if self._pending_count >= FLUSH_BATCH and self._wheel is not None:
+            self._pending_count = 0
+            self._wheel.schedule(0, self.flush)
+
+    async def _scheduled_flush(self):
+        try:
+            await self.flush()
+        finally:
+            self._wheel.schedule(FLUSH_INTERVAL, self._scheduled_flush)
+
+
+player_stats = PlayerStatsTracker()
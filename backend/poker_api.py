@@ -1,10 +1,25 @@
-from fastapi import APIRouter, HTTPException
-from typing import Dict, List, Any
+from fastapi import APIRouter, HTTPException, Path, Query
+from fastapi.responses import Response, StreamingResponse
+from typing import Callable, Dict, List, Any, Optional
 from poker_models import (
     PokerGame, PokerPlayer, PokerAction, PlayerAction, 
-    GameStateResponse, GamePhase
+    GameStateResponse, GameViewResponse, GamePhase, IcmPlayer, IcmResult, PokerPlayerStats,
+    SpectatorFrame, PushFoldChart, OutsAnalysis, Variant
 )
 from poker_engine import PokerEngine
+from player_stats import player_stats
+from hand_history import hand_recorder, history_files, read_hands, to_pokerstars
+from icm import icm_equities
+from metrics import REGISTRY, TURN_TIMEOUTS
+from tournament import tournaments
+from turn_clock import NEXT_HAND_DELAY, TURN_SECONDS, turn_clocks
+from spectators import spectators
+from bots import BOT_DELAY, BOT_NAMES, bot_pool, bot_view
+from push_fold import CLASS_NAMES, hand_class, push_fold_charts
+from variants import describe, max_raise_to, ranking, strength
+from timer_wheel import timer_wheel
+import asyncio
+import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,6 +27,18 @@ logger = logging.getLogger(__name__)
 # In-memory game storage (in production, use database)
 active_games: Dict[str, PokerGame] = {}
 
+REGISTRY.gauge("poker_active_games", "Games in active_games", callback=lambda: len(active_games))
+REGISTRY.gauge("poker_turn_clocks", "Tables with a running turn clock", callback=lambda: len(turn_clocks))
+REGISTRY.gauge("poker_spectators", "Connected spectator streams", callback=lambda: spectators.viewer_count)
+REGISTRY.gauge("poker_push_fold_charts", "Solved or solving push/fold buckets", callback=lambda: len(push_fold_charts))
+
+# VPIP, PFR, ... and the hand histories are built from the engine's hand events
+PokerEngine.add_listener(player_stats)
+PokerEngine.add_listener(hand_recorder)
+
+# Answer for everybody whose turn it is not
+NO_ACTIONS: Dict[str, Any] = {"actions": [], "can_act": False}
+
 # Known players from the ranking system
 KNOWN_PLAYERS = [
     "Geri", "Sepp", "Toni", "Geri Ranner", "Manuel", 
@@ -22,13 +49,13 @@ poker_router = APIRouter(prefix="/api/poker", tags=["Poker"])
 
 
 @poker_router.post("/game/create")
-async def create_game() -> Dict[str, str]:
-    """Create a new poker game"""
-    game = PokerGame()
-    game.deck = game.create_deck()
+async def create_game(variant: Variant = Variant.HOLDEM) -> Dict[str, str]:
+    """Create a new poker game (Texas Hold'em unless another variant is asked for)"""
+    game = PokerGame(variant=variant)
     active_games[game.id] = game
+    spectators.record(game)
     
-    logger.info(f"Created new poker game: {game.id}")
+    logger.info("Created new poker game: %s", game.id, extra={"game_id": game.id})
     return {"game_id": game.id, "message": "Game created successfully"}
 
 
@@ -58,26 +85,53 @@ async def join_game(game_id: str, player_name: str) -> GameStateResponse:
         position=len(game.players),
         chips=1000  # Starting chips
     )
-    game.players.append(player)
-    
-    logger.info(f"Player {player_name} joined game {game_id}")
-    
-    # If we have enough players and game is waiting, start the game
-    if len(game.players) >= 2 and game.phase == GamePhase.WAITING:
-        game = PokerEngine.start_new_hand(game)
-        logger.info(f"Started new hand in game {game_id}")
+    _seat_player(game, player)
+    return _create_game_state_response(game, player.id)
+
+
+@poker_router.post("/game/{game_id}/bots")
+async def add_bots(game_id: str, count: int = Query(1, ge=1, le=7)) -> GameStateResponse:
+    """Fill empty seats with server-side bots"""
+    if game_id not in active_games:
+        raise HTTPException(status_code=404, detail="Game not found")
     
+    game = active_games[game_id]
+    if game.variant != Variant.HOLDEM:
+        raise HTTPException(status_code=400, detail="Bots only play Texas Hold'em")
+    free_names = [name for name in BOT_NAMES if all(p.name != name for p in game.players)]
+    if len(game.players) + count > 8:
+        raise HTTPException(status_code=400, detail="Not enough free seats")
+    
+    for name in free_names[:count]:
+        _seat_player(game, PokerPlayer(name=name, position=len(game.players), chips=1000, is_bot=True))
     return _create_game_state_response(game)
 
 
-@poker_router.get("/game/{game_id}/state")
-async def get_game_state(game_id: str) -> GameStateResponse:
+@poker_router.get("/game/{game_id}/state", response_model=GameStateResponse)
+async def get_game_state(game_id: str) -> Response:
     """Get current game state"""
     if game_id not in active_games:
         raise HTTPException(status_code=404, detail="Game not found")
     
     game = active_games[game_id]
-    return _create_game_state_response(game)
+    return Response(content=_cached(game, "state_json", _state_json), media_type="application/json")
+
+
+@poker_router.get("/game/{game_id}/view/{player_id}", response_model=GameViewResponse)
+async def get_game_view(game_id: str, player_id: str) -> Response:
+    """Game state and the player's available actions in one request, for polling clients"""
+    if game_id not in active_games:
+        raise HTTPException(status_code=404, detail="Game not found")
+    
+    game = active_games[game_id]
+    seat = game.seat_of(player_id)
+    if seat is None:
+        raise HTTPException(status_code=404, detail="Player not found")
+    
+    # Every player sees their own hole cards; only the player to act sees actions
+    actions = _cached(game, "actions", _legal_actions) if seat == game.current_player else NO_ACTIONS
+    content = _cached(game, f"view:{player_id}", lambda g: _view_json(g, player_id, actions))
+    return Response(content=content, media_type="application/json")
 
 
 @poker_router.post("/game/{game_id}/action")
@@ -97,22 +151,14 @@ async def player_action(game_id: str, action: PokerAction) -> GameStateResponse:
         raise HTTPException(status_code=400, detail="Not your turn")
     
     # Process the action
-    game = PokerEngine.process_action(game, action.player_id, action.action, action.amount)
-    
-    logger.info(f"Player action in game {game_id}: {game.last_action}")
-    
-    # Check if hand is finished and start new one
-    if game.phase == GamePhase.FINISHED:
-        # Wait a moment for showdown, then start new hand if players remain
-        active_players = [p for p in game.players if p.chips > 0]
-        if len(active_players) >= 2:
-            # Move dealer button
-            game.dealer_position = (game.dealer_position + 1) % len(game.players)
-            # Start new hand after a delay (handled by frontend)
-            # For now, set to waiting state
-            game.phase = GamePhase.WAITING
+    if not PokerEngine.process_action(game, action.player_id, action.action, action.amount):
+        raise HTTPException(status_code=400, detail="Invalid action")
     
-    return _create_game_state_response(game)
+    logger.info("Player action in game %s: %s", game_id, game.last_action, extra={"game_id": game_id})
+    
+    _hand_finished(game)
+    _state_changed(game)
+    return _create_game_state_response(game, action.player_id)
 
 
 @poker_router.post("/game/{game_id}/leave")
@@ -133,10 +179,13 @@ async def leave_game(game_id: str, player_name: str) -> Dict[str, str]:
     if not player_to_remove:
         raise HTTPException(status_code=404, detail="Player not found in game")
     
-    # Remove player from game
-    game.players.remove(player_to_remove)
+    # Remove player from game, folding their hand if one is running
+    PokerEngine.remove_player(game, player_to_remove.id)
     
-    logger.info(f"Player {player_name} left game {game_id}")
+    logger.info("Player %s left game %s", player_name, game_id, extra={"game_id": game_id})
+    # The last fold can end the hand
+    _hand_finished(game)
+    _state_changed(game)
     
     # Cleanup empty games
     cleanup_empty_games()
@@ -152,25 +201,81 @@ async def start_next_hand(game_id: str) -> GameStateResponse:
     
     game = active_games[game_id]
     
-    # Check if we can start a new hand
-    active_players = [p for p in game.players if p.chips > 0]
-    if len(active_players) < 2:
-        raise HTTPException(status_code=400, detail="Not enough players with chips")
-    
     # Remove players with no chips
     game.players = [p for p in game.players if p.chips > 0]
     
+    # Tournament tables pick up and hand off players between hands
+    moved = tournaments.before_hand(game)
+    if moved:
+        logger.info("Moved %s from game %s", ", ".join(p.name for p in moved), game_id, extra={"game_id": game_id})
+    game.state_version += 1
+    
+    # Check if we can start a new hand
+    if len(game.players) < 2:
+        if tournaments.waiting_for_players(game):
+            # Try again after the next pause; players moved here are seated then
+            game.phase = GamePhase.WAITING
+            _state_changed(game)
+        else:
+            # The table stops here
+            turn_clocks.cancel(game)
+            spectators.record(game)
+    if moved and not game.players:
+        raise HTTPException(status_code=400, detail="Table closed, players were moved to other tables")
+    if len(game.players) < 2:
+        raise HTTPException(status_code=400, detail="Not enough players with chips")
+    
     # Reassign positions
     for i, player in enumerate(game.players):
         player.position = i
     
     # Start new hand
-    game = PokerEngine.start_new_hand(game)
+    game = _start_hand(game)
+    _state_changed(game)
     
-    logger.info(f"Started next hand in game {game_id}")
+    logger.info("Started next hand in game %s", game_id, extra={"game_id": game_id})
     return _create_game_state_response(game)
 
 
+@poker_router.get("/game/{game_id}/spectate/state", response_model=SpectatorFrame)
+async def get_spectator_state(game_id: str) -> Response:
+    """Latest delayed, spectator-safe state of a table"""
+    if game_id not in active_games:
+        raise HTTPException(status_code=404, detail="Game not found")
+    
+    frame = spectators.latest(game_id)
+    if frame is None:
+        raise HTTPException(status_code=404, detail=f"Nothing to watch yet, spectators are {spectators.delay:g}s behind")
+    return Response(content=frame, media_type="application/json")
+
+
+@poker_router.get("/game/{game_id}/spectate")
+async def spectate_game(game_id: str):
+    """Server-sent events with the table state, delayed and without hole cards until showdown.
+    
+    Every event is a SpectatorFrame; the stream ends when the table is closed.
+    """
+    if game_id not in active_games:
+        raise HTTPException(status_code=404, detail="Game not found")
+    queue = spectators.subscribe(game_id)
+    
+    async def events():
+        try:
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                if message is None:
+                    break
+                yield message
+        finally:
+            spectators.unsubscribe(game_id, queue)
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
 @poker_router.get("/games/lobby")
 async def get_game_lobby() -> Dict[str, Any]:
     """Get list of available games for lobby"""
@@ -188,13 +293,16 @@ async def get_game_lobby() -> Dict[str, Any]:
                 "game_id": game_id,
                 "players_count": len(game.players),
                 "max_players": 8,
+                "variant": game.variant,
                 "phase": game.phase,
                 "players": [p.name for p in game.players],
                 "pot": game.pot,
                 "created_at": game.created_at.isoformat() if game.created_at else None
             })
     
-    logger.info(f"Lobby cleanup: {empty_removed} empty games, {inactive_removed} inactive games removed")
+    # The lobby is polled every few seconds by every client: only log actual cleanups
+    if empty_removed or inactive_removed:
+        logger.info("Lobby cleanup: %s empty games, %s inactive games removed", empty_removed, inactive_removed)
     
     return {
         "games": lobby_games,
@@ -213,42 +321,155 @@ async def get_available_actions(game_id: str, player_id: str) -> Dict[str, Any]:
         raise HTTPException(status_code=404, detail="Game not found")
     
     game = active_games[game_id]
-    player = next((p for p in game.players if p.id == player_id), None)
+    seat = game.seat_of(player_id)
     
-    if not player:
+    if seat is None:
         raise HTTPException(status_code=404, detail="Player not found")
     
-    if game.phase in [GamePhase.WAITING, GamePhase.FINISHED]:
-        return {"actions": [], "can_act": False}
+    if seat != game.current_player:
+        return NO_ACTIONS
+    return _cached(game, "actions", _legal_actions)
+
+
+@poker_router.get("/game/{game_id}/outs/{player_id}")
+async def get_outs(game_id: str, player_id: str) -> OutsAnalysis:
+    """The player's outs and chances to improve by the river, on the flop and turn"""
+    if game_id not in active_games:
+        raise HTTPException(status_code=404, detail="Game not found")
     
-    # Check if it's player's turn
-    current_player = game.players[game.current_player]
-    if current_player.id != player_id or player.is_folded:
-        return {"actions": [], "can_act": False}
+    game = active_games[game_id]
+    player = next((p for p in game.players if p.id == player_id), None)
+    if player is None:
+        raise HTTPException(status_code=404, detail="Player not found")
+    if game.variant != Variant.HOLDEM:
+        raise HTTPException(status_code=400, detail="Outs are only available in Texas Hold'em")
+    if game.phase not in [GamePhase.FLOP, GamePhase.TURN] or player.is_folded or len(player.cards) != 2:
+        raise HTTPException(status_code=400, detail="Outs are only available to players in the hand on the flop and turn")
     
-    actions = ["fold"]
+    return PokerEngine.analyze_outs(player.cards, game.community_cards)
+
+
+@poker_router.get("/game/{game_id}/icm")
+async def get_icm(game_id: str, payouts: List[float] = Query([], description="Prize for 1st, 2nd, ... place")) -> IcmResult:
+    """ICM equity of every player for a deal, e.g. ?payouts=500&payouts=300&payouts=200"""
+    if game_id not in active_games:
+        raise HTTPException(status_code=404, detail="Game not found")
+    if not payouts or any(payout < 0 for payout in payouts):
+        raise HTTPException(status_code=400, detail="Payouts are required and must not be negative")
     
-    # Can check if no bet to call
-    if player.current_bet == game.current_bet:
-        actions.append("check")
-    else:
-        # Can call if there's a bet
-        call_amount = game.current_bet - player.current_bet
-        if player.chips >= call_amount:
-            actions.append("call")
+    game = active_games[game_id]
+    payouts = sorted(payouts, reverse=True)
+    
+    # Mid-hand, chips already in the pot still count as the player's stack
+    in_hand = game.phase not in [GamePhase.WAITING, GamePhase.FINISHED]
+    stacks = [p.chips + (p.total_bet if in_hand else 0) for p in game.players]
+    equities, method = icm_equities(stacks, payouts)
+    
+    prize_pool = sum(payouts[:len([stack for stack in stacks if stack > 0])]) or 1
+    return IcmResult(
+        game_id=game_id,
+        payouts=payouts,
+        method=method,
+        players=[
+            IcmPlayer(
+                player_id=player.id,
+                name=player.name,
+                chips=stack,
+                equity=round(equity, 2),
+                equity_percent=round(100 * equity / prize_pool, 2)
+            )
+            for player, stack, equity in zip(game.players, stacks, equities)
+        ]
+    )
+
+
+@poker_router.get("/push-fold")
+async def get_push_fold(
+    players: int = Query(2, ge=2, le=3),
+    stack: float = Query(10, gt=0, description="Effective stack in big blinds"),
+    ante: float = Query(0, ge=0, description="Ante in big blinds")
+) -> PushFoldChart:
+    """Push/fold equilibrium ranges; the first request of a stack/ante bucket takes a few seconds"""
+    stack_bucket, ante_bucket, ranges = await push_fold_charts.get(players, stack, ante)
+    return PushFoldChart(players=players, stack=stack_bucket, ante=ante_bucket, classes=CLASS_NAMES, ranges=ranges)
+
+
+@poker_router.get("/game/{game_id}/push-fold")
+async def get_table_push_fold(game_id: str, player_id: str = "") -> PushFoldChart:
+    """Push/fold ranges for the table's effective stack, blinds and ante, plus the player's hand class"""
+    if game_id not in active_games:
+        raise HTTPException(status_code=404, detail="Game not found")
     
-    # Can raise if player has enough chips
-    min_raise = game.current_bet * 2
-    if player.chips > (game.current_bet - player.current_bet):
-        actions.append("raise")
+    game = active_games[game_id]
+    if game.variant != Variant.HOLDEM:
+        raise HTTPException(status_code=400, detail="Push/fold charts are for Texas Hold'em")
+    in_hand = game.phase not in [GamePhase.WAITING, GamePhase.FINISHED]
+    stacks = [p.chips + (p.total_bet if in_hand else 0) for p in game.players]
+    stacks = [stack for stack in stacks if stack > 0]
+    if not 2 <= len(stacks) <= 3:
+        raise HTTPException(status_code=400, detail="Push/fold charts cover heads-up and three-handed tables")
+    
+    # Everybody is as deep as the second biggest stack
+    effective = sorted(stacks)[-2] / game.big_blind
+    stack_bucket, ante_bucket, ranges = await push_fold_charts.get(len(stacks), effective, game.ante / game.big_blind)
     
-    return {
-        "actions": actions,
-        "can_act": True,
-        "call_amount": max(0, game.current_bet - player.current_bet),
-        "min_raise": min_raise,
-        "max_bet": player.chips + player.current_bet
-    }
+    player = next((p for p in game.players if p.id == player_id), None)
+    return PushFoldChart(
+        players=len(stacks),
+        stack=stack_bucket,
+        ante=ante_bucket,
+        classes=CLASS_NAMES,
+        ranges=ranges,
+        hand=hand_class([card.index for card in player.cards]) if player and len(player.cards) == 2 else None
+    )
+
+
+@poker_router.get("/stats")
+async def get_all_player_stats() -> List[PokerPlayerStats]:
+    """Get the table statistics of all players, most hands first"""
+    return await player_stats.get_all()
+
+
+@poker_router.get("/stats/{player_name}")
+async def get_player_stats(player_name: str) -> PokerPlayerStats:
+    """Get a player's table statistics (VPIP, PFR, 3-bet, aggression factor, showdowns)"""
+    stats = await player_stats.get(player_name)
+    if not stats:
+        raise HTTPException(status_code=404, detail="No hands played yet")
+    return stats
+
+
+@poker_router.get("/history")
+async def list_hand_histories() -> List[Dict[str, Any]]:
+    """List the recorded hand history files (one per day)"""
+    if hand_recorder.directory is None:
+        return []
+    hand_recorder.flush()
+    return [
+        {"day": path.stem, "size": path.stat().st_size}
+        for path in history_files(hand_recorder.directory)
+    ]
+
+
+@poker_router.get("/history/{day}")
+async def export_hand_history(day: str = Path(..., pattern=r"^\d{4}-\d{2}-\d{2}$")):
+    """Export the hands of a day (YYYY-MM-DD) in PokerStars text format"""
+    if hand_recorder.directory is None:
+        raise HTTPException(status_code=404, detail="Hand history not found")
+    path = hand_recorder.directory / f"{day}.phh"
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="Hand history not found")
+    hand_recorder.flush()
+    
+    def lines():
+        for hand in read_hands(path):
+            yield to_pokerstars(hand) + "\n\n"
+    
+    return StreamingResponse(
+        lines(),
+        media_type="text/plain",
+        headers={"Content-Disposition": f'attachment; filename="hands-{day}.txt"'}
+    )
 
 
 def cleanup_empty_games():
@@ -258,10 +479,11 @@ def cleanup_empty_games():
     for game_id, game in active_games.items():
         if len(game.players) == 0:
             games_to_remove.append(game_id)
-            logger.info(f"Removing empty game: {game_id}")
+            logger.info("Removing empty game: %s", game_id, extra={"game_id": game_id})
     
     for game_id in games_to_remove:
-        del active_games[game_id]
+        turn_clocks.cancel(active_games.pop(game_id))
+        spectators.close(game_id)
     
     return len(games_to_remove)
 
@@ -278,20 +500,178 @@ def cleanup_inactive_games():
         if (len(game.players) == 0 or 
             (game.created_at and game.created_at < cutoff_time)):
             games_to_remove.append(game_id)
-            logger.info(f"Removing inactive game: {game_id}")
+            logger.info("Removing inactive game: %s", game_id, extra={"game_id": game_id})
     
     for game_id in games_to_remove:
-        del active_games[game_id]
+        turn_clocks.cancel(active_games.pop(game_id))
+        spectators.close(game_id)
     
     return len(games_to_remove)
 
 
-def _create_game_state_response(game: PokerGame) -> GameStateResponse:
-    """Create a sanitized game state response"""
+def _seat_player(game: PokerGame, player: PokerPlayer):
+    """Add a player to the table and start a hand once two players are seated"""
+    if game.phase not in (GamePhase.WAITING, GamePhase.FINISHED):
+        # Sits out the running hand, dealt in from the next one
+        player.is_folded = True
+    game.players.append(player)
+    game.state_version += 1
+    
+    logger.info("Player %s joined game %s", player.name, game.id, extra={"game_id": game.id})
+    
+    # If we have enough players and game is waiting, start the game
+    if len(game.players) >= 2 and game.phase == GamePhase.WAITING:
+        game = _start_hand(game)
+        logger.info("Started new hand in game %s", game.id, extra={"game_id": game.id})
+    
+    _state_changed(game)
+
+
+def _hand_finished(game: PokerGame):
+    """Once a hand is over, move the button and wait for the next hand if players remain"""
+    if game.phase != GamePhase.FINISHED:
+        return
+    if _next_hand_possible(game):
+        # Move dealer button
+        game.dealer_position = (game.dealer_position + 1) % len(game.players)
+        # The turn clock starts the next hand after NEXT_HAND_DELAY,
+        # unless a client calls /next-hand first
+        game.phase = GamePhase.WAITING
+        game.state_version += 1
+
+
+def _state_changed(game: PokerGame):
+    """Run after every change of a table: queue the spectator frame and restart the table's clock"""
+    spectators.record(game)
+    
+    # The turn of the player to act, or the pause before the next hand
+    # A change that isn't a new turn (e.g. a player joining) keeps the deadline
+    if game.phase == GamePhase.WAITING and _next_hand_possible(game):
+        turn_clocks.set(game, NEXT_HAND_DELAY, _next_hand_due, turn=game.phase)
+    elif game.phase not in [GamePhase.WAITING, GamePhase.FINISHED]:
+        turn_clocks.set(game, TURN_SECONDS, _turn_expired, turn=(game.phase, game.players[game.current_player].id))
+        if game.players[game.current_player].is_bot:
+            version = game.state_version
+            timer_wheel.schedule(BOT_DELAY, lambda: _bot_turn(game.id, version))
+    else:
+        turn_clocks.cancel(game)
+
+
+def _next_hand_possible(game: PokerGame) -> bool:
+    """Two players with chips, or a short-handed tournament table that can still get players"""
+    # A tournament table only picks up players (or gets broken up) at the start of a hand
+    return sum(1 for p in game.players if p.chips > 0) >= 2 or tournaments.waiting_for_players(game)
+
+
+async def _turn_expired(game_id: str, version: int):
+    """The player to act ran out of time: check if possible, fold otherwise"""
+    game = active_games.get(game_id)
+    if game is None or game.state_version != version or game.phase in [GamePhase.WAITING, GamePhase.FINISHED]:
+        return
+    
+    player = game.players[game.current_player]
+    action = PlayerAction.CHECK if player.current_bet == game.current_bet else PlayerAction.FOLD
+    TURN_TIMEOUTS.inc(labels=(action.value,))
+    logger.info("Turn clock expired for %s in game %s", player.name, game_id, extra={"game_id": game_id})
+    try:
+        await player_action(game_id, PokerAction(player_id=player.id, action=action))
+    except HTTPException as e:
+        logger.warning("Timed out action in game %s failed: %s", game_id, e.detail, extra={"game_id": game_id})
+
+
+async def _bot_turn(game_id: str, version: int):
+    """Let the bot to act think in the pool, then act like a player"""
+    game = active_games.get(game_id)
+    if game is None or game.state_version != version:
+        return
+    
+    player = game.players[game.current_player]
+    action, amount = await bot_pool.decide(bot_view(game, player))
+    if active_games.get(game_id) is not game or game.state_version != version:
+        return  # The table moved on while the bot was thinking
+    try:
+        await player_action(game_id, PokerAction(player_id=player.id, action=action, amount=amount))
+    except HTTPException as e:
+        logger.warning("Bot action in game %s failed: %s", game_id, e.detail, extra={"game_id": game_id})
+
+
+async def _next_hand_due(game_id: str, version: int):
+    game = active_games.get(game_id)
+    if game is None or game.state_version != version or game.phase != GamePhase.WAITING:
+        return
+    try:
+        await start_next_hand(game_id)
+    except HTTPException as e:
+        logger.info("No next hand in game %s: %s", game_id, e.detail, extra={"game_id": game_id})
+
+
+def _start_hand(game: PokerGame) -> PokerGame:
+    """Start a hand, picking up the current blind level if the table is part of a tournament"""
+    tournaments.apply_level(game)
+    return PokerEngine.start_new_hand(game)
+
+
+def _cached(game: PokerGame, name: str, build: Callable[[PokerGame], Any]) -> Any:
+    """`build(game)`, computed once per state version of the game"""
+    entry = game._view_cache.get(name)
+    if entry is None or entry[0] != game.state_version:
+        entry = (game.state_version, build(game))
+        game._view_cache[name] = entry
+    return entry[1]
+
+
+def _legal_actions(game: PokerGame) -> Dict[str, Any]:
+    """Available actions of the player whose turn it is"""
+    if game.phase in [GamePhase.WAITING, GamePhase.FINISHED] or not game.players:
+        return NO_ACTIONS
+    player = game.players[game.current_player]
+    if player.is_folded or player.is_all_in:
+        return NO_ACTIONS
+    
+    actions = ["fold"]
+    call_amount = max(0, game.current_bet - player.current_bet)
+    
+    # Can check if no bet to call
+    if call_amount == 0:
+        actions.append("check")
+    elif player.chips >= call_amount:
+        # Can call if there's a bet
+        actions.append("call")
+    
+    # Can raise if player has enough chips
+    if player.chips > call_amount:
+        actions.append("raise")
+    
+    return {
+        "actions": actions,
+        "can_act": True,
+        "call_amount": call_amount,
+        "min_raise": max(game.current_bet * 2, game.big_blind),
+        "max_bet": max_raise_to(game, player)
+    }
+
+
+def _state_json(game: PokerGame) -> bytes:
+    return _create_game_state_response(game).model_dump_json().encode()
+
+
+def _view_json(game: PokerGame, player_id: str, actions: Dict[str, Any]) -> bytes:
+    """GameViewResponse of one player"""
+    state = _create_game_state_response(game, player_id).model_dump_json().encode()
+    return b'{"state":' + state + b',"actions":' + json.dumps(actions, separators=(",", ":")).encode() + b"}"
+
+
+def _create_game_state_response(game: PokerGame, viewer_id: Optional[str] = None) -> GameStateResponse:
+    """Create a sanitized game state response; hole cards are only shown to `viewer_id` or at showdown"""
     current_player_name = ""
     if game.phase not in [GamePhase.WAITING, GamePhase.FINISHED] and game.players:
         current_player_name = game.players[game.current_player].name
     
+    # Hands still in at the end are shown down, the others stay hidden
+    hand_over = game.phase in [GamePhase.SHOWDOWN, GamePhase.FINISHED, GamePhase.WAITING]
+    showdown = hand_over and sum(1 for p in game.players if not p.is_folded and p.cards) > 1
+    shown = {p.id for p in game.players if p.id == viewer_id or (showdown and not p.is_folded)}
+    
     # Create public player info (hide hole cards from other players)
     players_info = []
     for player in game.players:
@@ -308,27 +688,26 @@ def _create_game_state_response(game: PokerGame) -> GameStateResponse:
             "cards_count": len(player.cards)
         }
         
-        # Show cards in showdown/finished OR always show player's own cards
-        # FIXED: Every player sees their own cards all the time!
-        if (game.phase == GamePhase.SHOWDOWN or game.phase == GamePhase.FINISHED or 
-            len(player.cards) > 0):  # Show all cards for now - frontend will handle hiding others
+        if player.id in shown and player.cards:
             player_info["cards"] = player.cards
             
             # Show hand evaluation
             if not player.is_folded and len(game.community_cards) >= 3:
-                all_cards = player.cards + game.community_cards
-                if len(all_cards) >= 5:
-                    hand = PokerEngine.evaluate_hand(all_cards)
-                    player_info["hand"] = {
-                        "ranking": hand.ranking,
-                        "description": hand.description,
-                        "rank_value": hand.rank_value
-                    }
+                value = strength(game.variant, [card.index for card in player.cards],
+                                 [card.index for card in game.community_cards])
+                player_info["hand"] = {
+                    "ranking": ranking(game.variant, value),
+                    "description": describe(game.variant, value),
+                    "rank_value": value
+                }
         
         players_info.append(player_info)
     
+    # The game itself goes out without the hidden hole cards
+    players = [p if p.id in shown else p.model_copy(update={"cards": []}) for p in game.players]
+    
     return GameStateResponse(
-        game=game,
+        game=game.model_copy(update={"players": players}),
         current_player_name=current_player_name,
         pot=game.pot,
         community_cards=game.community_cards,
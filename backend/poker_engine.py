@@ -1,17 +1,56 @@
-from typing import List, Tuple, Dict, Optional
-from collections import Counter
+from typing import List, Tuple, Optional
+from functools import lru_cache
+from itertools import combinations
 from poker_models import (
     Card, PokerGame, PokerPlayer, PokerHand, HandRanking, 
-    PlayerAction, GamePhase, Rank, Suit
+    PlayerAction, GamePhase, Variant, CARDS, DrawOuts, OutsAnalysis
 )
+from metrics import HANDS_STARTED, ACTIONS_PROCESSED
+from canonical import canonical, inverse, relabel
+from hand_eval import CATEGORIES, draw_outs, evaluate
+from variants import describe, max_raise_to, strength
+
+OUTS_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=OUTS_CACHE_SIZE)
+def outs_canonical(hole: Tuple[int, ...], board: Tuple[int, ...]):
+    """hand_eval.draw_outs of canonical hole cards and board"""
+    return draw_outs(hole, board)
+
+
+class EngineListener:
+    """Receives hand events from the engine; override the hooks you need"""
+    
+    def on_hand_start(self, game: PokerGame):
+        pass
+    
+    def on_action(self, game: PokerGame, player: PokerPlayer, action: PlayerAction, amount: int):
+        """Called for every accepted action before the turn moves on; `amount` is the chips put in"""
+        pass
+    
+    def on_hand_end(self, game: PokerGame, winners: List[PokerPlayer], showdown: bool):
+        pass
 
 
 class PokerEngine:
-    """Texas Hold'em Poker Game Engine"""
+    """Poker game engine: Texas Hold'em, Pot-Limit Omaha and Short Deck (see variants.py)"""
+    
+    listeners: List[EngineListener] = []
+    
+    @staticmethod
+    def add_listener(listener: EngineListener):
+        if listener not in PokerEngine.listeners:
+            PokerEngine.listeners.append(listener)
+    
+    @staticmethod
+    def remove_listener(listener: EngineListener):
+        if listener in PokerEngine.listeners:
+            PokerEngine.listeners.remove(listener)
     
     @staticmethod
     def evaluate_hand(cards: List[Card]) -> PokerHand:
-        """Evaluate the best 5-card hand from 7 cards (2 hole + 5 community)"""
+        """Evaluate the best Hold'em hand from 5 to 7 cards (2 hole + community); rank_value is the strength"""
         if len(cards) < 5:
             return PokerHand(
                 cards=cards,
@@ -20,149 +59,45 @@ class PokerEngine:
                 description="Invalid hand"
             )
         
-        # Get all possible 5-card combinations
-        from itertools import combinations
-        best_hand = None
-        best_value = -1
-        
-        for combo in combinations(cards, 5):
-            hand = PokerEngine._evaluate_5_cards(list(combo))
-            if hand.rank_value > best_value:
-                best_hand = hand
-                best_value = hand.rank_value
-        
-        return best_hand
-    
-    @staticmethod
-    def _evaluate_5_cards(cards: List[Card]) -> PokerHand:
-        """Evaluate exactly 5 cards"""
-        cards_sorted = sorted(cards, key=lambda x: x.value, reverse=True)
-        ranks = [card.rank for card in cards_sorted]
-        suits = [card.suit for card in cards_sorted]
-        values = [card.value for card in cards_sorted]
-        
-        rank_counts = Counter(ranks)
-        suit_counts = Counter(suits)
-        
-        is_flush = len(suit_counts) == 1
-        is_straight = PokerEngine._is_straight(values)
-        
-        # Royal Flush
-        if is_flush and is_straight and values[0] == 14:  # Ace high straight
-            return PokerHand(
-                cards=cards_sorted,
-                ranking=HandRanking.ROYAL_FLUSH,
-                rank_value=100000,
-                description="Royal Flush"
-            )
-        
-        # Straight Flush
-        if is_flush and is_straight:
-            return PokerHand(
-                cards=cards_sorted,
-                ranking=HandRanking.STRAIGHT_FLUSH,
-                rank_value=90000 + values[0],
-                description=f"Straight Flush, {ranks[0]} high"
-            )
-        
-        # Four of a Kind
-        if 4 in rank_counts.values():
-            quad_rank = [rank for rank, count in rank_counts.items() if count == 4][0]
-            kicker = [rank for rank, count in rank_counts.items() if count == 1][0]
-            quad_value = Rank(quad_rank).value if hasattr(Rank, quad_rank) else 0
-            return PokerHand(
-                cards=cards_sorted,
-                ranking=HandRanking.FOUR_OF_A_KIND,
-                rank_value=80000 + quad_value * 100,
-                description=f"Four of a Kind, {quad_rank}s"
-            )
-        
-        # Full House
-        if 3 in rank_counts.values() and 2 in rank_counts.values():
-            trips = [rank for rank, count in rank_counts.items() if count == 3][0]
-            pair = [rank for rank, count in rank_counts.items() if count == 2][0]
-            trips_value = next((r.value for r in Rank if r.value == trips), 0)
-            return PokerHand(
-                cards=cards_sorted,
-                ranking=HandRanking.FULL_HOUSE,
-                rank_value=70000 + trips_value * 100,
-                description=f"Full House, {trips}s over {pair}s"
-            )
-        
-        # Flush
-        if is_flush:
-            return PokerHand(
-                cards=cards_sorted,
-                ranking=HandRanking.FLUSH,
-                rank_value=60000 + values[0],
-                description=f"Flush, {ranks[0]} high"
-            )
-        
-        # Straight
-        if is_straight:
-            return PokerHand(
-                cards=cards_sorted,
-                ranking=HandRanking.STRAIGHT,
-                rank_value=50000 + values[0],
-                description=f"Straight, {ranks[0]} high"
-            )
-        
-        # Three of a Kind
-        if 3 in rank_counts.values():
-            trips = [rank for rank, count in rank_counts.items() if count == 3][0]
-            trips_value = next((r.value for r in Rank if r.value == trips), 0)
-            return PokerHand(
-                cards=cards_sorted,
-                ranking=HandRanking.THREE_OF_A_KIND,
-                rank_value=40000 + trips_value * 100,
-                description=f"Three of a Kind, {trips}s"
-            )
-        
-        # Two Pair
-        pairs = [rank for rank, count in rank_counts.items() if count == 2]
-        if len(pairs) == 2:
-            high_pair = max(pairs, key=lambda x: next((r.value for r in Rank if r.value == x), 0))
-            return PokerHand(
-                cards=cards_sorted,
-                ranking=HandRanking.TWO_PAIR,
-                rank_value=30000 + values[0],
-                description=f"Two Pair, {high_pair}s"
-            )
-        
-        # One Pair
-        if 2 in rank_counts.values():
-            pair = [rank for rank, count in rank_counts.items() if count == 2][0]
-            pair_value = next((r.value for r in Rank if r.value == pair), 0)
-            return PokerHand(
-                cards=cards_sorted,
-                ranking=HandRanking.PAIR,
-                rank_value=20000 + pair_value * 100,
-                description=f"Pair of {pair}s"
-            )
-        
-        # High Card
+        value = strength(Variant.HOLDEM, [card.index for card in cards[:2]], [card.index for card in cards[2:]])
+        # The five cards that make it
+        best_cards = next(combo for combo in combinations(cards, 5) if evaluate(card.index for card in combo) == value)
         return PokerHand(
-            cards=cards_sorted,
-            ranking=HandRanking.HIGH_CARD,
-            rank_value=10000 + values[0],
-            description=f"High Card, {ranks[0]}"
+            cards=sorted(best_cards, key=lambda card: card.value, reverse=True),
+            ranking=CATEGORIES[value >> 20],
+            rank_value=value,
+            description=describe(Variant.HOLDEM, value)
         )
     
     @staticmethod
-    def _is_straight(values: List[int]) -> bool:
-        """Check if values form a straight"""
-        values_set = set(values)
-        
-        # Regular straight
-        for i in range(len(values) - 4):
-            if all(val in values_set for val in range(values[i] - 4, values[i] + 1)):
-                return True
-        
-        # Ace-low straight (A, 2, 3, 4, 5)
-        if {14, 5, 4, 3, 2}.issubset(values_set):
-            return True
-        
-        return False
+    def analyze_outs(cards: List[Card], community_cards: List[Card]) -> OutsAnalysis:
+        """Outs to every better hand ranking on the flop or turn, and the chances to make them"""
+        if len(cards) != 2 or len(community_cards) not in (3, 4):
+            raise ValueError("Outs need 2 hole cards and a flop or turn")
+        
+        # Same draws for every suit relabeling; outs are put back into the caller's suits
+        (hole, board), mapping = canonical([card.index for card in cards], [card.index for card in community_cards])
+        current, outs, by_river = outs_canonical(hole, board)
+        suits = inverse(mapping)
+        unseen = 52 - len(cards) - len(community_cards)
+        
+        draws = [
+            DrawOuts(
+                ranking=CATEGORIES[made],
+                outs=[CARDS[index] for index in sorted(relabel(outs[made], suits))],
+                next_card=round(len(outs[made]) / unseen, 4),
+                by_river=round(by_river[made], 4)
+            )
+            for made in range(current + 1, len(CATEGORIES))
+            if outs[made] or by_river[made] > 0
+        ]
+        return OutsAnalysis(
+            current=CATEGORIES[current],
+            unseen=unseen,
+            outs=sum(len(out) for out in outs),
+            improve_by_river=round(sum(by_river[current + 1:]), 4),
+            draws=draws
+        )
     
     @staticmethod
     def start_new_hand(game: PokerGame) -> PokerGame:
@@ -180,7 +115,7 @@ class PokerEngine:
         game.pot = 0
         game.current_bet = 0
         game.phase = GamePhase.PRE_FLOP
-        game.deck = game.create_deck()
+        game.shuffle_deck()
         
         # Post blinds
         PokerEngine._post_blinds(game)
@@ -188,50 +123,93 @@ class PokerEngine:
         # Deal hole cards
         game.deal_cards()
         
-        # Set first player to act (left of big blind)
-        game.current_player = (game.dealer_position + 3) % len(game.players)
-        
+        # Index the seats; everybody dealt in is in the hand
+        game._seats = {player.id: i for i, player in enumerate(game.players)}
+        game._in_hand = 0
+        game._can_act = 0
+        for i, player in enumerate(game.players):
+            if player.is_active:
+                game._in_hand += 1
+                if not player.is_all_in:
+                    game._can_act |= 1 << i
+        
+        # First player to act is left of the big blind; the big blind acts last
+        PokerEngine._start_betting_round(game, game.dealer_position + 3)
+        
+        HANDS_STARTED.inc()
+        for listener in PokerEngine.listeners:
+            listener.on_hand_start(game)
+        
+        # Blinds and antes can put everybody all-in
+        PokerEngine._finish_round_if_complete(game)
+        game.state_version += 1
         return game
     
     @staticmethod
     def _post_blinds(game: PokerGame):
-        """Post small and big blinds"""
+        """Post antes, small and big blinds"""
         if len(game.players) < 2:
             return
         
+        # Antes are dead money: they go to the pot but don't count towards the bet
+        if game.ante > 0:
+            for player in game.players:
+                if player.is_active and player.chips > 0:
+                    ante = min(game.ante, player.chips)
+                    player.chips -= ante
+                    player.total_bet += ante
+                    game.pot += ante
+                    if player.chips == 0:
+                        player.is_all_in = True
+        
         # Small blind (left of dealer)
         sb_pos = (game.dealer_position + 1) % len(game.players)
         if sb_pos < len(game.players):
-            game.players[sb_pos].current_bet = game.small_blind
-            game.players[sb_pos].total_bet = game.small_blind
-            game.players[sb_pos].chips -= game.small_blind
-            game.pot += game.small_blind
+            PokerEngine._post_blind(game, game.players[sb_pos], game.small_blind)
         
         # Big blind (left of small blind)
         bb_pos = (game.dealer_position + 2) % len(game.players)
         if bb_pos < len(game.players):
-            game.players[bb_pos].current_bet = game.big_blind
-            game.players[bb_pos].total_bet = game.big_blind
-            game.players[bb_pos].chips -= game.big_blind
-            game.pot += game.big_blind
+            PokerEngine._post_blind(game, game.players[bb_pos], game.big_blind)
             game.current_bet = game.big_blind
     
     @staticmethod
-    def process_action(game: PokerGame, player_id: str, action: PlayerAction, amount: int = 0) -> PokerGame:
-        """Process a player action"""
-        player = next((p for p in game.players if p.id == player_id), None)
-        if not player or player.is_folded:
-            return game
-        
+    def _post_blind(game: PokerGame, player: PokerPlayer, blind: int):
+        """Post a blind, all-in if the player can't cover it"""
+        posted = min(blind, player.chips)
+        player.current_bet = posted
+        player.total_bet += posted
+        player.chips -= posted
+        game.pot += posted
+        if player.chips == 0:
+            player.is_all_in = True
+    
+    @staticmethod
+    def process_action(game: PokerGame, player_id: str, action: PlayerAction, amount: int = 0) -> bool:
+        """Process a player action; False if it isn't valid now and nothing changed"""
+        seat = game.seat_of(player_id)
+        if seat is None or not game._to_act >> seat & 1:
+            return False  # Not at the table, folded, all-in or done for this round
+        player = game.players[seat]
+        bit = 1 << seat
+        
+        if action == PlayerAction.ALL_IN:
+            # The whole stack (capped at the pot in pot limit): a raise if it tops the bet, else a call
+            all_in = max_raise_to(game, player)
+            action, amount = (PlayerAction.RAISE, all_in) if all_in > game.current_bet else (PlayerAction.CALL, 0)
+        
+        put_in = 0
         if action == PlayerAction.FOLD:
             player.is_folded = True
+            game._in_hand -= 1
+            game._can_act &= ~bit
             game.last_action = f"{player.name} folds"
         
         elif action == PlayerAction.CHECK:
             if player.current_bet == game.current_bet:
                 game.last_action = f"{player.name} checks"
             else:
-                return game  # Can't check if bet to call
+                return False  # Can't check if bet to call
         
         elif action == PlayerAction.CALL:
             call_amount = game.current_bet - player.current_bet
@@ -240,6 +218,7 @@ class PokerEngine:
             player.current_bet += actual_call
             player.total_bet += actual_call
             game.pot += actual_call
+            put_in = actual_call
             
             if player.chips == 0:
                 player.is_all_in = True
@@ -249,15 +228,21 @@ class PokerEngine:
         
         elif action == PlayerAction.RAISE:
             if amount <= game.current_bet:
-                return game  # Invalid raise
+                return False  # Invalid raise
             
-            total_bet = min(amount, player.chips + player.current_bet)
+            # All-in, or a pot-sized raise in pot limit
+            total_bet = min(amount, max_raise_to(game, player))
             bet_amount = total_bet - player.current_bet
             player.chips -= bet_amount
             player.current_bet = total_bet
             player.total_bet += bet_amount
             game.pot += bet_amount
-            game.current_bet = total_bet
+            put_in = bet_amount
+            
+            if total_bet > game.current_bet:
+                # Everybody else gets to act again
+                game.current_bet = total_bet
+                game._to_act = game._can_act
             
             if player.chips == 0:
                 player.is_all_in = True
@@ -265,38 +250,117 @@ class PokerEngine:
             else:
                 game.last_action = f"{player.name} raises to {total_bet}"
         
+        else:
+            return False  # Unknown action: the turn stays with the player
+        
+        if player.is_all_in:
+            game._can_act &= ~bit
+        game._to_act &= ~bit
+        
+        ACTIONS_PROCESSED.inc(labels=(action.value,))
+        for listener in PokerEngine.listeners:
+            listener.on_action(game, player, action, put_in)
+        
         # Move to next player
         PokerEngine._next_player(game)
         
-        # Check if betting round is complete
-        if PokerEngine._is_betting_round_complete(game):
-            PokerEngine._advance_phase(game)
+        PokerEngine._finish_round_if_complete(game)
+        game.state_version += 1
+        return True
+    
+    @staticmethod
+    def remove_player(game: PokerGame, player_id: str) -> PokerGame:
+        """Take a player off the table; in a running hand they fold and their bets stay in the pot"""
+        seat = game.seat_of(player_id)
+        if seat is None:
+            return game
+        player = game.players[seat]
+        in_progress = game.phase not in (GamePhase.WAITING, GamePhase.FINISHED)
         
+        if in_progress and player.is_active and not player.is_folded:
+            player.is_folded = True
+            game._in_hand -= 1
+            game.last_action = f"{player.name} folds"
+            for listener in PokerEngine.listeners:
+                listener.on_action(game, player, PlayerAction.FOLD, 0)
+        
+        del game.players[seat]
+        game.state_version += 1
+        
+        # Close the gap in the seat bitmasks and indices
+        below = (1 << seat) - 1
+        game._can_act = (game._can_act & below) | (game._can_act >> (seat + 1) << seat)
+        game._to_act = (game._to_act & below) | (game._to_act >> (seat + 1) << seat)
+        game._seats = {p.id: i for i, p in enumerate(game.players)}
+        if seat < game.dealer_position:
+            game.dealer_position -= 1
+        if not game.players:
+            game.dealer_position = game.current_player = 0
+            return game
+        game.dealer_position %= len(game.players)
+        
+        if game.current_player > seat:
+            game.current_player -= 1
+        elif game.current_player == seat:
+            # Whoever is next in line acts now
+            game.current_player = seat % len(game.players)
+            next_seat = PokerEngine._next_to_act(game, game.current_player)
+            if next_seat is not None:
+                game.current_player = next_seat
+        
+        if in_progress:
+            PokerEngine._finish_round_if_complete(game)
         return game
     
+    @staticmethod
+    def _next_to_act(game: PokerGame, seat: int) -> Optional[int]:
+        """First seat at or after `seat`, going around the table, that still has to act"""
+        mask = game._to_act
+        if not mask:
+            return None
+        count = len(game.players)
+        seat %= count
+        # Rotate the mask so `seat` is bit 0, then take the lowest set bit
+        rotated = (mask >> seat | mask << (count - seat)) & ((1 << count) - 1)
+        return (seat + (rotated & -rotated).bit_length() - 1) % count
+    
     @staticmethod
     def _next_player(game: PokerGame):
-        """Move to next active player"""
-        for _ in range(len(game.players)):
-            game.current_player = (game.current_player + 1) % len(game.players)
-            player = game.players[game.current_player]
-            if player.is_active and not player.is_folded and not player.is_all_in:
-                break
+        """Move to the next player that still has to act"""
+        seat = PokerEngine._next_to_act(game, game.current_player + 1)
+        if seat is not None:
+            game.current_player = seat
     
     @staticmethod
     def _is_betting_round_complete(game: PokerGame) -> bool:
         """Check if current betting round is complete"""
-        active_players = [p for p in game.players if p.is_active and not p.is_folded]
-        
-        if len(active_players) <= 1:
-            return True
-        
-        # All players have either folded, called, or are all-in
-        for player in active_players:
-            if not player.is_all_in and player.current_bet != game.current_bet:
-                return False
-        
-        return True
+        return not game._to_act or game._in_hand <= 1
+    
+    @staticmethod
+    def _start_betting_round(game: PokerGame, first_seat: int):
+        """Everybody who can act has to, starting at `first_seat`"""
+        game._to_act = game._can_act
+        if game._to_act and not game._to_act & (game._to_act - 1):
+            # A single player who can still bet has nobody to bet against,
+            # unless they have to call an all-in blind
+            seat = game._to_act.bit_length() - 1
+            if game.players[seat].current_bet >= game.current_bet:
+                game._to_act = 0
+        seat = PokerEngine._next_to_act(game, first_seat)
+        if seat is not None:
+            game.current_player = seat
+    
+    @staticmethod
+    def _finish_round_if_complete(game: PokerGame):
+        """Award the pot when one player is left, deal on while nobody has to act"""
+        if game.phase in (GamePhase.WAITING, GamePhase.SHOWDOWN, GamePhase.FINISHED):
+            return
+        if game._in_hand <= 1:
+            # Everybody else folded - no need to run the board
+            PokerEngine._determine_winner(game)
+            return
+        while not game._to_act and game.phase not in (GamePhase.SHOWDOWN, GamePhase.FINISHED):
+            PokerEngine._advance_phase(game)
     
     @staticmethod
     def _advance_phase(game: PokerGame):
@@ -320,8 +384,8 @@ class PokerEngine:
             PokerEngine._determine_winner(game)
         
         # Set current player to left of dealer for new betting round
-        if game.phase != GamePhase.SHOWDOWN:
-            game.current_player = (game.dealer_position + 1) % len(game.players)
+        if game.phase not in (GamePhase.SHOWDOWN, GamePhase.FINISHED):
+            PokerEngine._start_betting_round(game, game.dealer_position + 1)
     
     @staticmethod
     def _determine_winner(game: PokerGame):
@@ -334,32 +398,35 @@ class PokerEngine:
             winner.chips += game.pot
             game.winner_id = winner.id
             game.last_action = f"{winner.name} wins {game.pot} chips!"
+            winners = [winner]
         else:
-            # Evaluate hands
-            best_hands = {}
-            for player in active_players:
-                all_cards = player.cards + game.community_cards
-                best_hands[player.id] = PokerEngine.evaluate_hand(all_cards)
+            # Evaluate hands by the variant's rules
+            board = [card.index for card in game.community_cards]
+            best_hands = {
+                player.id: strength(game.variant, [card.index for card in player.cards], board)
+                for player in active_players
+            }
             
             # Find winner(s)
-            best_value = max(hand.rank_value for hand in best_hands.values())
-            winners = [
-                player for player in active_players 
-                if best_hands[player.id].rank_value == best_value
-            ]
+            best_value = max(best_hands.values())
+            winners = [player for player in active_players if best_hands[player.id] == best_value]
             
-            # Split pot among winners
-            pot_per_winner = game.pot // len(winners)
-            for winner in winners:
-                winner.chips += pot_per_winner
+            # Split pot among winners, odd chips go to the first winners left of the dealer
+            pot_per_winner, odd_chips = divmod(game.pot, len(winners))
+            winners.sort(key=lambda p: (p.position - game.dealer_position - 1) % len(game.players))
+            for i, winner in enumerate(winners):
+                winner.chips += pot_per_winner + (1 if i < odd_chips else 0)
             
             if len(winners) == 1:
                 game.winner_id = winners[0].id
-                hand_desc = best_hands[winners[0].id].description
+                hand_desc = describe(game.variant, best_hands[winners[0].id])
                 game.last_action = f"{winners[0].name} wins {pot_per_winner} chips with {hand_desc}!"
             else:
                 winner_names = ", ".join(w.name for w in winners)
                 game.last_action = f"Split pot! {winner_names} each win {pot_per_winner} chips!"
         
         game.phase = GamePhase.FINISHED
-        game.pot = 0
\ No newline at end of file
+        game.pot = 0
+        
+        for listener in PokerEngine.listeners:
+            listener.on_hand_end(game, winners, len(active_players) > 1)
\ No newline at end of file
@@ -1,7 +1,9 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, Field, PrivateAttr
+from typing import List, Optional, Dict, Any, Sequence
 from datetime import datetime
 from enum import Enum
+import os
+import struct
 import uuid
 import random
 
@@ -44,6 +46,98 @@ class Card(BaseModel):
             "9": 9, "10": 10, "J": 11, "Q": 12, "K": 13, "A": 14
         }
         return values[self.rank]
+    
+    @property
+    def index(self) -> int:
+        """Compact encoding 0-51: suit * 13 + rank (2 = 0 ... Ace = 12)"""
+        return SUIT_ORDER[self.suit] * 13 + RANK_ORDER[self.rank]
+    
+    @classmethod
+    def from_index(cls, index: int) -> "Card":
+        suit, rank = divmod(index, 13)
+        return cls(suit=SUITS[suit], rank=RANKS[rank])
+
+
+# Order used by Card.index
+SUITS = list(Suit)
+RANKS = list(Rank)
+SUIT_ORDER = {suit: i for i, suit in enumerate(SUITS)}
+RANK_ORDER = {rank: i for i, rank in enumerate(RANKS)}
+
+# The 52 cards, built once and shared by all decks (indexed by Card.index)
+CARDS = tuple(Card.from_index(index) for index in range(52))
+
+
+class Variant(str, Enum):
+    HOLDEM = "holdem"  # No-Limit Texas Hold'em
+    OMAHA = "omaha"  # Pot-Limit Omaha
+    SHORT_DECK = "short_deck"  # No-Limit Hold'em with the 36 cards from six to ace
+
+
+HOLE_CARDS = {Variant.HOLDEM: 2, Variant.OMAHA: 4, Variant.SHORT_DECK: 2}
+FULL_DECK = tuple(range(52))
+SHORT_DECK = tuple(index for index in range(52) if index % 13 >= RANK_ORDER[Rank.SIX])
+DECK_CARDS = {Variant.HOLDEM: FULL_DECK, Variant.OMAHA: FULL_DECK, Variant.SHORT_DECK: SHORT_DECK}
+
+
+class Deck:
+    """Preallocated array of card indices, shuffled in place (Fisher-Yates).
+    
+    Randomness is drawn in one call per shuffle: from the OS CSPRNG by
+    default, or from a seeded PRNG for games created with a seed. In seeded
+    mode every hand gets its own 64-bit `hand_seed` drawn from the game's
+    generator, so a single hand can be replayed from it (Deck.for_hand).
+    """
+    
+    __slots__ = ("_order", "_next", "_rng", "_draws", "hand_seed")
+    
+    def __init__(self, seed: Optional[int] = None, cards: Sequence[int] = FULL_DECK):
+        self._order = bytearray(cards)
+        self._next = len(cards)  # Empty until shuffled
+        self._rng = random.Random(seed) if seed is not None else None
+        self._draws = struct.Struct(f"<{len(cards) - 1}Q")  # One 64-bit value per swap
+        self.hand_seed: Optional[int] = None
+    
+    @classmethod
+    def for_hand(cls, hand_seed: int, cards: Sequence[int] = FULL_DECK) -> "Deck":
+        """The deck of a recorded hand, in the order it was dealt"""
+        deck = cls(cards=cards)
+        deck.hand_seed = hand_seed
+        deck._shuffle_with(random.Random(hand_seed).randbytes(deck._draws.size))
+        return deck
+    
+    def shuffle(self):
+        if self._rng is None:
+            self._shuffle_with(os.urandom(self._draws.size))
+        else:
+            self.hand_seed = self._rng.getrandbits(64)
+            self._shuffle_with(random.Random(self.hand_seed).randbytes(self._draws.size))
+    
+    def _shuffle_with(self, data: bytes):
+        draws = self._draws.unpack(data)
+        order = self._order
+        swaps = len(order) - 1
+        for i in range(swaps, 0, -1):
+            # Multiply-shift maps a 64-bit draw to [0, i]; the bias is below 2^-58
+            j = (draws[swaps - i] * (i + 1)) >> 64
+            order[i], order[j] = order[j], order[i]
+        self._next = 0
+    
+    def deal(self) -> Card:
+        card = CARDS[self._order[self._next]]
+        self._next += 1
+        return card
+    
+    def burn(self):
+        self._next += 1
+    
+    @property
+    def remaining(self) -> int:
+        return len(self._order) - self._next
+    
+    def order(self) -> bytes:
+        """Card order (Card.index values) of the current shuffle, for audits"""
+        return bytes(self._order)
 
 
 class HandRanking(str, Enum):
@@ -87,6 +181,7 @@ class PokerPlayer(BaseModel):
     is_folded: bool = False
     is_all_in: bool = False
     is_active: bool = True
+    is_bot: bool = False  # Played by the server (see bots.py)
     position: int  # 0-7 for 8 players
     
     class Config:
@@ -102,56 +197,102 @@ class PokerHand(BaseModel):
     description: str
 
 
+class DrawOuts(BaseModel):
+    ranking: HandRanking
+    outs: List[Card]  # Next cards that make this ranking
+    next_card: float  # Chance that the next card is one of the outs
+    by_river: float  # Chance to end the hand with this ranking
+
+
+class OutsAnalysis(BaseModel):
+    """Draws of a hand on the flop or turn"""
+    current: HandRanking
+    unseen: int  # Cards the next one is drawn from
+    outs: int  # Cards that improve the hand
+    improve_by_river: float  # Chance to end with a better ranking than now
+    draws: List[DrawOuts]  # Better rankings that can still be made, weakest first
+
+
 class PokerGame(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     players: List[PokerPlayer] = []
     community_cards: List[Card] = []
-    deck: List[Card] = []
     pot: int = 0
     current_bet: int = 0
     small_blind: int = 10
     big_blind: int = 20
+    ante: int = 0
+    variant: Variant = Variant.HOLDEM
+    tournament_id: Optional[str] = None
     dealer_position: int = 0
     current_player: int = 0
     phase: GamePhase = GamePhase.WAITING
     created_at: datetime = Field(default_factory=datetime.utcnow)
     last_action: Optional[str] = None
     winner_id: Optional[str] = None
+    # Bumped on every change, clients can skip redrawing an unchanged table
+    state_version: int = 0
+    # When the player to act runs out of time, or the next hand starts (see turn_clock)
+    deadline: Optional[datetime] = None
+    # Seeded PRNG instead of the OS CSPRNG, for reproducible games; never sent to clients
+    seed: Optional[int] = Field(None, exclude=True)
+    # The undealt cards stay on the server
+    _deck: Deck = PrivateAttr()
+    # Betting round state kept by the engine: seat of every player id, bitmasks
+    # (bit = seat) of players that can still act and that still have to act
+    # this round, and the number of players that have not folded
+    _seats: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _can_act: int = PrivateAttr(0)
+    _to_act: int = PrivateAttr(0)
+    _in_hand: int = PrivateAttr(0)
+    # Views derived from the state: name -> (state_version, value), see poker_api
+    _view_cache: Dict[str, Any] = PrivateAttr(default_factory=dict)
     
-    def create_deck(self) -> List[Card]:
-        """Create and shuffle a standard 52-card deck"""
-        deck = []
-        for suit in Suit:
-            for rank in Rank:
-                deck.append(Card(suit=suit, rank=rank))
-        random.shuffle(deck)
-        return deck
+    def model_post_init(self, __context: Any):
+        self._deck = Deck(self.seed, DECK_CARDS[self.variant])
+    
+    def seat_of(self, player_id: str) -> Optional[int]:
+        """Seat index of a player, None if not at the table"""
+        seat = self._seats.get(player_id)
+        if seat is None or seat >= len(self.players) or self.players[seat].id != player_id:
+            # Players joined or left since the index was built
+            self._seats = {player.id: i for i, player in enumerate(self.players)}
+            seat = self._seats.get(player_id)
+        return seat
+    
+    def shuffle_deck(self):
+        """Shuffle the deck for a new hand"""
+        self._deck.shuffle()
+    
+    @property
+    def hand_seed(self) -> Optional[int]:
+        """Seed of the current hand's shuffle (only for games created with a seed)"""
+        return self._deck.hand_seed
     
     def deal_cards(self):
-        """Deal 2 cards to each active player"""
-        if not self.deck:
-            self.deck = self.create_deck()
+        """Deal the variant's hole cards (2, or 4 in Omaha) to each active player"""
+        if not self._deck.remaining:
+            self._deck.shuffle()
         
-        # Deal 2 cards to each player
-        for _ in range(2):
+        # One card at a time, round the table
+        for _ in range(HOLE_CARDS[self.variant]):
             for player in self.players:
                 if player.is_active and not player.is_folded:
-                    if self.deck:
-                        player.cards.append(self.deck.pop())
+                    if self._deck.remaining:
+                        player.cards.append(self._deck.deal())
     
     def deal_community_cards(self, count: int):
         """Deal community cards (flop=3, turn=1, river=1)"""
-        if not self.deck:
+        if not self._deck.remaining:
             return
         
         # Burn one card before dealing
-        if self.deck:
-            self.deck.pop()
+        self._deck.burn()
         
         # Deal community cards
         for _ in range(count):
-            if self.deck:
-                self.community_cards.append(self.deck.pop())
+            if self._deck.remaining:
+                self.community_cards.append(self._deck.deal())
 
 
 class PokerAction(BaseModel):
@@ -167,4 +308,125 @@ class GameStateResponse(BaseModel):
     community_cards: List[Card]
     phase: GamePhase
     players_info: List[Dict[str, Any]]  # Public player info
-    message: str = ""
\ No newline at end of file
+    message: str = ""
+
+
+class GameViewResponse(BaseModel):
+    """Table state and the player's available actions in one response"""
+    state: GameStateResponse
+    actions: Dict[str, Any]
+
+
+class BlindLevel(BaseModel):
+    small: int
+    big: int
+    ante: int = 0
+    duration: int = 20  # Minutes
+
+
+class TournamentCreate(BaseModel):
+    name: str = "Turnier"
+    levels: List[BlindLevel] = []
+
+
+class SpectatorPlayer(BaseModel):
+    name: str
+    chips: int
+    current_bet: int
+    total_bet: int
+    is_folded: bool
+    is_all_in: bool
+    position: int
+    cards_count: int
+    cards: List[Card] = []  # Only shown at showdown
+
+
+class SpectatorFrame(BaseModel):
+    """What spectators see of a table, without hole cards before the showdown"""
+    game_id: str
+    state_version: int
+    variant: Variant
+    phase: GamePhase
+    pot: int
+    current_bet: int
+    small_blind: int
+    big_blind: int
+    ante: int
+    dealer_position: int
+    current_player_name: str
+    community_cards: List[Card]
+    players: List[SpectatorPlayer]
+    message: str = ""
+    recorded_at: datetime
+    delay: float  # Seconds the frame was held back
+
+
+class TournamentClock(BaseModel):
+    tournament_id: str
+    name: str
+    level: int  # 1-based, like the blind timer
+    small_blind: int
+    big_blind: int
+    ante: int
+    level_duration: int  # Seconds
+    remaining: float  # Seconds left in the level
+    level_ends_at: Optional[datetime] = None  # None while paused
+    running: bool
+    finished: bool
+    next_level: Optional[BlindLevel] = None
+    game_ids: List[str] = []
+
+
+class IcmPlayer(BaseModel):
+    player_id: str
+    name: str
+    chips: int
+    equity: float  # In units of the payouts
+    equity_percent: float  # Share of the prize pool
+
+
+class IcmResult(BaseModel):
+    game_id: str
+    payouts: List[float]
+    method: str  # "exact" or "monte_carlo"
+    players: List[IcmPlayer]
+
+
+class PushFoldChart(BaseModel):
+    """Push/fold equilibrium ranges for a stack depth and ante bucket"""
+    players: int  # 2: small blind vs big blind, 3: button, small and big blind
+    stack: int  # Effective stack in big blinds
+    ante: float  # In big blinds
+    classes: List[str]  # 13x13 grid, row by row: pairs on the diagonal, suited above, offsuit below
+    ranges: Dict[str, List[float]]  # Push or call frequency per class, by decision
+    hand: Optional[str] = None  # Class of the requesting player's hole cards
+
+
+class PokerPlayerStats(BaseModel):
+    name: str
+    hands: int
+    vpip: float  # % of hands with money put in voluntarily preflop
+    pfr: float  # % of hands raised preflop
+    three_bet: float  # % of re-raises when facing a single preflop raise
+    aggression_factor: Optional[float] = None  # Postflop (bets + raises) / calls
+    showdowns: int
+    showdown_win: float  # % of showdowns won
+    counters: Dict[str, int]
+    
+    @classmethod
+    def from_counters(cls, name: str, counters: Dict[str, int]) -> "PokerPlayerStats":
+        def percent(part: str, whole: str) -> float:
+            return round(100 * counters.get(part, 0) / counters[whole], 1) if counters.get(whole) else 0.0
+        
+        calls = counters.get("postflop_calls", 0)
+        return cls(
+            name=name,
+            hands=counters.get("hands", 0),
+            vpip=percent("vpip", "hands"),
+            pfr=percent("pfr", "hands"),
+            three_bet=percent("three_bet", "three_bet_opportunities"),
+            aggression_factor=round(counters.get("postflop_aggressive", 0) / calls, 2) if calls else None,
+            showdowns=counters.get("showdowns", 0),
+            showdown_win=percent("showdowns_won", "showdowns"),
+            counters=dict(counters)
+        )
@@ -0,0 +1,221 @@
+"""
+Opt-in sampling profiler for hot requests (debug only).
+
+When PROFILING_ENABLED is set, a request is profiled if it carries the
+`X-Profile: 1` header or the `profile=1` query flag. In addition a
+fraction PROFILE_SAMPLE_RATE of all requests is profiled and kept only
+if it took longer than PROFILE_THRESHOLD_MS.
+
+Profiling runs a background thread that samples the stack of the thread
+serving the request every PROFILE_INTERVAL_MS. Stacks are stored in the
+folded format ("outer;inner;leaf count") understood by flamegraph.pl and
+speedscope. The event loop interleaves requests, so only samples whose
+stack runs through the request's own middleware frame are kept: while the
+request awaits, the loop's work for other requests is left out. Sync
+endpoints run in the threadpool and show up as waiting time only.
+
+Profiles are kept in a ring buffer and served by the admin router.
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from datetime import datetime
+from types import FrameType
+from typing import Deque, Dict, List, Optional
+from urllib.parse import parse_qs
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, Field
+
+
+PROFILE_HEADER = b"x-profile"
+
+
+def profiling_enabled() -> bool:
+    return os.environ.get("PROFILING_ENABLED", "").lower() in ("1", "true", "yes")
+
+
+class ProfileSummary(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    method: str
+    path: str
+    route: str
+    status: int
+    duration_ms: float
+    samples: int
+    triggered_by: str  # "request" (header/query flag) or "threshold"
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class StackSampler:
+    """Samples the stack of one thread at a fixed interval.
+
+    With a `root` frame, only stacks running through it are kept, from
+    `root` down; on an event loop thread that is one task's work.
+    """
+
+    def __init__(self, thread_id: int, interval: float, root: Optional[FrameType] = None):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.root = root
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        # No join, this runs on the event loop: the thread ends at its next wakeup
+        # and the lock makes sure it doesn't add to the stacks after this
+        with self._lock:
+            self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                if frame is self.root:
+                    break
+                frame = frame.f_back
+            if not names or (self.root is not None and frame is None):
+                continue  # Idle, or running something else
+            with self._lock:
+                if not self._stop.is_set():
+                    self.stacks[";".join(reversed(names))] += 1
+
+    def folded(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+
+class ProfileStore:
+    """Ring buffer of the most recent profiles"""
+
+    def __init__(self, size: int = 50):
+        self._entries: Deque[tuple] = deque(maxlen=size)
+
+    def resize(self, size: int):
+        self._entries = deque(self._entries, maxlen=size)
+
+    def add(self, summary: ProfileSummary, folded: str):
+        self._entries.append((summary, folded))
+
+    def list(self) -> List[ProfileSummary]:
+        return [summary for summary, _ in reversed(self._entries)]
+
+    def get(self, profile_id: str) -> Optional[tuple]:
+        return next((entry for entry in self._entries if entry[0].id == profile_id), None)
+
+    def clear(self):
+        self._entries.clear()
+
+
+profile_store = ProfileStore()
+
+
+def _explicitly_requested(scope) -> bool:
+    for name, value in scope.get("headers", []):
+        if name == PROFILE_HEADER and value in (b"1", b"true"):
+            return True
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    return query.get("profile", [""])[0] in ("1", "true")
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling flagged requests and a sample of slow ones"""
+
+    def __init__(self, app, sample_rate: float = 0.0, threshold_ms: float = 100.0,
+                 interval_ms: float = 1.0, store: ProfileStore = profile_store):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.threshold_ms = threshold_ms
+        self.interval = interval_ms / 1000
+        self.store = store
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        requested = _explicitly_requested(scope)
+        if not requested and (self.sample_rate <= 0 or random.random() >= self.sample_rate):
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        sampler = StackSampler(threading.get_ident(), self.interval, sys._getframe())
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.stop()
+            duration_ms = (time.perf_counter() - start) * 1000
+            if requested or duration_ms >= self.threshold_ms:
+                summary = ProfileSummary(
+                    method=scope["method"],
+                    path=scope["path"],
+                    route=getattr(scope.get("route"), "path", "unmatched"),
+                    status=status["code"],
+                    duration_ms=round(duration_ms, 3),
+                    samples=sum(sampler.stacks.values()),
+                    triggered_by="request" if requested else "threshold",
+                )
+                self.store.add(summary, sampler.folded())
+
+
+admin_router = APIRouter(prefix="/api/admin/profiles", tags=["Admin"])
+
+
+@admin_router.get("")
+async def list_profiles() -> List[ProfileSummary]:
+    """List stored profiles, newest first"""
+    return profile_store.list()
+
+
+@admin_router.get("/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(profile_id: str) -> str:
+    """Get a profile as folded stacks (input for flamegraph.pl / speedscope)"""
+    entry = profile_store.get(profile_id)
+    if not entry:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return entry[1]
+
+
+@admin_router.delete("")
+async def clear_profiles() -> Dict[str, str]:
+    """Drop all stored profiles"""
+    profile_store.clear()
+    return {"message": "Profiles cleared"}
+
+
+def setup_profiling(app) -> bool:
+    """Install the middleware and admin routes if PROFILING_ENABLED is set"""
+    if not profiling_enabled():
+        return False
+
+    profile_store.resize(int(os.environ.get("PROFILE_BUFFER_SIZE", "50")))
+    app.add_middleware(
+        ProfilingMiddleware,
+        sample_rate=float(os.environ.get("PROFILE_SAMPLE_RATE", "0")),
+        threshold_ms=float(os.environ.get("PROFILE_THRESHOLD_MS", "100")),
+        interval_ms=float(os.environ.get("PROFILE_INTERVAL_MS", "1")),
+    )
+    app.include_router(admin_router)
+    return True
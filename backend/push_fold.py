@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Push/fold equilibria for short stacks.
+
+With a short stack the only sensible preflop actions are all-in or fold,
+which turns the game into a small matrix game over the 169 starting hand
+classes. Strategies are solved by fictitious play: every iteration each
+decision takes its best response (push/call or fold, per class) to the
+average strategies of the others, and the averages move towards it. All
+hands of a decision are updated at once with NumPy.
+
+Equities come from hand_eval.evaluate: every sampled board is evaluated
+for all 1326 hole card combinations, and the results are aggregated into
+class-vs-class matrices (card removal between the two hands included).
+Three-way pots use the per-board matrices, treating the two opponents
+as independent given the board.
+
+Results are chip EV equilibria for equal stacks and cached per
+(players, stack, ante) bucket:
+
+    python push_fold.py --players 2 --stack 10
+    python push_fold.py --players 3 --stack 8 --ante 0.125
+"""
+
+import argparse
+import asyncio
+import random
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from bots import BotPool, bot_pool
+from hand_eval import RANK_OF, SUIT_OF, evaluate
+
+RANK_NAMES = "AKQJT98765432"  # Grid order, ace first
+BOARD_SAMPLES = 1000
+THREE_WAY_BOARDS = 200  # Boards kept per board for three-way pots
+EQUITY_SEED = 169  # Fixed, so every process computes the same equities
+ITERATIONS = 300
+MAX_STACK = 30  # Big blinds; deeper stacks are not a push/fold spot
+
+
+def _class_names() -> List[str]:
+    """13x13 grid like a range chart: pairs on the diagonal, suited above, offsuit below"""
+    names = []
+    for row, high in enumerate(RANK_NAMES):
+        for col, low in enumerate(RANK_NAMES):
+            if row == col:
+                names.append(high + low)
+            elif row < col:
+                names.append(high + low + "s")
+            else:
+                names.append(low + high + "o")
+    return names
+
+
+CLASS_NAMES = _class_names()
+
+
+def _combos() -> Tuple[np.ndarray, np.ndarray]:
+    """All 1326 hole card combinations (card indexes) and their class index"""
+    cards, classes = [], []
+    for first in range(52):
+        for second in range(first + 1, 52):
+            high, low = max(first % 13, second % 13), min(first % 13, second % 13)
+            if high == low:
+                row = col = 12 - high
+            elif first // 13 == second // 13:
+                row, col = 12 - high, 12 - low
+            else:
+                row, col = 12 - low, 12 - high
+            cards.append((first, second))
+            classes.append(row * 13 + col)
+    return np.array(cards, dtype=np.int16), np.array(classes, dtype=np.int16)
+
+
+COMBO_CARDS, COMBO_CLASS = _combos()
+CLASS_ONEHOT = np.eye(169, dtype=np.float64)[COMBO_CLASS]  # (1326, 169)
+CLASS_COMBOS = CLASS_ONEHOT.sum(axis=0)  # 6 for pairs, 4 suited, 12 offsuit
+
+
+class EquityData(NamedTuple):
+    equity: np.ndarray  # (169, 169) all-in equity of the row class against the column class
+    weights: np.ndarray  # (169, 169) combos of the column class left per combo of the row class
+    per_board: np.ndarray  # (boards, 169, 169) equity on single boards, for three-way pots
+
+
+@lru_cache(maxsize=1)
+def equity_data(boards: int = BOARD_SAMPLES, seed: int = EQUITY_SEED) -> EquityData:
+    """Class-vs-class equities from `boards` random boards (a few seconds, once per process)"""
+    rng = random.Random(seed)
+    first, second = COMBO_CARDS[:, 0], COMBO_CARDS[:, 1]
+    card_masks = (1 << first.astype(np.int64)) | (1 << second.astype(np.int64))
+    # Combos sharing a card with combo i, itself included (101 each)
+    conflicts = np.array([np.nonzero(card_masks & card_masks[i])[0] for i in range(len(card_masks))])
+
+    points = np.zeros((169, 169))
+    counts = np.zeros((169, 169))
+    kept = min(boards, THREE_WAY_BOARDS)
+    per_board = np.zeros((kept, 169, 169), dtype=np.float32)
+    combo_pairs = [(int(a), int(b)) for a, b in COMBO_CARDS]
+
+    for board_no in range(boards):
+        board = rng.sample(range(52), 5)
+        board_mask = sum(1 << card for card in board)
+        valid = (card_masks & board_mask) == 0
+        scores = np.array([evaluate(board + [a, b]) for a, b in combo_pairs], dtype=np.int64)
+
+        live = np.nonzero(valid)[0]
+        live_scores = scores[live]
+        order = np.argsort(live_scores, kind="stable")
+        sorted_scores = live_scores[order]
+        # cumulative[k, c]: combos of class c among the k weakest live combos
+        cumulative = np.zeros((len(live) + 1, 169), dtype=np.int32)
+        np.cumsum(CLASS_ONEHOT[live[order]], axis=0, out=cumulative[1:])
+        below = cumulative[np.searchsorted(sorted_scores, live_scores, "left")]
+        up_to = cumulative[np.searchsorted(sorted_scores, live_scores, "right")]
+        won = below + 0.5 * (up_to - below)
+        seen = np.broadcast_to(cumulative[-1], won.shape).astype(np.float64)
+
+        # Take out the combos that share a card with the hand (they can't be out at the same time)
+        blocked = conflicts[live]
+        blocked_live = valid[blocked]
+        diff = live_scores[:, None] - scores[blocked]
+        blocked_won = ((diff > 0) + 0.5 * (diff == 0)) * blocked_live
+        slots = (np.arange(len(live))[:, None] * 169 + COMBO_CLASS[blocked]).ravel()
+        won -= np.bincount(slots, weights=blocked_won.ravel(), minlength=len(live) * 169).reshape(-1, 169)
+        seen = seen - np.bincount(slots, weights=blocked_live.ravel(), minlength=len(live) * 169).reshape(-1, 169)
+
+        rows = CLASS_ONEHOT[live].T
+        board_points = rows @ won
+        board_counts = rows @ seen
+        points += board_points
+        counts += board_counts
+        if board_no < kept:
+            per_board[board_no] = np.divide(board_points, board_counts, out=np.full((169, 169), np.nan),
+                                            where=board_counts > 0)
+
+    equity = points / counts
+    # A class without live combos on a board plays like its average
+    per_board = np.where(np.isnan(per_board), equity[None].astype(np.float32), per_board)
+
+    disjoint = (card_masks[:, None] & card_masks[None, :]) == 0
+    weights = CLASS_ONEHOT.T @ disjoint.astype(np.float64) @ CLASS_ONEHOT / CLASS_COMBOS[:, None]
+    return EquityData(equity, weights, per_board)
+
+
+# --- solvers ----------------------------------------------------------------------
+
+def _average(strategy: np.ndarray, best: np.ndarray, iteration: int):
+    strategy += (best - strategy) / (iteration + 1)
+
+
+def solve_heads_up(stack: float, ante: float = 0.0, dead: float = 0.0,
+                   iterations: int = ITERATIONS) -> Dict[str, np.ndarray]:
+    """Small blind pushes, big blind calls. Amounts in big blinds; `dead` is money from folded players"""
+    data = equity_data()
+    weights, weighted_equity = data.weights, data.weights * data.equity
+    mass = weights.sum(axis=1)
+    small, big = 0.5 + ante, 1.0 + ante  # Invested by a fold
+    pot = 2 * stack + dead
+
+    push = np.ones(169)
+    call = np.ones(169)
+    for iteration in range(1, iterations + 1):
+        called = weights @ call
+        equity = _ratio(weighted_equity @ call, called)
+        call_chance = called / mass
+        ev_push = (1 - call_chance) * (big + dead) + call_chance * (equity * pot - stack)
+        best_push = (ev_push > -small).astype(float)
+
+        equity = _ratio(weighted_equity @ push, weights @ push)
+        best_call = ((equity * pot - stack > -big) & (weights @ push > 0)).astype(float)
+
+        _average(push, best_push, iteration)
+        _average(call, best_call, iteration)
+    return {"sb_push": push, "bb_call": call}
+
+
+def solve_three_way(stack: float, ante: float = 0.0, iterations: int = ITERATIONS) -> Dict[str, np.ndarray]:
+    """Button, small blind and big blind; after a button fold it's the heads-up game plus the dead ante"""
+    data = equity_data()
+    weights, weighted_equity = data.weights, data.weights * data.equity
+    weighted_boards = data.per_board * weights[None].astype(np.float32)
+    mass = weights.sum(axis=1)
+    button, small, big = ante, 0.5 + ante, 1.0 + ante  # Invested by a fold
+
+    def three_way_equity(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+        """Chance to beat one hand of each range, independent given the board"""
+        both = weighted_boards @ np.stack([first, second], axis=1).astype(np.float32)  # (boards, 169, 2)
+        beats = (both[:, :, 0] * both[:, :, 1]).mean(axis=0)
+        return _ratio(beats, (weights @ first) * (weights @ second))
+
+    def heads_up_equity(strategy: np.ndarray) -> np.ndarray:
+        return _ratio(weighted_equity @ strategy, weights @ strategy)
+
+    push = np.ones(169)  # Button
+    sb_call = np.ones(169)
+    bb_call = np.ones(169)  # Button pushed, small blind folded
+    bb_overcall = np.ones(169)  # Button pushed, small blind called
+    for iteration in range(1, iterations + 1):
+        sb_calls = (weights @ sb_call) / mass
+        bb_calls = (weights @ bb_call) / mass
+        bb_overcalls = (weights @ bb_overcall) / mass
+
+        ev_push = ((1 - sb_calls) * (1 - bb_calls) * (small + big)
+                   + (1 - sb_calls) * bb_calls * (heads_up_equity(bb_call) * (2 * stack + small) - stack)
+                   + sb_calls * (1 - bb_overcalls) * (heads_up_equity(sb_call) * (2 * stack + big) - stack)
+                   + sb_calls * bb_overcalls * (three_way_equity(sb_call, bb_overcall) * 3 * stack - stack))
+        best_push = (ev_push > -button).astype(float)
+
+        ev_sb_call = ((1 - bb_overcalls) * (heads_up_equity(push) * (2 * stack + big) - stack)
+                      + bb_overcalls * (three_way_equity(push, bb_overcall) * 3 * stack - stack))
+        best_sb_call = (ev_sb_call > -small).astype(float)
+
+        ev_bb_call = heads_up_equity(push) * (2 * stack + small) - stack
+        best_bb_call = (ev_bb_call > -big).astype(float)
+        ev_bb_overcall = three_way_equity(push, sb_call) * 3 * stack - stack
+        best_bb_overcall = (ev_bb_overcall > -big).astype(float)
+
+        for strategy, best in ((push, best_push), (sb_call, best_sb_call),
+                               (bb_call, best_bb_call), (bb_overcall, best_bb_overcall)):
+            _average(strategy, best, iteration)
+
+    blinds = solve_heads_up(stack, ante, dead=button, iterations=iterations)
+    return {"btn_push": push, "sb_call": sb_call, "bb_call": bb_call, "bb_overcall": bb_overcall,
+            "sb_push": blinds["sb_push"], "bb_call_vs_sb": blinds["bb_call"]}
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator, dtype=np.float64), where=denominator > 0)
+
+
+# --- buckets ----------------------------------------------------------------------
+
+def bucket(stack: float, ante: float) -> Tuple[int, float]:
+    """Stack rounded to whole big blinds (1 to MAX_STACK), ante to 0.05 big blinds"""
+    return int(min(max(round(stack), 1), MAX_STACK)), round(round(max(ante, 0.0) / 0.05) * 0.05, 2)
+
+
+@lru_cache(maxsize=256)
+def solve_bucket(players: int, stack: int, ante: float) -> Dict[str, List[float]]:
+    """Equilibrium ranges of a bucket, frequencies per class in CLASS_NAMES order"""
+    solved = solve_heads_up(stack, ante) if players == 2 else solve_three_way(stack, ante)
+    return {node: [round(float(value), 3) for value in strategy] for node, strategy in solved.items()}
+
+
+def hand_class(hole: Sequence[int]) -> str:
+    """Class name of two hole cards (card indexes), e.g. AKs or 72o"""
+    first, second = hole
+    high, low = max(RANK_OF[first], RANK_OF[second]), min(RANK_OF[first], RANK_OF[second])
+    if high == low:
+        return CLASS_NAMES[(12 - high) * 14]
+    if SUIT_OF[first] == SUIT_OF[second]:
+        return CLASS_NAMES[(12 - high) * 13 + 12 - low]
+    return CLASS_NAMES[(12 - low) * 13 + 12 - high]
+
+
+class PushFoldCharts:
+    """Solved buckets for the API; solving runs in the worker pool, once per bucket"""
+
+    def __init__(self, pool: BotPool = bot_pool):
+        self._pool = pool
+        self._charts: Dict[Tuple[int, int, float], asyncio.Future] = {}
+
+    async def get(self, players: int, stack: float, ante: float) -> Tuple[int, float, Dict[str, List[float]]]:
+        """(stack bucket, ante bucket, ranges); the first request of a bucket waits for the solver"""
+        stack, ante = bucket(stack, ante)
+        key = (players, stack, ante)
+        chart = self._charts.get(key)
+        if chart is None:
+            chart = self._charts[key] = asyncio.ensure_future(self._pool.run(solve_bucket, players, stack, ante))
+        try:
+            return stack, ante, await asyncio.shield(chart)
+        except Exception:
+            self._charts.pop(key, None)  # Let the next request try again
+            raise
+
+    def __len__(self) -> int:
+        return len(self._charts)
+
+
+push_fold_charts = PushFoldCharts()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Push/fold equilibrium ranges")
+    parser.add_argument("--players", type=int, choices=[2, 3], default=2)
+    parser.add_argument("--stack", type=float, default=10, help="Effective stack in big blinds")
+    parser.add_argument("--ante", type=float, default=0.0, help="Ante in big blinds")
+    args = parser.parse_args()
+
+    stack, ante = bucket(args.stack, args.ante)
+    for node, strategy in solve_bucket(args.players, stack, ante).items():
+        played = sum(CLASS_COMBOS[i] * frequency for i, frequency in enumerate(strategy)) / 1326
+        print(f"\n{node} ({100 * played:.1f}% of hands)")
+        for row in range(13):
+            print(" ".join(f"{CLASS_NAMES[row * 13 + col]:>4}" if strategy[row * 13 + col] >= 0.5 else "   ."
+                           for col in range(13)))
+
+
+if __name__ == "__main__":
+    main()
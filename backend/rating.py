@@ -0,0 +1,67 @@
+"""
+Multi-player skill rating (Weng-Lin Bayesian approximation, Plackett-Luce model).
+
+Every person has a rating (mu, sigma); a session is a ranking of its
+participants by their result. The update of a session only needs the
+ratings of its participants, so results are folded in as they are saved.
+With the participants sorted by rank, the Plackett-Luce sums over "players
+ranked at least as well" become prefix sums, which keeps the update at
+O(n log n) for the sort plus O(n) for the update itself.
+
+The displayed rating is the conservative estimate mu - 3 * sigma.
+"""
+
+import math
+from itertools import groupby
+from typing import List, NamedTuple, Sequence
+
+MU = 25.0
+SIGMA = MU / 3
+BETA = SIGMA / 2
+KAPPA = 0.0001  # Lower bound for the sigma shrink factor
+
+
+class Rating(NamedTuple):
+    mu: float = MU
+    sigma: float = SIGMA
+
+    @property
+    def ordinal(self) -> float:
+        return self.mu - 3 * self.sigma
+
+
+def rate(ratings: Sequence[Rating], scores: Sequence[float]) -> List[Rating]:
+    """New ratings of the participants of one session; a higher score ranks better, equal scores tie"""
+    n = len(ratings)
+    if n < 2:
+        return list(ratings)
+
+    c = math.sqrt(sum(r.sigma ** 2 + BETA ** 2 for r in ratings))
+    strength = [math.exp(r.mu / c) for r in ratings]
+    order = sorted(range(n), key=lambda i: -scores[i])
+
+    # Tie groups, best first: (members, sum of strengths of this group and all below)
+    groups = [list(members) for _, members in groupby(order, key=lambda i: scores[i])]
+    below = 0.0
+    totals = []
+    for members in reversed(groups):
+        below += sum(strength[i] for i in members)
+        totals.append(below)
+    totals.reverse()
+
+    new_ratings = [None] * n
+    first = second = 0.0  # Sums of 1 / S_q and 1 / S_q^2 over the groups ranked at least as well
+    for members, total in zip(groups, totals):
+        size = len(members)
+        first += 1 / total
+        second += 1 / total ** 2
+        for i in members:
+            rating = ratings[i]
+            variance = rating.sigma ** 2
+            omega = variance / c * (1 / size - strength[i] * first)
+            delta = (rating.sigma / c) * variance / c ** 2 * (strength[i] * first - strength[i] ** 2 * second)
+            new_ratings[i] = Rating(
+                mu=rating.mu + omega,
+                sigma=rating.sigma * math.sqrt(max(1 - delta, KAPPA))
+            )
+    return new_ratings
@@ -1,15 +1,28 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
 import logging
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Union
 from dotenv import load_dotenv
 
-from models import Person, PersonCreate, PersonUpdate, PersonBulkUpdateRequest
+from models import (
+    Person, PersonCreate, PersonUpdate, PersonBulkUpdateRequest,
+    PersonStats, PersonRollup, TransactionPage
+)
+from poker_models import PokerPlayerStats
 from database import PersonDatabase
 from poker_api import poker_router
+from player_stats import player_stats
+from hand_history import hand_recorder
+from bots import bot_pool
+from tournament_api import tournament_router
+from timer_wheel import timer_wheel
+from metrics import REGISTRY, CONTENT_TYPE, MetricsMiddleware
+from profiling import setup_profiling
+from logging_config import setup_logging
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -37,11 +50,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Request metrics (latency, response size, in-flight) exposed at /metrics
+app.add_middleware(MetricsMiddleware)
+
+# Debug only: sampling profiler for flagged and slow requests (PROFILING_ENABLED)
+setup_profiling(app)
+
+# Configure logging (queue-backed, structured, rate limited - see logging_config)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -50,6 +66,13 @@ async def startup_event():
     """Initialize default persons on startup"""
     await person_db.initialize_default_persons()
     logger.info("Database initialized with default persons")
+    # Single background task driving all server-side clocks
+    timer_wheel.start()
+    # Table statistics are flushed to Mongo in batches
+    player_stats.start(db.poker_player_stats, timer_wheel)
+    await player_stats.ensure_indexes()
+    # Finished hands are appended to one binary file per day
+    hand_recorder.start(Path(os.environ.get("HAND_HISTORY_DIR", ROOT_DIR / "hand_histories")), timer_wheel)
 
 
 @api_router.get("/", tags=["Health"])
@@ -64,10 +87,89 @@ async def get_all_persons():
         persons = await person_db.get_all_persons()
         return persons
     except Exception as e:
-        logger.error(f"Error getting persons: {str(e)}")
+        logger.error("Error getting persons: %s", e)
         raise HTTPException(status_code=500, detail="Error retrieving persons")
 
 
+@api_router.get(
+    "/persons/leaderboard",
+    response_model=Union[List[PersonStats], List[PersonRollup]],
+    tags=["Persons"]
+)
+async def get_leaderboard(
+    period: str = Query("all", pattern=r"^(all|\d{4}(-(0[1-9]|1[0-2]))?)$"),
+    sort: str = Query("balance", pattern=r"^(balance|rating)$")
+):
+    """Get the leaderboard of a period: "all" (by balance or skill rating), a year "YYYY" or a month "YYYY-MM" """
+    if sort == "rating" and period != "all":
+        raise HTTPException(status_code=400, detail="Rating is only available for period 'all'")
+    try:
+        if period == "all":
+            return await person_db.get_leaderboard(sort)
+        return await person_db.get_period_leaderboard(period)
+    except Exception as e:
+        logger.error("Error getting leaderboard: %s", e)
+        raise HTTPException(status_code=500, detail="Error retrieving leaderboard")
+
+
+@api_router.post("/persons/ratings/rebuild", tags=["Persons"])
+async def rebuild_ratings():
+    """Recompute all skill ratings from the ledger (backfill after import or rating changes)"""
+    try:
+        sessions = await person_db.rebuild_ratings()
+        return {"message": "Ratings rebuilt", "sessions": sessions}
+    except Exception as e:
+        logger.error("Error rebuilding ratings: %s", e)
+        raise HTTPException(status_code=500, detail="Error rebuilding ratings")
+
+
+@api_router.get("/persons/{person_id}/stats", response_model=PersonStats, tags=["Persons"])
+async def get_person_stats(person_id: str):
+    """Get aggregate stats of a person"""
+    try:
+        stats = await person_db.get_person_stats(person_id)
+        if not stats:
+            raise HTTPException(status_code=404, detail="Person not found")
+        return stats
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error getting stats of person %s: %s", person_id, e)
+        raise HTTPException(status_code=500, detail="Error retrieving stats")
+
+
+@api_router.get("/persons/{person_id}/history", response_model=TransactionPage, tags=["Persons"])
+async def get_person_history(
+    person_id: str,
+    cursor: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=100)
+):
+    """Get a person's session results, newest first. Pass `next_cursor` to get the next page."""
+    try:
+        return await person_db.get_person_history(person_id, cursor, limit)
+    except Exception as e:
+        logger.error("Error getting history of person %s: %s", person_id, e)
+        raise HTTPException(status_code=500, detail="Error retrieving history")
+
+
+@api_router.get("/persons/{person_id}/poker-stats", response_model=PokerPlayerStats, tags=["Persons"])
+async def get_person_poker_stats(person_id: str):
+    """Get the table statistics of a person (matched by name with the poker players)"""
+    try:
+        person = await person_db.get_person_by_id(person_id)
+        if not person:
+            raise HTTPException(status_code=404, detail="Person not found")
+        stats = await player_stats.get(person.name)
+        if not stats:
+            raise HTTPException(status_code=404, detail="No hands played yet")
+        return stats
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error getting poker stats of person %s: %s", person_id, e)
+        raise HTTPException(status_code=500, detail="Error retrieving poker stats")
+
+
 @api_router.get("/persons/{person_id}", response_model=Person, tags=["Persons"])
 async def get_person(person_id: str):
     """Get person by ID"""
@@ -79,7 +181,7 @@ async def get_person(person_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting person {person_id}: {str(e)}")
+        logger.error("Error getting person %s: %s", person_id, e)
         raise HTTPException(status_code=500, detail="Error retrieving person")
 
 
@@ -90,7 +192,7 @@ async def create_person(person_create: PersonCreate):
         person = await person_db.create_person(person_create)
         return person
     except Exception as e:
-        logger.error(f"Error creating person: {str(e)}")
+        logger.error("Error creating person: %s", e)
         raise HTTPException(status_code=500, detail="Error creating person")
 
 
@@ -102,7 +204,7 @@ async def bulk_update_persons(request: PersonBulkUpdateRequest):
         persons = await person_db.bulk_update_persons(updates)
         return persons
     except Exception as e:
-        logger.error(f"Error bulk updating persons: {str(e)}")
+        logger.error("Error bulk updating persons: %s", e)
         raise HTTPException(status_code=500, detail="Error updating persons")
 
 
@@ -117,7 +219,7 @@ async def update_person(person_id: str, person_update: PersonUpdate):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error updating person {person_id}: {str(e)}")
+        logger.error("Error updating person %s: %s", person_id, e)
         raise HTTPException(status_code=500, detail="Error updating person")
 
 
@@ -128,17 +230,28 @@ async def reset_all_amounts():
         persons = await person_db.reset_all_amounts()
         return persons
     except Exception as e:
-        logger.error(f"Error resetting amounts: {str(e)}")
+        logger.error("Error resetting amounts: %s", e)
         raise HTTPException(status_code=500, detail="Error resetting amounts")
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint"""
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
 # Include the routers in the main app
 app.include_router(api_router)
 app.include_router(poker_router)
+app.include_router(tournament_router)
 
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await timer_wheel.stop()
+    await player_stats.flush()
+    hand_recorder.flush()
+    bot_pool.shutdown()
     client.close()
 
 
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Headless poker simulator.
+
+Plays complete hands through PokerEngine (start_new_hand, process_action)
+with pluggable bot strategies - no FastAPI in the loop.
+Used as a throughput baseline for the engine and as a correctness harness
+for chip conservation.
+
+    python simulate.py --hands 20000 --players 6 --strategies random,call,aggro --seed 42
+    python simulate.py --hands 20000 --variant omaha
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import time
+from typing import Callable, Dict, List, Tuple
+from pydantic import BaseModel
+
+from poker_models import PokerGame, PokerPlayer, PlayerAction, GamePhase, Variant
+from poker_engine import PokerEngine
+
+
+# A strategy decides the action of `player`; the amount is only used for raises
+Strategy = Callable[[PokerGame, PokerPlayer, random.Random], Tuple[PlayerAction, int]]
+
+MAX_ACTIONS_PER_HAND = 500
+
+
+def _min_raise(game: PokerGame) -> int:
+    """Smallest raise-to amount (same rule as the available-actions endpoint)"""
+    return max(game.current_bet * 2, game.big_blind)
+
+
+def _check_or_call(game: PokerGame, player: PokerPlayer) -> Tuple[PlayerAction, int]:
+    if player.current_bet == game.current_bet:
+        return PlayerAction.CHECK, 0
+    return PlayerAction.CALL, 0
+
+
+def _raise(game: PokerGame, player: PokerPlayer, amount: int) -> Tuple[PlayerAction, int]:
+    """Raise to `amount`, capped at the player's stack; calls if a raise is impossible"""
+    if player.chips <= game.current_bet - player.current_bet:
+        return _check_or_call(game, player)
+    return PlayerAction.RAISE, min(max(amount, _min_raise(game)), player.chips + player.current_bet)
+
+
+def random_strategy(game: PokerGame, player: PokerPlayer, rng: random.Random) -> Tuple[PlayerAction, int]:
+    """Uniformly random between fold, check/call and a min raise"""
+    roll = rng.random()
+    if roll < 0.15 and player.current_bet < game.current_bet:
+        return PlayerAction.FOLD, 0
+    if roll < 0.85:
+        return _check_or_call(game, player)
+    return _raise(game, player, _min_raise(game))
+
+
+def calling_station(game: PokerGame, player: PokerPlayer, rng: random.Random) -> Tuple[PlayerAction, int]:
+    """Never folds, never raises"""
+    return _check_or_call(game, player)
+
+
+def aggressive_strategy(game: PokerGame, player: PokerPlayer, rng: random.Random) -> Tuple[PlayerAction, int]:
+    """Raises often with pot-sized bets, folds to big bets sometimes"""
+    to_call = game.current_bet - player.current_bet
+    if to_call > player.chips // 2 and rng.random() < 0.5:
+        return PlayerAction.FOLD, 0
+    if rng.random() < 0.4:
+        return _raise(game, player, game.current_bet + max(game.pot, game.big_blind))
+    return _check_or_call(game, player)
+
+
+STRATEGIES: Dict[str, Strategy] = {
+    "random": random_strategy,
+    "call": calling_station,
+    "aggro": aggressive_strategy,
+}
+
+
+class SimulationResult(BaseModel):
+    hands: int = 0
+    actions: int = 0
+    showdowns: int = 0
+    seconds: float = 0.0
+    conservation_errors: int = 0
+    stalled_hands: int = 0
+
+    @property
+    def hands_per_second(self) -> float:
+        return self.hands / self.seconds if self.seconds else 0.0
+
+    def merge(self, other: "SimulationResult") -> "SimulationResult":
+        return SimulationResult(
+            hands=self.hands + other.hands,
+            actions=self.actions + other.actions,
+            showdowns=self.showdowns + other.showdowns,
+            seconds=max(self.seconds, other.seconds),
+            conservation_errors=self.conservation_errors + other.conservation_errors,
+            stalled_hands=self.stalled_hands + other.stalled_hands,
+        )
+
+
+def create_table(players: int, starting_chips: int = 1000, seed: int = None,
+                 variant: Variant = Variant.HOLDEM) -> PokerGame:
+    """Create a game with `players` seated bots; a seed makes the shuffles reproducible"""
+    game = PokerGame(seed=seed, variant=variant)
+    for i in range(players):
+        game.players.append(PokerPlayer(name=f"Bot {i + 1}", position=i, chips=starting_chips))
+    return game
+
+
+def play_hand(game: PokerGame, strategies: List[Strategy], rng: random.Random) -> Tuple[int, bool]:
+    """Play one hand to completion. Returns (actions taken, finished cleanly)"""
+    PokerEngine.start_new_hand(game)
+    actions = 0
+
+    # The engine awards folded pots and runs out all-in boards by itself
+    while game.phase not in (GamePhase.FINISHED, GamePhase.WAITING):
+        if actions >= MAX_ACTIONS_PER_HAND:
+            return actions, False
+
+        player = game.players[game.current_player]
+        action, amount = strategies[player.position % len(strategies)](game, player, rng)
+        PokerEngine.process_action(game, player.id, action, amount)
+        actions += 1
+
+    return actions, True
+
+
+def _between_hands(game: PokerGame, players: int, starting_chips: int, variant: Variant):
+    """Move the button and drop busted players, like start_next_hand; rebuy when the table breaks"""
+    game.dealer_position = (game.dealer_position + 1) % len(game.players)
+    game.players = [p for p in game.players if p.chips > 0]
+    if len(game.players) < 2:
+        game.players = create_table(players, starting_chips, variant=variant).players
+        game.dealer_position = 0
+    game.dealer_position %= len(game.players)
+    for i, player in enumerate(game.players):
+        player.position = i
+
+
+def run_worker(args: Tuple[int, int, int, List[str], Variant]) -> SimulationResult:
+    """Play `hands` hands on one table with its own seed"""
+    seed, hands, players, strategy_names, variant = args
+    rng = random.Random(seed)
+    strategies = [STRATEGIES[name] for name in strategy_names]
+    starting_chips = 1000
+
+    game = create_table(players, starting_chips, rng.getrandbits(64), variant)
+    result = SimulationResult()
+    start = time.perf_counter()
+
+    for _ in range(hands):
+        chips_before = sum(p.chips for p in game.players)
+        actions, clean = play_hand(game, strategies, rng)
+        result.hands += 1
+        result.actions += actions
+        if not clean:
+            result.stalled_hands += 1
+            game = create_table(players, starting_chips, rng.getrandbits(64), variant)
+            continue
+        if len(game.community_cards) == 5:
+            result.showdowns += 1
+        if sum(p.chips for p in game.players) + game.pot != chips_before:
+            result.conservation_errors += 1
+        _between_hands(game, players, starting_chips, variant)
+
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def simulate(hands: int, players: int = 6, strategies: List[str] = None,
+             seed: int = 0, workers: int = 1, variant: Variant = Variant.HOLDEM) -> SimulationResult:
+    """Run `hands` hands split over `workers` processes, one table per worker"""
+    strategies = strategies or ["random"]
+    unknown = [name for name in strategies if name not in STRATEGIES]
+    if unknown:
+        raise ValueError(f"Unknown strategies: {', '.join(unknown)}")
+
+    per_worker = [hands // workers + (1 if i < hands % workers else 0) for i in range(workers)]
+    jobs = [(seed + i, n, players, strategies, variant) for i, n in enumerate(per_worker) if n]
+
+    start = time.perf_counter()
+    if workers == 1:
+        results = [run_worker(job) for job in jobs]
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            results = pool.map(run_worker, jobs)
+
+    total = SimulationResult()
+    for result in results:
+        total = total.merge(result)
+    total.seconds = time.perf_counter() - start
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless poker engine simulator")
+    parser.add_argument("--hands", type=int, default=10000)
+    parser.add_argument("--players", type=int, default=6, choices=range(2, 9), metavar="2-8")
+    parser.add_argument("--strategies", default="random,call,aggro",
+                        help=f"Comma separated, assigned round-robin to seats ({', '.join(STRATEGIES)})")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--variant", type=Variant, default=Variant.HOLDEM, choices=[variant.value for variant in Variant])
+    args = parser.parse_args()
+
+    result = simulate(args.hands, args.players, args.strategies.split(","), args.seed, args.workers, args.variant)
+
+    print(f"Hands:               {result.hands}")
+    print(f"Actions:             {result.actions}")
+    print(f"Showdowns:           {result.showdowns}")
+    print(f"Workers:             {args.workers}")
+    print(f"Elapsed:             {result.seconds:.2f}s")
+    print(f"Hands/second:        {result.hands_per_second:,.0f}")
+    print(f"Conservation errors: {result.conservation_errors}")
+    print(f"Stalled hands:       {result.stalled_hands}")
+
+    return 1 if result.conservation_errors or result.stalled_hands else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,157 @@
+"""
+Delayed spectator feeds for poker tables.
+
+Spectators do not take a seat, so there is no limit on how many follow a
+table. Every state change of a table is rendered once into a
+spectator-safe frame (SpectatorFrame, hole cards only at showdown),
+serialized, and put into the table's ring buffer. After POKER_SPECTATOR_DELAY
+seconds a timer on the shared wheel releases it: the same bytes go into
+the queue of every viewer and become the table's latest frame for
+polling clients. Viewers only cost a queue slot each; nothing is
+rendered or serialized per viewer.
+"""
+
+import asyncio
+import os
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, Optional, Set, Tuple
+
+from poker_models import GamePhase, PokerGame, SpectatorFrame, SpectatorPlayer
+from timer_wheel import TimerWheel, timer_wheel
+
+SPECTATOR_DELAY = float(os.environ.get("POKER_SPECTATOR_DELAY", "30"))
+BUFFER_FRAMES = 256  # State changes a table can make within the delay before frames are dropped
+VIEWER_QUEUE_SIZE = 16
+
+
+def render_frame(game: PokerGame, delay: float) -> bytes:
+    """Spectator-safe JSON of the table"""
+    hand_over = game.phase in [GamePhase.SHOWDOWN, GamePhase.FINISHED, GamePhase.WAITING]
+    contenders = [p for p in game.players if not p.is_folded and p.cards]
+    showdown = hand_over and len(contenders) > 1
+
+    current_player_name = ""
+    if game.phase not in [GamePhase.WAITING, GamePhase.FINISHED] and game.players:
+        current_player_name = game.players[game.current_player].name
+
+    frame = SpectatorFrame(
+        game_id=game.id,
+        state_version=game.state_version,
+        variant=game.variant,
+        phase=game.phase,
+        pot=game.pot,
+        current_bet=game.current_bet,
+        small_blind=game.small_blind,
+        big_blind=game.big_blind,
+        ante=game.ante,
+        dealer_position=game.dealer_position,
+        current_player_name=current_player_name,
+        community_cards=game.community_cards,
+        players=[
+            SpectatorPlayer(
+                name=p.name,
+                chips=p.chips,
+                current_bet=p.current_bet,
+                total_bet=p.total_bet,
+                is_folded=p.is_folded,
+                is_all_in=p.is_all_in,
+                position=p.position,
+                cards_count=len(p.cards),
+                cards=p.cards if showdown and not p.is_folded else [],
+            )
+            for p in game.players
+        ],
+        message=game.last_action or "",
+        recorded_at=datetime.utcnow(),
+        delay=delay,
+    )
+    return frame.model_dump_json().encode()
+
+
+class SpectatorFeed:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.frames: Deque[Tuple[int, bytes]] = deque(maxlen=BUFFER_FRAMES)  # (sequence, JSON), not yet released
+        self.latest: Optional[bytes] = None  # JSON of the last released frame
+        self.viewers: Set[asyncio.Queue] = set()
+        self.version = -1  # state_version of the last recorded frame
+        self._sequence = 0
+
+    def record(self, game: PokerGame, wheel: TimerWheel):
+        if game.state_version == self.version:
+            return
+        self.version = game.state_version
+        self._sequence += 1
+        sequence = self._sequence
+        self.frames.append((sequence, render_frame(game, self.delay)))
+        wheel.schedule(self.delay, lambda: self._release(sequence))
+
+    def _release(self, sequence: int):
+        """Hand every frame up to `sequence` to the viewers"""
+        released = None
+        while self.frames and self.frames[0][0] <= sequence:
+            released = self.frames.popleft()[1]
+        if released is None:
+            return  # Dropped from the full buffer
+        self.latest = released
+        message = b"data: " + released + b"\n\n"
+        for queue in self.viewers:
+            if queue.full():
+                # Slow viewer: skip ahead instead of holding back the others
+                queue.get_nowait()
+            queue.put_nowait(message)
+
+    def close(self):
+        for queue in self.viewers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(None)
+        self.viewers.clear()
+
+
+class Spectators:
+    def __init__(self, wheel: TimerWheel = timer_wheel, delay: float = SPECTATOR_DELAY):
+        self._wheel = wheel
+        self.delay = delay
+        self._feeds: Dict[str, SpectatorFeed] = {}
+
+    @property
+    def viewer_count(self) -> int:
+        return sum(len(feed.viewers) for feed in self._feeds.values())
+
+    def record(self, game: PokerGame):
+        """Queue a frame for a changed table; called once per change, not per viewer"""
+        feed = self._feeds.get(game.id)
+        if feed is None:
+            feed = self._feeds[game.id] = SpectatorFeed(self.delay)
+        feed.record(game, self._wheel)
+
+    def latest(self, game_id: str) -> Optional[bytes]:
+        feed = self._feeds.get(game_id)
+        return feed.latest if feed else None
+
+    def subscribe(self, game_id: str) -> asyncio.Queue:
+        """Queue of SSE messages for one viewer, starting with the latest released frame; None ends the feed"""
+        feed = self._feeds.get(game_id)
+        if feed is None:
+            feed = self._feeds[game_id] = SpectatorFeed(self.delay)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=VIEWER_QUEUE_SIZE)
+        if feed.latest is not None:
+            queue.put_nowait(b"data: " + feed.latest + b"\n\n")
+        feed.viewers.add(queue)
+        return queue
+
+    def unsubscribe(self, game_id: str, queue: asyncio.Queue):
+        feed = self._feeds.get(game_id)
+        if feed is not None:
+            feed.viewers.discard(queue)
+
+    def close(self, game_id: str):
+        """The table is gone: end all its viewers' streams"""
+        feed = self._feeds.pop(game_id, None)
+        if feed is not None:
+            feed.close()
+
+
+spectators = Spectators()
@@ -0,0 +1,206 @@
+"""
+Server-side tournament clock.
+
+A tournament owns the blind schedule (small, big, ante, duration) and the
+level clock. Level changes are driven by the shared timer wheel, one
+timer per tournament, and reach the tables only at hand boundaries via
+`apply_level`. Seats are balanced across the tables by a TableBalancer
+(see mtt.py), also at hand boundaries. Clock changes are pushed to subscribers (one queue each),
+so clients follow the server clock instead of counting down on their own.
+"""
+
+import asyncio
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from mtt import TableBalancer
+from poker_models import BlindLevel, PokerGame, PokerPlayer, TournamentClock
+from timer_wheel import TimerHandle, TimerWheel, timer_wheel
+
+# Same structure as "Turnier 1" in the blind timer
+DEFAULT_BLIND_LEVELS = [
+    BlindLevel(small=25, big=50, ante=0, duration=12),
+    BlindLevel(small=50, big=100, ante=0, duration=12),
+    BlindLevel(small=75, big=150, ante=0, duration=12),
+    BlindLevel(small=100, big=200, ante=25, duration=12),
+    BlindLevel(small=150, big=300, ante=25, duration=12),
+    BlindLevel(small=200, big=400, ante=50, duration=12),
+    BlindLevel(small=300, big=600, ante=75, duration=12),
+    BlindLevel(small=400, big=800, ante=100, duration=12),
+]
+
+
+class Tournament:
+    def __init__(self, name: str, levels: List[BlindLevel], wheel: TimerWheel):
+        self.id = str(uuid.uuid4())
+        self.name = name
+        self.levels = levels or list(DEFAULT_BLIND_LEVELS)
+        self.game_ids: List[str] = []
+        self.tables = TableBalancer()
+        self.level_index = 0
+        self.running = False
+        self.finished = False
+        self._wheel = wheel
+        self._timer: Optional[TimerHandle] = None
+        self._remaining = self.levels[0].duration * 60.0  # Valid while paused
+        self._ends_at = 0.0  # Wall clock, valid while running
+        self._subscribers: Set[asyncio.Queue] = set()
+
+    @property
+    def level(self) -> BlindLevel:
+        return self.levels[self.level_index]
+
+    def remaining(self) -> float:
+        if self.running:
+            return max(0.0, self._ends_at - time.time())
+        return self._remaining
+
+    def start(self):
+        """Start or resume the clock"""
+        if self.running or self.finished:
+            return
+        self.running = True
+        self._ends_at = time.time() + self._remaining
+        self._timer = self._wheel.schedule(self._remaining, self._on_level_end)
+        self._publish()
+
+    def pause(self):
+        if not self.running:
+            return
+        self._remaining = self.remaining()
+        self.running = False
+        self._cancel_timer()
+        self._publish()
+
+    def set_level(self, index: int):
+        """Jump to a level (0-based) with its full duration"""
+        if not 0 <= index < len(self.levels):
+            raise ValueError("Level out of range")
+        self._cancel_timer()
+        self.level_index = index
+        self.finished = False
+        self._remaining = self.level.duration * 60.0
+        if self.running:
+            self.running = False
+            self.start()
+        else:
+            self._publish()
+
+    def apply_level(self, game: PokerGame):
+        """Copy the current blinds into a table; called right before a hand starts"""
+        game.small_blind = self.level.small
+        game.big_blind = self.level.big
+        game.ante = self.level.ante
+
+    def clock(self) -> TournamentClock:
+        next_level = self.levels[self.level_index + 1] if self.level_index + 1 < len(self.levels) else None
+        return TournamentClock(
+            tournament_id=self.id,
+            name=self.name,
+            level=self.level_index + 1,
+            small_blind=self.level.small,
+            big_blind=self.level.big,
+            ante=self.level.ante,
+            level_duration=self.level.duration * 60,
+            remaining=round(self.remaining(), 1),
+            level_ends_at=datetime.utcfromtimestamp(self._ends_at) if self.running else None,
+            running=self.running,
+            finished=self.finished,
+            next_level=next_level,
+            game_ids=self.game_ids,
+        )
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=16)
+        self._subscribers.add(queue)
+        queue.put_nowait(self.clock())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    def close(self):
+        self._cancel_timer()
+        self.running = False
+        # None ends the subscribers' streams
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(None)
+        self._subscribers.clear()
+
+    def _on_level_end(self):
+        self._timer = None
+        if self.level_index + 1 < len(self.levels):
+            # Blinds stay up after the last level; the clock just stops
+            self.level_index += 1
+            self._remaining = self.level.duration * 60.0
+            self._ends_at = time.time() + self._remaining
+            self._timer = self._wheel.schedule(self._remaining, self._on_level_end)
+        else:
+            self.running = False
+            self.finished = True
+            self._remaining = 0.0
+        self._publish()
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _publish(self):
+        clock = self.clock()
+        for queue in self._subscribers:
+            if queue.full():
+                # Slow subscriber: only the latest clock matters
+                queue.get_nowait()
+            queue.put_nowait(clock)
+
+
+class TournamentManager:
+    def __init__(self, wheel: TimerWheel = timer_wheel):
+        self.wheel = wheel
+        self.tournaments: Dict[str, Tournament] = {}
+
+    def create(self, name: str, levels: List[BlindLevel]) -> Tournament:
+        tournament = Tournament(name, levels, self.wheel)
+        self.tournaments[tournament.id] = tournament
+        return tournament
+
+    def get(self, tournament_id: str) -> Optional[Tournament]:
+        return self.tournaments.get(tournament_id)
+
+    def remove(self, tournament_id: str):
+        tournament = self.tournaments.pop(tournament_id, None)
+        if tournament:
+            tournament.close()
+
+    def apply_level(self, game: PokerGame):
+        """Update a table's blinds from its tournament (no-op for cash games)"""
+        if game.tournament_id:
+            tournament = self.tournaments.get(game.tournament_id)
+            if tournament:
+                tournament.apply_level(game)
+
+    def before_hand(self, game: PokerGame) -> List[PokerPlayer]:
+        """Balance a tournament table between hands; returns the players moved away"""
+        if not game.tournament_id:
+            return []
+        tournament = self.tournaments.get(game.tournament_id)
+        if not tournament:
+            return []
+        moved = tournament.tables.before_hand(game)
+        if game.id not in tournament.tables.counts and game.id in tournament.game_ids:
+            # Table was broken up
+            tournament.game_ids.remove(game.id)
+        return moved
+
+    def waiting_for_players(self, game: PokerGame) -> bool:
+        """A tournament table the balancer can still send players to"""
+        tournament = self.tournaments.get(game.tournament_id) if game.tournament_id else None
+        return tournament is not None and tournament.tables.waiting_for_players(game.id)
+
+
+tournaments = TournamentManager()
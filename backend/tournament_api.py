@@ -0,0 +1,126 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict
+from poker_models import TournamentCreate, TournamentClock
+from tournament import tournaments
+from poker_api import active_games
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+tournament_router = APIRouter(prefix="/api/poker/tournament", tags=["Tournament"])
+
+
+def _get_tournament(tournament_id: str):
+    tournament = tournaments.get(tournament_id)
+    if not tournament:
+        raise HTTPException(status_code=404, detail="Tournament not found")
+    return tournament
+
+
+@tournament_router.post("/create")
+async def create_tournament(request: TournamentCreate) -> TournamentClock:
+    """Create a tournament with a blind schedule (defaults to the "Turnier 1" structure)"""
+    tournament = tournaments.create(request.name, request.levels)
+    logger.info("Created tournament %s", tournament.id, extra={"tournament_id": tournament.id})
+    return tournament.clock()
+
+
+@tournament_router.post("/{tournament_id}/tables/{game_id}")
+async def add_table(tournament_id: str, game_id: str) -> TournamentClock:
+    """Attach a poker game to the tournament; its blinds follow the clock from the next hand on"""
+    tournament = _get_tournament(tournament_id)
+    if game_id not in active_games:
+        raise HTTPException(status_code=404, detail="Game not found")
+
+    game = active_games[game_id]
+    if game.tournament_id != tournament.id and tournaments.get(game.tournament_id):
+        raise HTTPException(status_code=409, detail="Game already belongs to another tournament")
+    game.tournament_id = tournament.id
+    if game_id not in tournament.game_ids:
+        tournament.game_ids.append(game_id)
+        tournament.tables.add_table(game_id, len(game.players))
+    return tournament.clock()
+
+
+@tournament_router.get("/{tournament_id}/tables")
+async def get_tables(tournament_id: str) -> Dict[str, Any]:
+    """Table sizes (including pending moves) and who is seated where"""
+    tournament = _get_tournament(tournament_id)
+    snapshot = tournament.tables.snapshot()
+    snapshot["seats"] = {
+        game_id: [player.name for player in active_games[game_id].players]
+        for game_id in tournament.game_ids if game_id in active_games
+    }
+    return snapshot
+
+
+@tournament_router.post("/{tournament_id}/start")
+async def start_clock(tournament_id: str) -> TournamentClock:
+    """Start or resume the level clock"""
+    tournament = _get_tournament(tournament_id)
+    tournament.start()
+    return tournament.clock()
+
+
+@tournament_router.post("/{tournament_id}/pause")
+async def pause_clock(tournament_id: str) -> TournamentClock:
+    """Pause the level clock"""
+    tournament = _get_tournament(tournament_id)
+    tournament.pause()
+    return tournament.clock()
+
+
+@tournament_router.post("/{tournament_id}/level/{level}")
+async def set_level(tournament_id: str, level: int) -> TournamentClock:
+    """Jump to a level (1-based) with its full duration"""
+    tournament = _get_tournament(tournament_id)
+    try:
+        tournament.set_level(level - 1)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Level out of range")
+    return tournament.clock()
+
+
+@tournament_router.get("/{tournament_id}/clock")
+async def get_clock(tournament_id: str) -> TournamentClock:
+    """Get the current clock"""
+    return _get_tournament(tournament_id).clock()
+
+
+@tournament_router.get("/{tournament_id}/clock/stream")
+async def stream_clock(tournament_id: str):
+    """Server-sent events with the clock on every change (start, pause, level up).
+
+    Clients count down locally to `level_ends_at` and resync on each event.
+    """
+    tournament = _get_tournament(tournament_id)
+    queue = tournament.subscribe()
+
+    async def events():
+        try:
+            while True:
+                try:
+                    clock = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if clock is None:
+                    break  # The tournament was deleted
+                yield f"data: {clock.model_dump_json()}\n\n"
+        finally:
+            tournament.unsubscribe(queue)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@tournament_router.delete("/{tournament_id}")
+async def delete_tournament(tournament_id: str) -> Dict[str, str]:
+    """Stop the clock and detach all tables"""
+    tournament = _get_tournament(tournament_id)
+    for game_id in tournament.game_ids:
+        if game_id in active_games:
+            active_games[game_id].tournament_id = None
+    tournaments.remove(tournament_id)
+    return {"message": "Tournament deleted"}
@@ -0,0 +1,66 @@
+"""
+Server-side turn clock for cash tables.
+
+Every table has at most one deadline on the shared timer wheel: the turn
+of the player to act, or the pause before the next hand. What happens
+when it expires is up to the caller (see poker_api). A deadline belongs
+to one turn (e.g. the phase and the player to act): setting the same turn
+again, say after a player joined mid-hand, keeps the deadline. Timers
+fire with the state_version they were last set for, so a table that has
+moved on since ignores a timer that fires late.
+"""
+
+import os
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Hashable, Optional
+
+from poker_models import PokerGame
+from timer_wheel import TimerHandle, TimerWheel, timer_wheel
+
+TURN_SECONDS = float(os.environ.get("POKER_TURN_SECONDS", "30"))
+NEXT_HAND_DELAY = float(os.environ.get("POKER_NEXT_HAND_DELAY", "5"))
+
+
+class TurnClocks:
+    def __init__(self, wheel: TimerWheel = timer_wheel):
+        self._wheel = wheel
+        self._timers: Dict[str, TimerHandle] = {}
+        self._turns: Dict[str, Hashable] = {}  # Game id -> turn of the running deadline
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def set(self, game: PokerGame, delay: float, callback: Callable[[str, int], object],
+            turn: Optional[Hashable] = None):
+        """Call `callback(game_id, state_version)` in `delay` seconds, replacing the table's deadline.
+
+        If the running deadline is for the same `turn`, it stays: only the
+        state_version passed to the callback is updated.
+        """
+        deadline = game.deadline
+        if turn is None or self._turns.get(game.id) != turn or deadline is None:
+            deadline = datetime.utcnow() + timedelta(seconds=delay)
+        self.cancel(game)
+        game_id, version = game.id, game.state_version
+
+        def expire():
+            if self._timers.get(game_id) is handle:
+                del self._timers[game_id]
+                self._turns.pop(game_id, None)
+            return callback(game_id, version)
+
+        handle = self._wheel.schedule(max(0.0, (deadline - datetime.utcnow()).total_seconds()), expire)
+        self._timers[game_id] = handle
+        if turn is not None:
+            self._turns[game_id] = turn
+        game.deadline = deadline
+
+    def cancel(self, game: PokerGame):
+        self._turns.pop(game.id, None)
+        handle = self._timers.pop(game.id, None)
+        if handle is not None:
+            handle.cancel()
+        game.deadline = None
+
+
+turn_clocks = TurnClocks()
@@ -0,0 +1,116 @@
+"""
+Game variants on top of the table-driven evaluator (hand_eval).
+
+What gets dealt (hole cards, deck) is part of the game model, see
+poker_models.HOLE_CARDS and DECK_CARDS. This module has the rest: how a
+player's best hand is scored and how big a raise may be.
+
+- Texas Hold'em: best five of the two hole cards and the board, no limit.
+- Pot-Limit Omaha: exactly two of the four hole cards and three of the
+  board (6 x 10 five-card hands, each one lookup in
+  hand_eval.FIVE_CARD_SCORES), raises up to the size of the pot.
+- Short Deck: Hold'em with 36 cards (six to ace), no limit. A flush beats
+  a full house and A-6-7-8-9 is the lowest straight.
+
+Strengths are hand_eval scores with the category bits in the variant's
+order, so they compare directly; describe() and ranking() turn them back.
+"""
+
+from itertools import combinations
+from typing import Callable, List, NamedTuple, Sequence, Tuple
+
+from hand_eval import (
+    BIT_OF, CATEGORIES, FIVE_CARD_SCORES, PRIMES, SHORT_STRAIGHT_HIGH,
+    HIGH_CARD, PAIR, TWO_PAIR, THREE_OF_A_KIND, STRAIGHT, FLUSH, FULL_HOUSE, FOUR_OF_A_KIND,
+    STRAIGHT_FLUSH, ROYAL_FLUSH, describe as describe_score, evaluate, flush_score
+)
+from metrics import HAND_EVALUATIONS
+from poker_models import HandRanking, PokerGame, PokerPlayer, Variant
+
+CATEGORY_BITS = 0xFFFFF  # Everything below the category
+
+
+def holdem(hole: Sequence[int], board: Sequence[int]) -> int:
+    return evaluate([*hole, *board])
+
+
+def _parts(cards: Sequence[int], size: int) -> List[Tuple[int, int, int]]:
+    """(rank prime product, suit or -1 if mixed, rank mask) of every `size` cards"""
+    parts = []
+    for chosen in combinations(cards, size):
+        product, suits, mask = 1, set(), 0
+        for card in chosen:
+            product *= PRIMES[card % 13]
+            suits.add(card // 13)
+            mask |= BIT_OF[card]
+        parts.append((product, suits.pop() if len(suits) == 1 else -1, mask))
+    return parts
+
+
+def omaha(hole: Sequence[int], board: Sequence[int]) -> int:
+    """Best of two hole cards and three board cards, one table lookup per combination"""
+    best = 0
+    hole_parts = _parts(hole, 2)
+    for product, suit, mask in _parts(board, 3):
+        for hole_product, hole_suit, hole_mask in hole_parts:
+            if suit >= 0 and suit == hole_suit:
+                value = flush_score(mask | hole_mask)
+            else:
+                value = FIVE_CARD_SCORES[product * hole_product]
+            if value > best:
+                best = value
+    return best
+
+
+# Flushes are rarer than full houses with 36 cards and rank above them
+SHORT_DECK_ORDER = (HIGH_CARD, PAIR, TWO_PAIR, THREE_OF_A_KIND, STRAIGHT,
+                    FULL_HOUSE, FLUSH, FOUR_OF_A_KIND, STRAIGHT_FLUSH, ROYAL_FLUSH)
+SHORT_DECK_LEVEL = tuple(SHORT_DECK_ORDER.index(c) for c in range(len(CATEGORIES)))
+
+
+def short_deck(hole: Sequence[int], board: Sequence[int]) -> int:
+    raw = evaluate([*hole, *board], SHORT_STRAIGHT_HIGH)
+    return SHORT_DECK_LEVEL[raw >> 20] << 20 | raw & CATEGORY_BITS
+
+
+class VariantRules(NamedTuple):
+    name: str
+    best: Callable[[Sequence[int], Sequence[int]], int]  # (hole, board) -> strength, higher wins
+    categories: Tuple[int, ...]  # hand_eval category of each strength level
+    pot_limit: bool
+
+
+IDENTITY = tuple(range(len(CATEGORIES)))
+
+VARIANTS = {
+    Variant.HOLDEM: VariantRules("No-Limit Hold'em", holdem, IDENTITY, pot_limit=False),
+    Variant.OMAHA: VariantRules("Pot-Limit Omaha", omaha, IDENTITY, pot_limit=True),
+    Variant.SHORT_DECK: VariantRules("Short Deck Hold'em", short_deck, SHORT_DECK_ORDER, pot_limit=False),
+}
+
+
+def strength(variant: Variant, hole: Sequence[int], board: Sequence[int]) -> int:
+    """Comparable strength of the best hand; the board needs at least three cards"""
+    HAND_EVALUATIONS.inc()
+    return VARIANTS[variant].best(hole, board)
+
+
+def _raw(variant: Variant, strength: int) -> int:
+    return VARIANTS[variant].categories[strength >> 20] << 20 | strength & CATEGORY_BITS
+
+
+def ranking(variant: Variant, strength: int) -> HandRanking:
+    return CATEGORIES[_raw(variant, strength) >> 20]
+
+
+def describe(variant: Variant, strength: int) -> str:
+    return describe_score(_raw(variant, strength))
+
+
+def max_raise_to(game: PokerGame, player: PokerPlayer) -> int:
+    """Highest total bet a raise can go to: all-in, or in pot limit the pot after calling"""
+    all_in = player.chips + player.current_bet
+    if not VARIANTS[game.variant].pot_limit:
+        return all_in
+    to_call = max(0, game.current_bet - player.current_bet)
+    return min(all_in, game.current_bet + game.pot + to_call)
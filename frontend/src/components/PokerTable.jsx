@@ -149,12 +149,7 @@ const PokerTable = ({ onClose, currentUser }) => {
 
   useEffect(() => {
     if (autoRefresh && gameId) {
-      const interval = setInterval(() => {
-        fetchGameState();
-        if (gameState && selectedPlayer) {
-          fetchAvailableActions();
-        }
-      }, 2000);
+      const interval = setInterval(fetchGameState, 2000);
       return () => clearInterval(interval);
     }
   }, [gameId, selectedPlayer, autoRefresh]);
@@ -256,13 +251,30 @@ const PokerTable = ({ onClose, currentUser }) => {
     if (!gameId) return;
     
     try {
-      const response = await axios.get(`${API}/poker/game/${gameId}/state`);
-      setGameState(response.data);
+      const playerData = selectedPlayer && gameState?.players_info?.find(p => p.name === selectedPlayer);
+      if (playerData) {
+        // State and available actions in one request
+        const response = await axios.get(`${API}/poker/game/${gameId}/view/${playerData.id}`);
+        setGameState(response.data.state);
+        updateAvailableActions(response.data.actions);
+      } else {
+        const response = await axios.get(`${API}/poker/game/${gameId}/state`);
+        setGameState(response.data);
+      }
     } catch (error) {
       console.error('Error fetching game state:', error);
     }
   };
 
+  const updateAvailableActions = (actions) => {
+    setAvailableActions(actions);
+    
+    // Initialize raise amount to minimum raise
+    if (actions.min_raise && raiseAmount === 0) {
+      setRaiseAmount(actions.min_raise);
+    }
+  };
+
   const fetchAvailableActions = async () => {
     if (!gameId || !selectedPlayer) return;
     
@@ -270,12 +282,7 @@ const PokerTable = ({ onClose, currentUser }) => {
       const playerData = gameState?.players_info?.find(p => p.name === selectedPlayer);
       if (playerData) {
         const response = await axios.get(`${API}/poker/game/${gameId}/available-actions/${playerData.id}`);
-        setAvailableActions(response.data);
-        
-        // Initialize raise amount to minimum raise
-        if (response.data.min_raise && raiseAmount === 0) {
-          setRaiseAmount(response.data.min_raise);
-        }
+        updateAvailableActions(response.data);
       }
     } catch (error) {
       console.error('Error fetching available actions:', error);
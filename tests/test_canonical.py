@@ -0,0 +1,101 @@
+import random
+from itertools import combinations, permutations
+
+import pytest
+
+from canonical import canonical, canonical_key, inverse, relabel, suit_mapping
+from hand_eval import EquityCache, estimate_equity, evaluate
+from poker_engine import PokerEngine
+from poker_models import CARDS
+
+RELABELINGS = list(permutations(range(4)))
+
+
+def _spots(count: int, board_sizes, seed: int = 1755):
+    rng = random.Random(seed)
+    for _ in range(count):
+        cards = rng.sample(range(52), 7)
+        yield cards[:2], cards[2:2 + rng.choice(board_sizes)]
+
+
+def test_counts_of_distinct_flops_and_starting_hands():
+    assert len({canonical_key(flop) for flop in combinations(range(52), 3)}) == 1755
+    assert len({canonical_key(hole) for hole in combinations(range(52), 2)}) == 169
+
+
+def test_relabeled_cards_have_the_same_key():
+    for hole, board in _spots(200, (0, 3, 4, 5)):
+        key = canonical_key(hole, board)
+        for suits in RELABELINGS:
+            assert canonical_key(relabel(hole, suits), relabel(board, suits)) == key
+
+
+def test_groups_are_not_mixed():
+    # Same cards, but a suited hole and a suited board are different spots
+    assert canonical_key([0, 1], [26, 39]) != canonical_key([0, 26], [1, 39])
+
+
+def test_inverse_mapping_restores_the_cards():
+    for hole, board in _spots(200, (3, 4, 5)):
+        (canonical_hole, canonical_board), mapping = canonical(hole, board)
+        assert sorted(relabel(canonical_hole, inverse(mapping))) == sorted(hole)
+        assert sorted(relabel(canonical_board, inverse(mapping))) == sorted(board)
+        assert mapping == suit_mapping(hole, board)
+
+
+def test_evaluate_is_suit_invariant():
+    for hole, board in _spots(200, (3, 4, 5)):
+        score = evaluate(hole + board)
+        for suits in RELABELINGS:
+            assert evaluate(relabel(hole + board, suits)) == score
+
+
+def test_evaluate_hand_maps_the_best_cards_back():
+    for hole, board in _spots(100, (3, 4, 5)):
+        cards = hole + board
+        hand = PokerEngine.evaluate_hand([CARDS[card] for card in cards])
+        for suits in RELABELINGS:
+            other = PokerEngine.evaluate_hand([CARDS[card] for card in relabel(cards, suits)])
+            assert (other.ranking, other.rank_value) == (hand.ranking, hand.rank_value)
+            assert sorted(card.index for card in other.cards) == sorted(relabel([c.index for c in hand.cards], suits))
+
+
+@pytest.mark.parametrize("board_size", [3, 4])
+def test_analyze_outs_is_suit_invariant(board_size):
+    for hole, board in _spots(20, (board_size,)):
+        analysis = PokerEngine.analyze_outs([CARDS[card] for card in hole], [CARDS[card] for card in board])
+        for suits in RELABELINGS:
+            other = PokerEngine.analyze_outs([CARDS[card] for card in relabel(hole, suits)],
+                                             [CARDS[card] for card in relabel(board, suits)])
+            assert (other.current, other.unseen, other.outs, other.improve_by_river) == \
+                (analysis.current, analysis.unseen, analysis.outs, analysis.improve_by_river)
+            assert len(other.draws) == len(analysis.draws)
+            for mine, theirs in zip(analysis.draws, other.draws):
+                assert (theirs.ranking, theirs.next_card, theirs.by_river) == \
+                    (mine.ranking, mine.next_card, mine.by_river)
+                # Outs come back in the caller's suits
+                assert [card.index for card in theirs.outs] == \
+                    sorted(relabel([card.index for card in mine.outs], suits))
+
+
+def test_seeded_equity_of_canonical_spots_is_suit_invariant():
+    hole, board = [12, 25], [0, 14, 28]
+    equity = estimate_equity(*canonical_key(hole, board), 1, random.Random(7), samples=2000)
+    for suits in RELABELINGS:
+        key = canonical_key(relabel(hole, suits), relabel(board, suits))
+        assert estimate_equity(*key, 1, random.Random(7), samples=2000) == equity
+
+
+def test_equity_cache_shares_entries_across_relabelings():
+    cache = EquityCache(enough=1000)
+    hole, board = [12, 25], [0, 14, 28]
+    equity, deals = cache.estimate(hole, board, 1, random.Random(7), samples=1000)
+    assert deals == 1000
+
+    for suits in RELABELINGS:
+        # No new deals: every relabeling reads the same entry
+        assert cache.estimate(relabel(hole, suits), relabel(board, suits), 1, samples=1000) == (equity, deals)
+    assert len(cache) == 1
+
+    cache.estimate([12, 24], board, 1, random.Random(7), samples=100)
+    assert len(cache) == 2
@@ -0,0 +1,62 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+from pymongo import ReturnDocument
+
+from database import PersonDatabase
+from models import PersonCreate, PersonUpdate
+
+
+@pytest.fixture
+def database():
+    return PersonDatabase(AsyncMongoMockClient()["test"])
+
+
+def test_every_amount_change_is_a_ledger_row(database):
+    async def scenario():
+        person = await database.create_person(PersonCreate(name="Geri"))
+        for amount in (50.0, 20.0, 20.0, 80.0):
+            await database.update_person(person.id, PersonUpdate(amount=amount))
+
+        # Unchanged amounts are no session
+        page = await database.get_person_history(person.id, limit=2)
+        assert [row.amount for row in page.items] == [60.0, -30.0]
+        assert [row.balance for row in page.items] == [80.0, 20.0]
+        rest = await database.get_person_history(person.id, cursor=page.next_cursor, limit=2)
+        assert [row.amount for row in rest.items] == [50.0]
+        assert rest.next_cursor is None
+
+        stats = await database.get_person_stats(person.id)
+        assert (stats.sessions, stats.total, stats.balance, stats.best, stats.worst) == (3, 80.0, 80.0, 60.0, -30.0)
+
+        # A reset clears the balance, not the career
+        await database.reset_all_amounts()
+        stats = await database.get_person_stats(person.id)
+        assert (stats.balance, stats.total, stats.sessions) == (0.0, 80.0, 3)
+        assert len((await database.get_person_history(person.id, limit=10)).items) == 3
+
+    asyncio.run(scenario())
+
+
+def test_rollups_aggregate_per_month_and_year(database):
+    async def scenario():
+        geri = await database.create_person(PersonCreate(name="Geri"))
+        sepp = await database.create_person(PersonCreate(name="Sepp"))
+        # Two sessions in January, one in March
+        for amounts, when in (((30.0, -30.0), datetime(2025, 1, 10)), ((10.0, -40.0), datetime(2025, 1, 20)),
+                              ((70.0, -60.0), datetime(2025, 3, 5))):
+            for person, amount in zip((geri, sepp), amounts):
+                previous = await database.collection.find_one_and_update(
+                    {"id": person.id}, {"$set": {"amount": amount}}, return_document=ReturnDocument.BEFORE)
+                await database._record_result(previous, amount, when.isoformat(), when)
+
+        january = await database.get_period_leaderboard("2025-01")
+        assert [(r.name, r.amount, r.sessions, r.best, r.worst) for r in january] == [
+            ("Geri", 10.0, 2, 30.0, -20.0), ("Sepp", -40.0, 2, -10.0, -30.0)]
+        year = await database.get_period_leaderboard("2025")
+        assert [(r.name, r.amount, r.sessions) for r in year] == [("Geri", 70.0, 3), ("Sepp", -60.0, 3)]
+        assert await database.get_period_leaderboard("2025-02") == []
+
+    asyncio.run(scenario())
@@ -0,0 +1,43 @@
+from poker_engine import PokerEngine
+from poker_models import DECK_CARDS, Deck, PlayerAction, Variant
+from simulate import create_table
+
+
+def _play_to_the_flop(game):
+    PokerEngine.start_new_hand(game)
+    for _ in range(len(game.players) - 1):
+        PokerEngine.process_action(game, game.players[game.current_player].id, PlayerAction.CALL)
+    PokerEngine.process_action(game, game.players[game.current_player].id, PlayerAction.CHECK)
+
+
+def test_a_seeded_hand_replays_from_its_hand_seed():
+    game = create_table(3, seed=41, variant=Variant.SHORT_DECK)
+    _play_to_the_flop(game)
+    assert len(game.community_cards) == 3
+
+    deck = Deck.for_hand(game.hand_seed, DECK_CARDS[Variant.SHORT_DECK])
+    hole = {player.id: [] for player in game.players}
+    for _ in range(2):
+        for player in game.players:
+            hole[player.id].append(deck.deal())
+    deck.burn()
+    assert [deck.deal() for _ in range(3)] == game.community_cards
+    assert all(hole[player.id] == player.cards for player in game.players)
+
+
+def test_every_hand_gets_its_own_seed():
+    first, second = create_table(3, seed=41), create_table(3, seed=41)
+    seeds = []
+    for _ in range(3):
+        PokerEngine.start_new_hand(first)
+        PokerEngine.start_new_hand(second)
+        assert first.hand_seed == second.hand_seed
+        assert [p.cards for p in first.players] == [p.cards for p in second.players]
+        seeds.append(first.hand_seed)
+    assert len(set(seeds)) == 3
+
+
+def test_unseeded_games_have_no_hand_seed():
+    game = create_table(3)
+    PokerEngine.start_new_hand(game)
+    assert game.hand_seed is None
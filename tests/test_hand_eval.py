@@ -0,0 +1,104 @@
+import random
+from collections import Counter
+from itertools import combinations
+
+import pytest
+
+from hand_eval import (
+    CATEGORIES, FIVE_CARD_SCORES, HIGH_CARD, PAIR, TWO_PAIR, THREE_OF_A_KIND, STRAIGHT, FLUSH, FULL_HOUSE,
+    FOUR_OF_A_KIND, STRAIGHT_FLUSH, ROYAL_FLUSH, describe, draw_outs, estimate_equity, evaluate, flush_score
+)
+
+
+def cards(text: str):
+    """Card indexes of e.g. "Ah Kd 7c", suits in Suit order (hearts, diamonds, clubs, spades)"""
+    return ["23456789TJQKA".index(card[0]) + 13 * "hdcs".index(card[1]) for card in text.split()]
+
+
+def test_categories_are_ordered():
+    hands = [
+        ("Ah Kd 7c 5s 3h", HIGH_CARD),
+        ("2h 2d 7c 5s 3h", PAIR),
+        ("2h 2d 3c 3s 4h", TWO_PAIR),
+        ("2h 2d 2c 5s 3h", THREE_OF_A_KIND),
+        ("Ah 2d 3c 4s 5h", STRAIGHT),
+        ("2h 4h 6h 8h Th", FLUSH),
+        ("2h 2d 2c 3s 3h", FULL_HOUSE),
+        ("2h 2d 2c 2s 3h", FOUR_OF_A_KIND),
+        ("Ah 2h 3h 4h 5h", STRAIGHT_FLUSH),
+        ("Th Jh Qh Kh Ah", ROYAL_FLUSH),
+    ]
+    scores = [evaluate(cards(hand)) for hand, _ in hands]
+    assert [score >> 20 for score in scores] == [category for _, category in hands]
+    assert scores == sorted(scores)
+
+
+def test_kickers_decide():
+    stronger_weaker = [
+        ("Ah Ad Kc 9s 3h", "As Ac Qc Js Th"),  # Pair, first kicker
+        ("Ah Ad Kc 9s 4h", "As Ac Kd 9h 3c"),  # Pair, last kicker
+        ("Kh Kd 4c 4s Ah", "Ks Kc 4h 4d Qh"),  # Two pair kicker
+        ("7h 7d 7c As 2h", "7s 7d 7c Ks Qh"),  # Trips kicker
+        ("Qh Qd Qc Qs 3h", "Qh Qd Qc Qs 2h"),  # Quads kicker
+        ("Ah Jh 9h 7h 3h", "Ad Jd 9d 7d 2d"),  # Flush down to the fifth card
+        ("3h 3d 3c 2s 2h", "2h 2d 2c As Ah"),  # Full house by the trips
+        ("2h 3d 4c 5s 6h", "Ah 2d 3c 4s 5h"),  # The wheel is the lowest straight
+    ]
+    for stronger, weaker in stronger_weaker:
+        assert evaluate(cards(stronger)) > evaluate(cards(weaker)), (stronger, weaker)
+
+
+def test_only_the_best_five_cards_count():
+    # Sixth and seventh cards don't kick
+    assert evaluate(cards("Ah Ad Kc Qs Jh 3d 2c")) == evaluate(cards("As Ac Kd Qh Jc 4s 3h"))
+    # Three pairs: the lowest pair can still be the kicker's rank
+    assert evaluate(cards("Kh Kd 9c 9s 5h 5d 2c")) == evaluate(cards("Kh Kd 9c 9s 5h 2d 3c"))
+
+
+def test_wheel_and_steel_wheel():
+    wheel = evaluate(cards("Ah 2d 3c 4s 5h 9d Kc"))
+    assert wheel >> 20 == STRAIGHT and describe(wheel) == "Straight, 5 high"
+
+    steel_wheel = evaluate(cards("Ah 2h 3h 4h 5h 9d Kc"))
+    assert steel_wheel >> 20 == STRAIGHT_FLUSH and describe(steel_wheel) == "Straight Flush, 5 high"
+    assert steel_wheel < evaluate(cards("2h 3h 4h 5h 6h"))
+
+
+def test_distinct_five_card_hands_per_category():
+    # Every rank pattern without a flush, and every suited rank pattern
+    scores = set(FIVE_CARD_SCORES.values())
+    scores |= {flush_score(sum(1 << rank for rank in ranks)) for ranks in combinations(range(13), 5)}
+    per_category = Counter(CATEGORIES[score >> 20] for score in scores)
+    assert [per_category[category] for category in CATEGORIES] == [1277, 2860, 858, 858, 10, 1277, 156, 156, 9, 1]
+
+
+def test_seven_cards_score_as_the_best_five():
+    rng = random.Random(46)
+    for _ in range(300):
+        hand = rng.sample(range(52), 7)
+        assert evaluate(hand) == max(evaluate(five) for five in combinations(hand, 5))
+
+
+def test_equity_of_aces_heads_up():
+    equity, deals = estimate_equity(cards("Ah As"), [], 1, random.Random(46), samples=20_000)
+    assert deals == 20_000
+    assert abs(equity - 0.852) < 0.015
+
+
+def test_equity_when_the_board_plays_is_a_split():
+    equity, _ = estimate_equity(cards("2c 3d"), cards("Th Jh Qh Kh Ah"), 2, random.Random(46), samples=500)
+    assert equity == pytest.approx(1 / 3)
+
+
+def test_draw_outs_of_a_flush_and_straight_draw():
+    current, outs, by_river = draw_outs(cards("Ah Kh"), cards("Qh 5h Tc"))
+
+    assert current == HIGH_CARD
+    # The jack of hearts makes the straight and the flush, but not a royal flush without the ten
+    assert sorted(outs[FLUSH]) == sorted(cards("2h 3h 4h 6h 7h 8h 9h Th Jh"))
+    assert sorted(outs[STRAIGHT]) == sorted(cards("Jd Jc Js"))
+    assert outs[ROYAL_FLUSH] == []
+    assert len(outs[PAIR]) == 6  # Aces and kings
+    assert sum(by_river) == pytest.approx(1)
+    # Runner-runner flushes included: 1 - C(38, 2) / C(47, 2)
+    assert abs(by_river[FLUSH] - (1 - 703 / 1081)) < 0.02
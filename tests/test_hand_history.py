@@ -0,0 +1,76 @@
+import numpy as np
+
+from hand_export import CATEGORIES, NO_CARD, hand_categories, iter_batches
+from hand_history import (
+    ActionRecord, HandHistoryWriter, HandRecord, HistoryAction, PlayerRecord, decode_hand, encode_hand,
+    to_pokerstars
+)
+from poker_models import HandRanking, Variant
+
+# Four clubs on the board and one in each hand: a flush in Hold'em, not in Omaha
+BOARD = (2, 5, 8, 11, 13)
+OMAHA_HOLE = (12, 16, 32, 48)
+
+
+def _omaha_hand() -> HandRecord:
+    players = [PlayerRecord("alice", 0, 1000, OMAHA_HOLE, 40), PlayerRecord("bob", 1, 1000, (1, 17, 30, 44), 0)]
+    actions = [
+        ActionRecord(0, 1, HistoryAction.POST_SMALL_BLIND, 10),
+        ActionRecord(0, 0, HistoryAction.POST_BIG_BLIND, 20),
+        ActionRecord(0, 1, HistoryAction.CALL, 10),
+        ActionRecord(0, 0, HistoryAction.CHECK, 0),
+    ] + [ActionRecord(street, player, HistoryAction.CHECK, 0) for street in (1, 2, 3) for player in (0, 1)]
+    return HandRecord(1, 1_700_000_000, "table", 10, 20, 0, 0, players, BOARD, actions, True,
+                      variant=Variant.OMAHA)
+
+
+def test_variant_round_trips():
+    hand = _omaha_hand()
+    assert decode_hand(encode_hand(hand)) == hand
+
+
+def test_seed_round_trips():
+    for seed in (None, 0, 2 ** 64 - 1):
+        hand = _omaha_hand()._replace(variant=Variant.HOLDEM, seed=seed)
+        assert decode_hand(encode_hand(hand)) == hand
+
+
+def test_pokerstars_header_names_the_game():
+    assert "Omaha Pot Limit (10/20)" in to_pokerstars(_omaha_hand())
+    assert "6+ Hold'em No Limit" in to_pokerstars(_omaha_hand()._replace(variant=Variant.SHORT_DECK))
+
+
+def test_export_keeps_every_hole_card_and_scores_by_variant(tmp_path):
+    path = tmp_path / "hands.phh"
+    writer = HandHistoryWriter(path)
+    writer.write(_omaha_hand())
+    writer.flush()
+
+    frame = next(iter_batches([path]))
+    alice = frame.iloc[0]
+    assert alice["variant"] == "omaha"
+    assert tuple(alice[["hole1", "hole2", "hole3", "hole4"]]) == OMAHA_HOLE
+    assert alice["category"] == HandRanking.HIGH_CARD.value
+
+
+def _cards(text, size):
+    cards = ["23456789TJQKA".index(c[0]) + 13 * "hdcs".index(c[1]) for c in text.split()]
+    return cards + [NO_CARD] * (size - len(cards))
+
+
+def test_categories_follow_the_variant_rules():
+    rows = [
+        ("holdem", "Ah Ad", ""),  # Folded preflop
+        ("holdem", "Ah Kh", "Qh Jh Th"),
+        ("omaha", "Ah Ad Ac Ks", ""),  # Only two hole cards play
+        ("omaha", "Ah Kd 2c 3s", "Qh Jh Th 9h"),  # No flush with one heart in the hand
+        ("short_deck", "Ah 6d", "7c 8s 9h Kd Qd"),  # The ace plays low as a five
+        ("holdem", "Ah 6d", "7c 8s 9h Kd Qd"),
+    ]
+    codes = hand_categories(np.array([_cards(hole, 4) for _, hole, _ in rows]),
+                            np.array([_cards(board, 5) for _, _, board in rows]),
+                            np.array([variant for variant, _, _ in rows]))
+    assert [CATEGORIES[code] for code in codes] == [
+        HandRanking.PAIR, HandRanking.ROYAL_FLUSH, HandRanking.PAIR,
+        HandRanking.STRAIGHT, HandRanking.STRAIGHT, HandRanking.HIGH_CARD,
+    ]
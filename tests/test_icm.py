@@ -0,0 +1,54 @@
+from itertools import permutations
+
+import pytest
+
+from icm import _exact, _monte_carlo, icm_equities
+
+
+def _by_finishing_orders(stacks, payouts):
+    """Malmuth-Harville over every finishing order"""
+    equities = [0.0] * len(stacks)
+    for order in permutations(range(len(stacks))):
+        probability, left = 1.0, sum(stacks)
+        for player in order:
+            probability *= stacks[player] / left
+            left -= stacks[player]
+        for place, player in enumerate(order[:len(payouts)]):
+            equities[player] += probability * payouts[place]
+    return equities
+
+
+@pytest.mark.parametrize("stacks, payouts", [
+    ([5000, 3000, 2000], [0.5, 0.3, 0.2]),
+    ([1200, 800, 800, 400, 100], [0.65, 0.35]),
+    ([10, 20, 30, 40, 50, 60], [50, 30, 20]),
+])
+def test_exact_equities_match_all_finishing_orders(stacks, payouts):
+    equities, method = icm_equities(stacks, payouts)
+    assert method == "exact"
+    assert equities == pytest.approx(_by_finishing_orders(stacks, payouts))
+    assert sum(equities) == pytest.approx(sum(payouts))
+
+
+def test_chip_leader_is_worth_less_than_their_chip_share():
+    equities, _ = icm_equities([7000, 2000, 1000], [0.5, 0.3, 0.2])
+    assert equities[0] < 0.7
+    assert equities[2] > 0.1
+
+
+def test_busted_players_and_unplayed_places_pay_nothing():
+    equities, _ = icm_equities([0, 500, 500], [0.5, 0.3, 0.2])
+    # Two players left: third place isn't paid to anybody
+    assert equities == pytest.approx([0.0, 0.4, 0.4])
+
+
+def test_monte_carlo_agrees_with_the_exact_recursion():
+    stacks = [3000, 2500, 2000, 1500, 1000, 800, 600, 400]
+    payouts = [0.4, 0.25, 0.15, 0.1, 0.1]
+    assert _monte_carlo(stacks, payouts) == pytest.approx(_exact(stacks, payouts), abs=0.005)
+
+
+def test_large_fields_are_sampled():
+    equities, method = icm_equities([1000] * 14, [0.5, 0.3, 0.2])
+    assert method == "monte_carlo"
+    assert equities == pytest.approx([1 / 14] * 14, abs=0.005)
@@ -0,0 +1,33 @@
+import random
+
+from mtt import TableBalancer
+from poker_models import PokerGame, PokerPlayer
+
+
+def _table(table_id: str, players: int) -> PokerGame:
+    game = PokerGame(id=table_id)
+    game.players = [PokerPlayer(id=f"{table_id}-{i}", name=f"{table_id}-{i}", chips=1000, position=i)
+                    for i in range(players)]
+    return game
+
+
+def test_running_total_matches_the_table_counts():
+    rng = random.Random(35)
+    balancer = TableBalancer()
+    games = {}
+    for number in range(12):
+        game = games[f"t{number}"] = _table(f"t{number}", rng.randint(5, 8))
+        balancer.add_table(game.id, len(game.players))
+    assert balancer.total_players == sum(len(game.players) for game in games.values())
+
+    # Bust players and play hands until one table is left
+    while len(balancer.counts) > 1:
+        game = games[rng.choice(sorted(balancer.counts))]
+        if game.players and rng.random() < 0.5:
+            game.players.pop(rng.randrange(len(game.players)))
+        balancer.before_hand(game)
+        assert balancer.total_players == sum(balancer.counts.values())
+    # Players in transit are counted at their destination until they arrive
+    for game in games.values():
+        balancer.before_hand(game)
+    assert balancer.total_players == sum(len(game.players) for game in games.values())
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+from player_stats import PlayerStatsTracker
+from poker_engine import PokerEngine
+from poker_models import PlayerAction
+from simulate import create_table
+
+
+@pytest.fixture
+def tracker():
+    tracker = PlayerStatsTracker()
+    tracker.collection = AsyncMongoMockClient()["test"]["player_stats"]
+    PokerEngine.add_listener(tracker)
+    yield tracker
+    PokerEngine.remove_listener(tracker)
+
+
+def _act(game, action: PlayerAction, amount: int = 0):
+    player = game.players[game.current_player]
+    assert PokerEngine.process_action(game, player.id, action, amount)
+    return player
+
+
+def test_raise_and_three_bet_are_counted(tracker):
+    game = create_table(3, seed=7)
+    PokerEngine.start_new_hand(game)
+    opener = _act(game, PlayerAction.RAISE, 40)
+    three_bettor = _act(game, PlayerAction.RAISE, 120)
+    big_blind = _act(game, PlayerAction.FOLD)
+    _act(game, PlayerAction.FOLD)
+
+    async def stats(player):
+        return await tracker.get(player.name)
+
+    opened, three_bet, folded = (asyncio.run(stats(p)) for p in (opener, three_bettor, big_blind))
+    assert (opened.hands, opened.vpip, opened.pfr, opened.three_bet) == (1, 100, 100, 0)
+    assert (three_bet.vpip, three_bet.pfr, three_bet.three_bet) == (100, 100, 100)
+    # Facing a raise and a re-raise is no 3-bet opportunity
+    assert (folded.hands, folded.vpip, folded.three_bet) == (1, 0, 0)
+
+
+def test_flush_keeps_the_totals(tracker):
+    async def scenario():
+        game = create_table(3, seed=7)
+        PokerEngine.start_new_hand(game)
+        opener = _act(game, PlayerAction.RAISE, 40)
+        before = await tracker.get(opener.name)
+
+        await tracker.flush()
+        assert not tracker._pending
+        assert await tracker.get(opener.name) == before
+
+    asyncio.run(scenario())
+
+
+def test_nothing_is_buffered_before_start():
+    tracker = PlayerStatsTracker()
+    PokerEngine.add_listener(tracker)
+    try:
+        game = create_table(3, seed=7)
+        PokerEngine.start_new_hand(game)
+        _act(game, PlayerAction.RAISE, 40)
+    finally:
+        PokerEngine.remove_listener(tracker)
+    assert not tracker._pending and not tracker._hands
@@ -0,0 +1,124 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from poker_api import (
+    _seat_player, _state_changed, active_games, get_game_state, get_game_view, get_outs, leave_game,
+    player_action,
+)
+from poker_engine import PokerEngine
+from poker_models import GamePhase, PlayerAction, PokerAction, PokerPlayer
+from simulate import create_table
+from turn_clock import turn_clocks
+
+
+@pytest.fixture
+def table():
+    game = create_table(3, seed=7)
+    PokerEngine.start_new_hand(game)
+    active_games[game.id] = game
+    _state_changed(game)
+    yield game
+    turn_clocks.cancel(game)
+    active_games.pop(game.id, None)
+
+
+def test_leaving_ends_the_hand_and_waits_for_the_next_one(table):
+    game = table
+    PokerEngine.process_action(game, game.players[game.current_player].id, PlayerAction.FOLD)
+    leaving = game.players[game.current_player]
+    dealer = game.players[game.dealer_position]
+    asyncio.run(leave_game(game.id, leaving.name))
+
+    # The last player in the hand won it; the table moves on by itself
+    assert game.phase == GamePhase.WAITING
+    assert game.players[game.dealer_position] is not dealer
+    assert game.deadline is not None
+    assert game.id in turn_clocks._timers
+
+
+def test_invalid_action_is_rejected_without_touching_the_clock(table):
+    game = table
+    player = game.players[game.current_player]
+    version, deadline = game.state_version, game.deadline
+
+    with pytest.raises(HTTPException) as error:
+        # Facing the big blind
+        asyncio.run(player_action(game.id, PokerAction(player_id=player.id, action=PlayerAction.CHECK)))
+    assert error.value.status_code == 400
+    assert (game.state_version, game.deadline) == (version, deadline)
+
+
+def test_joining_mid_hand_keeps_the_deadline_of_the_player_to_act(table):
+    game = table
+    deadline = game.deadline
+    _seat_player(game, PokerPlayer(id="late", name="Late", chips=1000, position=len(game.players)))
+
+    assert game.players[-1].is_folded
+    assert game.deadline == deadline
+
+    # The next player gets a fresh deadline
+    player = game.players[game.current_player]
+    asyncio.run(player_action(game.id, PokerAction(player_id=player.id, action=PlayerAction.CALL)))
+    assert game.deadline > deadline
+
+
+def test_views_are_rendered_once_per_state_version(table):
+    game = table
+    first = asyncio.run(get_game_state(game.id)).body
+    assert asyncio.run(get_game_state(game.id)).body is first
+
+    to_act, waiting = game.players[game.current_player], game.players[(game.current_player + 1) % 3]
+    view = json.loads(asyncio.run(get_game_view(game.id, to_act.id)).body)
+    assert view["actions"]["can_act"]
+    assert not json.loads(asyncio.run(get_game_view(game.id, waiting.id)).body)["actions"]["can_act"]
+
+    asyncio.run(player_action(game.id, PokerAction(player_id=to_act.id, action=PlayerAction.CALL)))
+    state = json.loads(asyncio.run(get_game_state(game.id)).body)
+    assert state["pot"] == json.loads(first)["pot"] + game.big_blind
+    assert state["current_player_name"] == waiting.name
+
+
+def test_outs_are_offered_on_the_flop_and_turn(table):
+    game = table
+    player = game.players[game.current_player]
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(get_outs(game.id, player.id))
+    assert error.value.status_code == 400
+
+    for action in (PlayerAction.CALL, PlayerAction.CALL, PlayerAction.CHECK):
+        asyncio.run(player_action(game.id, PokerAction(player_id=game.players[game.current_player].id, action=action)))
+    for _ in range(3):
+        asyncio.run(player_action(game.id, PokerAction(player_id=game.players[game.current_player].id,
+                                                       action=PlayerAction.CHECK)))
+    assert game.phase == GamePhase.TURN
+
+    analysis = asyncio.run(get_outs(game.id, player.id))
+    assert analysis.unseen == 46
+    assert analysis.outs == sum(len(draw.outs) for draw in analysis.draws)
+    for draw in analysis.draws:
+        assert draw.next_card == round(len(draw.outs) / 46, 4)
+        # By the river also counts the cards that pair the board, which are no outs
+        assert draw.by_river >= draw.next_card
+    seen = {card.index for card in player.cards + game.community_cards}
+    assert not seen & {card.index for draw in analysis.draws for card in draw.outs}
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(get_outs(game.id, "nobody"))
+    assert error.value.status_code == 404
+
+
+def test_players_only_see_their_own_hole_cards(table):
+    game = table
+    state = json.loads(asyncio.run(get_game_state(game.id)).body)
+    assert all("cards" not in player for player in state["players_info"])
+    assert all(player["cards"] == [] for player in state["game"]["players"])
+
+    me = game.players[0]
+    view = json.loads(asyncio.run(get_game_view(game.id, me.id)).body)["state"]
+    seen = {player["id"]: player.get("cards") for player in view["players_info"]}
+    assert len(seen.pop(me.id)) == 2
+    assert set(seen.values()) == {None}
+    assert [len(player["cards"]) for player in view["game"]["players"]] == [2, 0, 0]
@@ -0,0 +1,155 @@
+from poker_engine import PokerEngine
+from poker_models import GamePhase, PlayerAction, PokerPlayer, Variant
+from simulate import create_table
+
+
+def _three_handed(variant: Variant = Variant.HOLDEM):
+    game = create_table(3, seed=7, variant=variant)
+    PokerEngine.start_new_hand(game)
+    return game
+
+
+def test_all_in_facing_a_bet_puts_in_the_whole_stack():
+    game = _three_handed()
+    player = game.players[game.current_player]
+    PokerEngine.process_action(game, player.id, PlayerAction.ALL_IN)
+
+    assert player.chips == 0
+    assert player.is_all_in
+    assert player.current_bet == 1000
+    assert game.current_bet == 1000
+    assert game.phase == GamePhase.PRE_FLOP
+    # Everybody else has to answer the raise
+    assert game.players[game.current_player] is not player
+
+
+def test_all_in_short_of_the_bet_is_a_call():
+    game = _three_handed()
+    player = game.players[game.current_player]
+    player.chips = 5
+    PokerEngine.process_action(game, player.id, PlayerAction.ALL_IN)
+
+    assert player.chips == 0
+    assert player.is_all_in
+    assert player.current_bet == 5
+    assert game.current_bet == game.big_blind
+
+
+def test_all_in_is_capped_at_the_pot_in_pot_limit():
+    game = _three_handed(Variant.OMAHA)
+    player = game.players[game.current_player]
+    pot_raise = game.current_bet + game.pot + game.current_bet - player.current_bet
+    PokerEngine.process_action(game, player.id, PlayerAction.ALL_IN)
+
+    assert player.current_bet == pot_raise
+    assert not player.is_all_in
+
+
+def test_unknown_action_keeps_the_turn():
+    game = _three_handed()
+    player = game.players[game.current_player]
+    version = game.state_version
+    assert not PokerEngine.process_action(game, player.id, "sit_out")
+
+    assert game.players[game.current_player] is player
+    assert game.state_version == version
+
+
+def _act(game, action: PlayerAction, amount: int = 0):
+    """Act for the player whose turn it is; returns that player"""
+    player = game.players[game.current_player]
+    assert PokerEngine.process_action(game, player.id, action, amount), (player.name, action)
+    return player
+
+
+def _table(players: int):
+    game = create_table(players, seed=7)
+    PokerEngine.start_new_hand(game)
+    return game
+
+
+def test_big_blind_has_the_option_when_everybody_limps():
+    game = _table(3)
+    big_blind = game.players[(game.dealer_position + 2) % 3]
+    _act(game, PlayerAction.CALL)
+    _act(game, PlayerAction.CALL)
+
+    # The round isn't over before the big blind acts
+    assert game.phase == GamePhase.PRE_FLOP
+    assert game.players[game.current_player] is big_blind
+    _act(game, PlayerAction.RAISE, 60)
+
+    # Raising reopens the action for the limpers
+    assert game.phase == GamePhase.PRE_FLOP
+    _act(game, PlayerAction.CALL)
+    _act(game, PlayerAction.CALL)
+    assert game.phase == GamePhase.FLOP
+    assert game.pot == 180
+
+
+def test_checking_around_deals_the_next_street():
+    game = _table(3)
+    _act(game, PlayerAction.CALL)
+    _act(game, PlayerAction.CALL)
+    _act(game, PlayerAction.CHECK)
+    assert game.phase == GamePhase.FLOP
+    assert len(game.community_cards) == 3
+    # After the flop the small blind acts first
+    assert game.current_player == (game.dealer_position + 1) % 3
+
+    for _ in range(3):
+        _act(game, PlayerAction.CHECK)
+    assert game.phase == GamePhase.TURN
+    assert len(game.community_cards) == 4
+    assert game.current_bet == 0
+
+
+def test_re_raise_reopens_the_action():
+    game = _table(3)
+    opener = _act(game, PlayerAction.RAISE, 40)
+    _act(game, PlayerAction.RAISE, 120)
+    _act(game, PlayerAction.FOLD)
+
+    # The opener has to answer the re-raise
+    assert game.phase == GamePhase.PRE_FLOP
+    assert game.players[game.current_player] is opener
+    _act(game, PlayerAction.CALL)
+    assert game.phase == GamePhase.FLOP
+    assert opener.total_bet == 120
+
+
+def test_removing_a_player_closes_the_gap_in_the_seat_masks():
+    game = _table(4)
+    dealer = game.dealer_position
+    small_blind, big_blind = game.players[(dealer + 1) % 4], game.players[(dealer + 2) % 4]
+    _act(game, PlayerAction.CALL)
+    _act(game, PlayerAction.CALL)
+    # The small blind leaves before acting; their blind stays in the pot
+    PokerEngine.remove_player(game, small_blind.id)
+
+    seat = game.seat_of(big_blind.id)
+    assert len(game.players) == 3
+    assert game._to_act == 1 << seat
+    assert game.players[game.current_player] is big_blind
+    assert game.pot == 70
+
+    _act(game, PlayerAction.CHECK)
+    assert game.phase == GamePhase.FLOP
+    # Everybody still in the hand acts on the flop, left of the button first
+    assert game._to_act == 0b111
+    assert game.players[game.current_player] is big_blind
+
+
+def test_player_joining_mid_hand_sits_out_until_the_next_hand():
+    game = _table(3)
+    # As poker_api seats a player while a hand runs
+    late = PokerPlayer(name="Late", position=3, chips=1000, is_folded=True)
+    game.players.append(late)
+
+    while game.phase not in (GamePhase.FINISHED, GamePhase.SHOWDOWN):
+        assert game.players[game.current_player] is not late
+        _act(game, PlayerAction.CALL if game.current_bet else PlayerAction.CHECK)
+    assert late.chips == 1000 and not late.cards
+
+    PokerEngine.start_new_hand(game)
+    assert len(late.cards) == 2 and not late.is_folded
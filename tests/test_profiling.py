@@ -0,0 +1,53 @@
+import asyncio
+import sys
+import threading
+import time
+
+from profiling import StackSampler
+
+
+def _spin_profiled(seconds: float):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def _spin_other(seconds: float):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+async def _request(spin, samplers=None):
+    if samplers is not None:
+        sampler = StackSampler(threading.get_ident(), 0.001, sys._getframe())
+        samplers.append(sampler)
+        sampler.start()
+    for _ in range(10):
+        spin(0.02)  # Longer than the interpreter's switch interval, so the sampler gets to run
+        await asyncio.sleep(0)
+    if samplers is not None:
+        sampler.stop()
+
+
+def test_samples_only_the_profiled_task():
+    samplers = []
+
+    async def scenario():
+        await asyncio.gather(_request(_spin_profiled, samplers), _request(_spin_other))
+
+    asyncio.run(scenario())
+    folded = samplers[0].folded()
+    assert "_spin_profiled" in folded
+    assert "_spin_other" not in folded
+    # Stacks start at the profiled frame, not at the event loop
+    assert all(line.startswith("test_profiling.py:_request") for line in folded.splitlines())
+
+
+def test_stop_does_not_wait_for_the_sampler_thread():
+    sampler = StackSampler(threading.get_ident(), 10.0)
+    sampler.start()
+    start = time.perf_counter()
+    sampler.stop()
+    assert time.perf_counter() - start < 1.0
+    assert not sampler.stacks
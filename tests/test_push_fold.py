@@ -0,0 +1,47 @@
+import pytest
+
+import push_fold
+from push_fold import CLASS_COMBOS, CLASS_NAMES, bucket, hand_class, solve_heads_up
+
+
+def cards(text):
+    return ["23456789TJQKA".index(c[0]) + 13 * "hdcs".index(c[1]) for c in text.split()]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def few_boards():
+    # The full table takes seconds; a hundred boards are plenty for the shape of the ranges
+    data = push_fold.equity_data(boards=100)
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(push_fold, "equity_data", lambda: data)
+        yield
+
+
+def _played(strategy):
+    """Share of the 1326 starting hands played"""
+    return float(strategy @ CLASS_COMBOS) / 1326
+
+
+def test_fictitious_play_settles():
+    solved, longer = solve_heads_up(10, iterations=300), solve_heads_up(10, iterations=1200)
+    for node in ("sb_push", "bb_call"):
+        assert _played(solved[node]) == pytest.approx(_played(longer[node]), abs=0.01)
+        assert solved[node][CLASS_NAMES.index("AA")] == 1
+        assert solved[node][CLASS_NAMES.index("72o")] < 0.01
+
+
+def test_shorter_stacks_push_and_call_wider():
+    pushed = [_played(solve_heads_up(stack)["sb_push"]) for stack in (15, 10, 5)]
+    called = [_played(solve_heads_up(stack)["bb_call"]) for stack in (15, 10, 5)]
+    assert pushed == sorted(pushed) and called == sorted(called)
+    # The big blind calls tighter than the small blind pushes
+    assert all(call < push for call, push in zip(called, pushed))
+
+
+def test_buckets_and_hand_classes():
+    assert bucket(7.4, 0.12) == (7, 0.1)
+    assert bucket(0.2, -1) == (1, 0.0)
+    assert bucket(80, 0) == (push_fold.MAX_STACK, 0.0)
+    assert hand_class(cards("Ah Kh")) == "AKs"
+    assert hand_class(cards("2c 7d")) == "72o"
+    assert hand_class(cards("Ts Td")) == "TT"
@@ -0,0 +1,103 @@
+import asyncio
+import math
+import random
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+from database import PersonDatabase
+from models import PersonCreate, PersonUpdate
+from rating import BETA, KAPPA, Rating, rate
+
+
+def _plackett_luce(ratings, scores):
+    """Weng-Lin Plackett-Luce update, summed over players instead of prefix sums"""
+    c = math.sqrt(sum(r.sigma ** 2 + BETA ** 2 for r in ratings))
+    strength = [math.exp(r.mu / c) for r in ratings]
+    at_or_below = [sum(strength[s] for s in range(len(ratings)) if scores[s] <= scores[q]) for q in range(len(ratings))]
+    tied = [sum(1 for s in scores if s == scores[q]) for q in range(len(ratings))]
+    result = []
+    for i, rating in enumerate(ratings):
+        omega = delta = 0.0
+        for q in range(len(ratings)):
+            if scores[q] < scores[i]:
+                continue  # Only players ranked at least as well as i
+            share = strength[i] / at_or_below[q]
+            omega += ((1 if q == i else 0) - share) / tied[q]
+            delta += share * (1 - share) / tied[q]
+        variance = rating.sigma ** 2
+        result.append(Rating(rating.mu + variance / c * omega,
+                             rating.sigma * math.sqrt(max(1 - (rating.sigma / c) * variance / c ** 2 * delta, KAPPA))))
+    return result
+
+
+def test_winner_gains_what_the_loser_loses():
+    winner, loser = rate([Rating(), Rating()], [100, -100])
+    assert winner.mu > 25 > loser.mu
+    assert winner.mu - 25 == pytest.approx(25 - loser.mu)
+    assert winner.sigma < Rating().sigma and loser.sigma < Rating().sigma
+
+
+def test_equal_scores_tie():
+    first, second = rate([Rating(), Rating()], [10, 10])
+    assert first.mu == pytest.approx(25) and second.mu == pytest.approx(25)
+
+
+def test_prefix_sums_match_the_per_player_formula():
+    rng = random.Random(37)
+    for players in range(2, 9):
+        ratings = [Rating(rng.uniform(15, 35), rng.uniform(2, 9)) for _ in range(players)]
+        scores = [rng.choice([-50, -20, 0, 20, 50]) for _ in range(players)]  # With ties
+        for mine, reference in zip(rate(ratings, scores), _plackett_luce(ratings, scores)):
+            assert mine.mu == pytest.approx(reference.mu)
+            assert mine.sigma == pytest.approx(reference.sigma)
+
+
+def test_rebuilding_from_the_ledger_gives_the_incremental_ratings():
+    async def scenario():
+        database = PersonDatabase(AsyncMongoMockClient()["test"])
+        persons = [await database.create_person(PersonCreate(name=name)) for name in ("Geri", "Sepp", "Toni")]
+        rng = random.Random(37)
+        amounts = {person.id: 0.0 for person in persons}
+        for _ in range(5):
+            for person_id in amounts:
+                amounts[person_id] += rng.choice([-30.0, -10.0, 10.0, 30.0])
+            await database.bulk_update_persons([{"id": p, "amount": a} for p, a in amounts.items()])
+            await asyncio.sleep(0.002)  # Sessions are replayed in time order
+
+        incremental = {s.person_id: s.rating for s in await database.get_leaderboard("rating")}
+        assert await database.rebuild_ratings() == 5
+        rebuilt = {s.person_id: s.rating for s in await database.get_leaderboard("rating")}
+        assert rebuilt == pytest.approx(incremental)
+        assert len(set(rebuilt.values())) > 1
+
+    asyncio.run(scenario())
+
+
+def test_only_changed_amounts_of_two_or_more_persons_are_rated():
+    async def scenario():
+        database = PersonDatabase(AsyncMongoMockClient()["test"])
+        geri, sepp, toni = [await database.create_person(PersonCreate(name=name)) for name in ("Geri", "Sepp", "Toni")]
+
+        async def ratings():
+            return {s.person_id: (s.mu, s.sigma) for s in await database.get_leaderboard("rating")}
+
+        await database.bulk_update_persons([{"id": geri.id, "amount": 10.0}, {"id": sepp.id, "amount": -20.0},
+                                            {"id": toni.id, "amount": 10.0}])
+        before = await ratings()
+        # Toni breaks even
+        await database.bulk_update_persons([{"id": geri.id, "amount": 30.0}, {"id": sepp.id, "amount": -40.0},
+                                            {"id": toni.id, "amount": 10.0}])
+        after = await ratings()
+        assert after[toni.id] == before[toni.id]
+        assert after[geri.id][0] > before[geri.id][0]
+
+        # A single update is in the ledger but not rated
+        await database.update_person(sepp.id, PersonUpdate(amount=0.0))
+        assert await ratings() == after
+        assert await database.transactions.count_documents({"person_id": sepp.id}) == 3
+
+        await database.rebuild_ratings()
+        assert await ratings() == pytest.approx(after)
+
+    asyncio.run(scenario())
@@ -0,0 +1,57 @@
+import asyncio
+import json
+
+from poker_engine import PokerEngine
+from poker_models import GamePhase, PlayerAction
+from simulate import create_table
+from spectators import Spectators, render_frame
+from timer_wheel import TimerWheel
+
+
+def _act(game, action: PlayerAction):
+    player = game.players[game.current_player]
+    assert PokerEngine.process_action(game, player.id, action)
+    return player
+
+
+def _table():
+    game = create_table(3, seed=45)
+    PokerEngine.start_new_hand(game)
+    return game
+
+
+def test_hole_cards_stay_hidden_during_the_hand():
+    frame = json.loads(render_frame(_table(), delay=30))
+    assert all(player["cards_count"] == 2 and player["cards"] == [] for player in frame["players"])
+
+
+def test_showdown_reveals_the_hands_that_were_not_folded():
+    game = _table()
+    _act(game, PlayerAction.CALL)
+    folded = _act(game, PlayerAction.FOLD)
+    _act(game, PlayerAction.CHECK)
+    while game.phase != GamePhase.FINISHED:
+        _act(game, PlayerAction.CHECK)
+
+    players = {player["name"]: player for player in json.loads(render_frame(game, delay=30))["players"]}
+    assert players.pop(folded.name)["cards"] == []
+    assert all(len(player["cards"]) == 2 for player in players.values())
+
+
+def test_frames_are_released_after_the_delay():
+    async def scenario():
+        wheel = TimerWheel(tick=1)
+        feed = Spectators(wheel, delay=3)
+        game = _table()
+        viewer = feed.subscribe(game.id)
+        feed.record(game)
+        feed.record(game)  # Same state version: no second frame
+
+        for _ in range(2):
+            wheel.advance()
+        assert feed.latest(game.id) is None and viewer.empty()
+        wheel.advance()
+        assert viewer.get_nowait() == b"data: " + feed.latest(game.id) + b"\n\n"
+        assert viewer.empty()
+
+    asyncio.run(scenario())
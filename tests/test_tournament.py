@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from poker_api import _hand_finished, _state_changed, active_games, start_next_hand
+from poker_models import GamePhase, TournamentCreate
+from simulate import create_table
+from tournament import tournaments
+from tournament_api import add_table, create_tournament, delete_tournament, stream_clock
+from turn_clock import turn_clocks
+
+
+def test_deleting_a_tournament_ends_its_clock_streams():
+    async def scenario():
+        clock = await create_tournament(TournamentCreate(name="Test"))
+        response = await stream_clock(clock.tournament_id)
+        events = response.body_iterator
+        first = await events.__anext__()
+        assert first.startswith("data: ")
+
+        await delete_tournament(clock.tournament_id)
+        # The stream ends right away instead of sending keep-alives forever
+        rest = await asyncio.wait_for(_drain(events), timeout=1)
+        assert rest == []
+
+    asyncio.run(scenario())
+
+
+async def _drain(events):
+    return [event async for event in events]
+
+
+def test_a_table_down_to_one_player_is_broken_up():
+    async def scenario():
+        clock = await create_tournament(TournamentCreate(name="Test"))
+        tables = [create_table(5), create_table(5)]
+        for game in tables:
+            active_games[game.id] = game
+            await add_table(clock.tournament_id, game.id)
+        short, other = tables
+        try:
+            # Four players bust in the same hand
+            short.phase = GamePhase.FINISHED
+            for player in short.players[1:]:
+                player.chips = 0
+            _hand_finished(short)
+            _state_changed(short)
+            assert short.phase == GamePhase.WAITING
+            assert short.deadline is not None
+
+            with pytest.raises(HTTPException):
+                await start_next_hand(short.id)
+            balancer = tournaments.get(clock.tournament_id).tables
+            assert balancer.counts == {other.id: 6}
+            assert short.id not in turn_clocks._timers
+
+            await start_next_hand(other.id)
+            assert len(other.players) == 6
+        finally:
+            for game in tables:
+                turn_clocks.cancel(game)
+                active_games.pop(game.id, None)
+            await delete_tournament(clock.tournament_id)
+
+    asyncio.run(scenario())
+
+
+def test_a_table_belongs_to_one_tournament():
+    async def scenario():
+        first = await create_tournament(TournamentCreate(name="First"))
+        second = await create_tournament(TournamentCreate(name="Second"))
+        game = create_table(5)
+        active_games[game.id] = game
+        try:
+            await add_table(first.tournament_id, game.id)
+            await add_table(first.tournament_id, game.id)  # Adding it again changes nothing
+            with pytest.raises(HTTPException) as error:
+                await add_table(second.tournament_id, game.id)
+            assert error.value.status_code == 409
+            assert game.tournament_id == first.tournament_id
+            assert tournaments.get(second.tournament_id).tables.counts == {}
+
+            # Once the first tournament is gone, the table is free again
+            await delete_tournament(first.tournament_id)
+            clock = await add_table(second.tournament_id, game.id)
+            assert clock.game_ids == [game.id]
+        finally:
+            active_games.pop(game.id, None)
+            await delete_tournament(second.tournament_id)
+
+    asyncio.run(scenario())
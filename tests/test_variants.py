@@ -0,0 +1,67 @@
+import random
+from itertools import combinations
+
+from hand_eval import evaluate
+from poker_models import HandRanking, Variant
+from variants import describe, ranking, strength
+
+
+def cards(text: str):
+    """Card indexes of e.g. "Ah Kd 7c", suits in Suit order (hearts, diamonds, clubs, spades)"""
+    return ["23456789TJQKA".index(card[0]) + 13 * "hdcs".index(card[1]) for card in text.split()]
+
+
+def test_holdem_is_the_plain_evaluator():
+    rng = random.Random(50)
+    for _ in range(100):
+        hand = rng.sample(range(52), 7)
+        value = strength(Variant.HOLDEM, hand[:2], hand[2:])
+        assert value == evaluate(hand)
+        assert ranking(Variant.HOLDEM, value) == list(HandRanking)[value >> 20]
+
+
+def test_omaha_uses_exactly_two_hole_cards():
+    # Four hearts on the board and one in the hand: no flush
+    value = strength(Variant.OMAHA, cards("Ah Kd 2c 3s"), cards("5h 8h Jh Qh 7d"))
+    assert ranking(Variant.OMAHA, value) == HandRanking.HIGH_CARD
+    # A straight on the board doesn't play by itself
+    value = strength(Variant.OMAHA, cards("2h 2d 3c 3s"), cards("9h Td Jc Qs Kh"))
+    assert ranking(Variant.OMAHA, value) == HandRanking.PAIR
+    assert describe(Variant.OMAHA, value) == "Pair of 3s"
+    # Trips in the hand are only a pair
+    value = strength(Variant.OMAHA, cards("Ah Ad Ac 2s"), cards("5h 8d Jc Qs 7d"))
+    assert ranking(Variant.OMAHA, value) == HandRanking.PAIR
+
+
+def test_omaha_matches_brute_force():
+    rng = random.Random(50)
+    for _ in range(200):
+        dealt = rng.sample(range(52), 9)
+        hole, board = dealt[:4], dealt[4:]
+        best = max(evaluate([*two, *three]) for two in combinations(hole, 2) for three in combinations(board, 3))
+        assert strength(Variant.OMAHA, hole, board) == best
+
+
+def test_short_deck_flush_beats_full_house():
+    flush = strength(Variant.SHORT_DECK, cards("6h 9h"), cards("Jh Kh Ah 7d 8c"))
+    full_house = strength(Variant.SHORT_DECK, cards("As Ad"), cards("Ac Kh Kd 7d 8c"))
+    assert ranking(Variant.SHORT_DECK, flush) == HandRanking.FLUSH
+    assert ranking(Variant.SHORT_DECK, full_house) == HandRanking.FULL_HOUSE
+    assert flush > full_house
+    # Below four of a kind
+    quads = strength(Variant.SHORT_DECK, cards("6h 6d"), cards("6c 6s 7d 8c 9h"))
+    assert quads > flush
+
+
+def test_short_deck_ace_plays_low_in_a_six_high_straight():
+    lowest = strength(Variant.SHORT_DECK, cards("Ah 6d"), cards("7c 8s 9h Kd Kc"))
+    assert ranking(Variant.SHORT_DECK, lowest) == HandRanking.STRAIGHT
+    assert describe(Variant.SHORT_DECK, lowest) == "Straight, 9 high"
+    assert lowest < strength(Variant.SHORT_DECK, cards("6h 7d"), cards("8c 9s Th Kd Kc"))
+    # Same cards in Hold'em: no straight
+    assert ranking(Variant.HOLDEM, strength(Variant.HOLDEM, cards("Ah 6d"), cards("7c 8s 9h Kd Kc"))) == HandRanking.PAIR
+
+
+def test_short_deck_steel_wheel_is_a_straight_flush():
+    value = strength(Variant.SHORT_DECK, cards("Ah 6h"), cards("7h 8h 9h Kd Kc"))
+    assert ranking(Variant.SHORT_DECK, value) == HandRanking.STRAIGHT_FLUSH